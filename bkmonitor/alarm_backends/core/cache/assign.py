@@ -13,6 +13,7 @@ from collections import defaultdict
 from alarm_backends.core.cache.base import CacheManager
 from alarm_backends.core.cache.cmdb.business import BusinessManager
 from alarm_backends.core.cache.cmdb.dynamic_group import DynamicGroupManager
+from bkmonitor.action.alert_assign import AssignRuleIndex
 from bkmonitor.models.fta.assign import AlertAssignGroup, AlertAssignRule
 from bkmonitor.utils import extended_json
 from bkmonitor.utils.local import local
@@ -31,6 +32,8 @@ class AssignCacheManager(CacheManager):
     BIZ_CACHE_KEY_TEMPLATE = CacheManager.CACHE_KEY_PREFIX + ".assign.biz_{bk_biz_id}"
     PRIORITY_CACHE_KEY_TEMPLATE = CacheManager.CACHE_KEY_PREFIX + ".assign.biz_priority_{bk_biz_id}_{priority}"
     GROUP_CACHE_KEY_TEMPLATE = CacheManager.CACHE_KEY_PREFIX + ".assign.biz_group_{bk_biz_id}_{group_id}"
+    # 分派规则索引仅缓存在内存中
+    RULE_INDEX_CACHE_KEY_TEMPLATE = CacheManager.CACHE_KEY_PREFIX + ".assign.biz_rule_index_{bk_biz_id}"
 
     @classmethod
     def clear(cls):
@@ -88,6 +91,22 @@ class AssignCacheManager(CacheManager):
 
         return local.assign_cache[cache_key]
 
+    @classmethod
+    def get_assign_rule_index(cls, bk_biz_id) -> AssignRuleIndex:
+        """
+        按业务ID获取分派规则索引，同一批次内的告警共用
+        """
+        cache_key = cls.RULE_INDEX_CACHE_KEY_TEMPLATE.format(bk_biz_id=bk_biz_id)
+        if cache_key not in local.assign_cache:
+            priority_rules = []
+            for priority in cls.get_assign_priority_by_biz_id(bk_biz_id):
+                rules = []
+                for group_id in cls.get_assign_groups_by_priority(bk_biz_id, priority):
+                    rules.extend(cls.get_assign_rules_by_group(bk_biz_id, group_id))
+                priority_rules.append(rules)
+            local.assign_cache[cache_key] = AssignRuleIndex(priority_rules)
+        return local.assign_cache[cache_key]
+
     @classmethod
     def get_global_config(cls, key_template, **kwargs):
         kwargs.update({"bk_biz_id": GLOBAL_BIZ_ID})
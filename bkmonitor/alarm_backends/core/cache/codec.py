@@ -0,0 +1,175 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+服务间 redis 队列数据编解码
+
+写入格式：由 settings.ALARM_QUEUE_CODEC 决定，非 legacy 编码会在数据前加上版本头 "\x1e{tag}:"
+读取格式：根据版本头选择解码器，没有版本头的数据按 legacy json 解码
+因此升级时先发布读取端，再切换写入端编码，切换与回滚过程中队列内的新旧数据都能被正常消费
+"""
+
+import json
+
+from django.conf import settings
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# 版本头分隔符，json 文本不会以该字符开头
+CODEC_HEADER_PREFIX = "\x1e"
+CODEC_HEADER_SEPARATOR = ":"
+
+
+class QueueCodec:
+    """
+    队列编解码器基类
+    name: 配置中使用的编码名称
+    tag: 写入数据的版本头标识，为空表示不写版本头(legacy)
+    """
+
+    name = ""
+    tag = ""
+
+    @property
+    def header(self):
+        if not self.tag:
+            return ""
+        return f"{CODEC_HEADER_PREFIX}{self.tag}{CODEC_HEADER_SEPARATOR}"
+
+    def is_available(self):
+        return True
+
+    def encode(self, value) -> str:
+        raise NotImplementedError
+
+    def decode(self, payload: str):
+        raise NotImplementedError
+
+    def dumps(self, value) -> str:
+        return self.header + self.encode(value)
+
+
+class JsonCodec(QueueCodec):
+    """
+    legacy 编码，与历史数据格式完全一致
+    """
+
+    name = "json"
+    tag = ""
+
+    def encode(self, value):
+        return json.dumps(value)
+
+    def decode(self, payload):
+        return json.loads(payload)
+
+
+class UJsonCodec(QueueCodec):
+    """
+    ujson 紧凑编码，不转义非 ascii 字符及斜杠，数据体积更小
+    """
+
+    name = "ujson"
+    tag = "u1"
+
+    def is_available(self):
+        return ujson is not None
+
+    def encode(self, value):
+        try:
+            return ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            # ujson 不支持的类型(如超大整数)，回退到标准库，结果依然是合法的 json
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def decode(self, payload):
+        try:
+            return ujson.loads(payload)
+        except ValueError:
+            return json.loads(payload)
+
+
+class OrJsonCodec(QueueCodec):
+    """
+    orjson 编码，需要额外安装 orjson
+    """
+
+    name = "orjson"
+    tag = "o1"
+
+    def is_available(self):
+        return orjson is not None
+
+    def encode(self, value):
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def decode(self, payload):
+        return orjson.loads(payload)
+
+
+CODECS = [JsonCodec(), UJsonCodec(), OrJsonCodec()]
+CODECS_BY_NAME = {codec.name: codec for codec in CODECS}
+CODECS_BY_TAG = {codec.tag: codec for codec in CODECS if codec.tag}
+LEGACY_CODEC = CODECS_BY_NAME["json"]
+
+
+def get_fallback_codec():
+    """
+    获取当前环境可用的最快 json 解码器
+    所有版本的数据体均为 json，当版本头对应的依赖未安装时，使用该解码器兜底
+    """
+    for codec in (CODECS_BY_NAME["orjson"], CODECS_BY_NAME["ujson"]):
+        if codec.is_available():
+            return codec
+    return LEGACY_CODEC
+
+
+def get_write_codec(name=None) -> QueueCodec:
+    """
+    获取写入使用的编码器，未知或依赖缺失的编码回退到 legacy json
+    """
+    name = name or getattr(settings, "ALARM_QUEUE_CODEC", LEGACY_CODEC.name)
+    codec = CODECS_BY_NAME.get(name)
+    if codec is None or not codec.is_available():
+        return LEGACY_CODEC
+    return codec
+
+
+def dumps(value, codec_name=None) -> str:
+    return get_write_codec(codec_name).dumps(value)
+
+
+def loads(payload):
+    """
+    按版本头解码，没有版本头的数据按 legacy json 解码
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode("utf-8")
+    if not payload.startswith(CODEC_HEADER_PREFIX):
+        return LEGACY_CODEC.decode(payload)
+
+    tag, separator, body = payload[1:].partition(CODEC_HEADER_SEPARATOR)
+    if not separator:
+        raise ValueError(f"invalid queue payload header: {payload[:16]!r}")
+    codec = CODECS_BY_TAG.get(tag)
+    if codec is None:
+        raise ValueError(f"unknown queue codec tag: {tag}")
+    if not codec.is_available():
+        codec = get_fallback_codec()
+    return codec.decode(body)
@@ -17,6 +17,7 @@ from alarm_backends.constants import (
     CONST_ONE_HOUR,
     CONST_ONE_WEEK,
 )
+from alarm_backends.core.cache import codec as queue_codec
 from alarm_backends.core.cluster import get_cluster
 from alarm_backends.core.storage.redis_cluster import RedisProxy
 from bkmonitor.utils.text import underscore_to_camel
@@ -50,8 +51,12 @@ else:
 class RedisDataKey:
     """
     redis 的Key对象
+    extra_config:
+        use_codec=False  是否使用版本化的队列编解码(见 codec.py)
     """
 
+    use_codec = False
+
     def __init__(self, key_tpl=None, ttl=None, backend=None, is_global=False, **extra_config):
         self._cache = None
         if not all([key_tpl, ttl, backend]):
@@ -91,6 +96,21 @@ class RedisDataKey:
         # 注意在pipeline中使用pipeline调用expire方法，不要调用该对象自身的expire方法
         self.client.expire(self.get_key(**key_kwargs), self.ttl)
 
+    def get_codec(self):
+        """
+        获取写入数据使用的编码器，批量写入时先获取编码器，避免逐条读取配置
+        """
+        if self.use_codec:
+            return queue_codec.get_write_codec()
+        return queue_codec.LEGACY_CODEC
+
+    def dumps(self, value):
+        return self.get_codec().dumps(value)
+
+    def loads(self, payload):
+        # 读取时兼容所有版本的数据，保证切换编码过程中新旧数据均可消费
+        return queue_codec.loads(payload)
+
 
 class SimilarStr(str):
     _strategy_id = 0
@@ -203,6 +223,7 @@ DATA_LIST_KEY = register_key_with_config(
         "key_tpl": "access.data.{strategy_id}.{item_id}",
         "ttl": 30 * CONST_MINUTES,
         "backend": "queue",
+        "use_codec": True,
     }
 )
 
@@ -223,6 +244,7 @@ NO_DATA_LIST_KEY = register_key_with_config(
         "key_tpl": "access.nodata.{strategy_id}.{item_id}",
         "ttl": 10 * CONST_MINUTES,
         "backend": "queue",
+        "use_codec": True,
     }
 )
 
@@ -234,6 +256,7 @@ HISTORY_DATA_KEY = register_key_with_config(
         "field_tpl": "{dimensions_md5}",
         "ttl": 30 * CONST_MINUTES,
         "backend": "service",
+        "use_codec": True,
     }
 )
 
@@ -244,6 +267,7 @@ ANOMALY_LIST_KEY = register_key_with_config(
         "key_tpl": "detect.anomaly.list.{strategy_id}.{item_id}",
         "ttl": 30 * CONST_MINUTES,
         "backend": "queue",
+        "use_codec": True,
     }
 )
 
@@ -9,10 +9,13 @@ specific language governing permissions and limitations under the License.
 """
 
 import copy
+import hashlib
 import json
 import logging
+import pickle
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta
 from functools import reduce
@@ -85,6 +88,13 @@ class StrategyCacheManager(CacheManager):
     STRATEGY_GROUP_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".strategy_group"
     # 最近增量更新时间
     LAST_UPDATED_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".last_updated"
+    # 策略版本缓存key，hash结构 {strategy_id: 策略详情md5}
+    VERSION_CACHE_KEY = CacheManager.CACHE_KEY_PREFIX + ".strategy_versions"
+    # 进程内策略详情缓存数量上限
+    LOCAL_CACHE_SIZE = 5000
+    # 进程内策略详情缓存 {strategy_id: (version, 序列化后的策略详情)}
+    _local_cache: OrderedDict = OrderedDict()
+    _local_cache_lock = threading.Lock()
     # 事件型时序检测周期(默认60s)
     fake_event_agg_interval = 60
     # 实例维度
@@ -614,10 +624,99 @@ class StrategyCacheManager(CacheManager):
     def get_strategy_by_id(cls, strategy_id: int) -> dict:
         """
         从缓存中获取策略详情
+        优先使用进程内缓存，通过策略版本校验缓存是否有效，版本不一致时才重新拉取并解析策略详情
         """
+        version = cls.cache.hget(cls.VERSION_CACHE_KEY, strategy_id)
+        strategy = cls.get_local_strategy(strategy_id, version)
+        if strategy is not None:
+            return strategy
+
         strategy = json.loads(cls.cache.get(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id)) or "null")
+        cls.set_local_strategy(strategy_id, version, strategy)
         return strategy
 
+    @staticmethod
+    def get_strategy_version(strategy_json: str) -> str:
+        """
+        计算策略版本，策略详情在刷新时会追加屏蔽、集群等条件，因此使用缓存内容的md5而不是策略更新时间
+        """
+        return hashlib.md5(strategy_json.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_local_strategy(cls, strategy_id: int, version: str | None) -> dict | None:
+        """
+        获取进程内缓存的策略详情，版本不一致时返回None
+        调用方会修改策略详情，因此每次返回反序列化后的新对象
+        """
+        if not version:
+            return None
+        with cls._local_cache_lock:
+            cached = cls._local_cache.get(str(strategy_id))
+            if cached is None or cached[0] != version:
+                return None
+            cls._local_cache.move_to_end(str(strategy_id))
+        return pickle.loads(cached[1])
+
+    @classmethod
+    def set_local_strategy(cls, strategy_id: int, version: str | None, strategy: dict | None):
+        """
+        写入进程内缓存，没有版本的策略(旧版本刷新任务写入)不做缓存
+        """
+        if not version or not strategy:
+            with cls._local_cache_lock:
+                cls._local_cache.pop(str(strategy_id), None)
+            return
+
+        data = pickle.dumps(strategy, protocol=pickle.HIGHEST_PROTOCOL)
+        with cls._local_cache_lock:
+            cls._local_cache[str(strategy_id)] = (version, data)
+            cls._local_cache.move_to_end(str(strategy_id))
+            while len(cls._local_cache) > cls.LOCAL_CACHE_SIZE:
+                cls._local_cache.popitem(last=False)
+
+    @classmethod
+    def clear_local_cache(cls):
+        with cls._local_cache_lock:
+            cls._local_cache.clear()
+
+    @classmethod
+    def delete_strategy_cache(cls, strategy_ids: Iterable[int]):
+        """
+        删除策略详情及其版本
+        """
+        strategy_ids = list(strategy_ids)
+        if not strategy_ids:
+            return
+        pipeline = cls.cache.pipeline()
+        for strategy_id in strategy_ids:
+            pipeline.delete(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id))
+        pipeline.hdel(cls.VERSION_CACHE_KEY, *strategy_ids)
+        pipeline.execute()
+
+    @classmethod
+    def set_strategy_cache(cls, strategy_id: int, strategy: dict):
+        """
+        写入单个策略详情及其版本，用于局部更新策略详情，保证进程内缓存感知到变更
+        """
+        strategy_json = json.dumps(strategy)
+        pipeline = cls.cache.pipeline()
+        pipeline.set(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id), strategy_json, cls.CACHE_TIMEOUT)
+        # 策略版本需在策略详情之后写入，保证读取到新版本时策略详情已更新
+        pipeline.hset(cls.VERSION_CACHE_KEY, strategy_id, cls.get_strategy_version(strategy_json))
+        pipeline.execute()
+
+    @classmethod
+    def set_if_changed(cls, key: str, value: str) -> bool:
+        """
+        缓存内容变化时才写入，未变化时只续期
+        :return: 是否写入
+        """
+        if cls.cache.get(key) == value:
+            cls.cache.expire(key, cls.CACHE_TIMEOUT)
+            return False
+        cls.cache.set(key, value, cls.CACHE_TIMEOUT)
+        return True
+
     @classmethod
     def get_all_bk_biz_ids(cls) -> list:
         """
@@ -730,6 +829,7 @@ class StrategyCacheManager(CacheManager):
 
         :param strategies: 当前所有的策略信息列表，每条策略包含唯一的ID。
         :param to_be_deleted_strategy_ids: 可选参数，指定需要从缓存中删除的策略ID列表。
+        :return: 删除的策略数量
         """
         # 从传入的策略列表中提取所有策略的ID，形成一个新集合。
         updated_strategy_ids: set = {strategy["id"] for strategy in strategies}
@@ -760,15 +860,18 @@ class StrategyCacheManager(CacheManager):
         updated_strategy_ids |= old_strategy_ids - set(invalid_strategy_ids)
 
         # 更新缓存中的策略ID列表。
-        cls.cache.set(cls.IDS_CACHE_KEY, json.dumps(list(updated_strategy_ids)), cls.CACHE_TIMEOUT)
+        cls.set_if_changed(cls.IDS_CACHE_KEY, json.dumps(sorted(updated_strategy_ids)))
 
         # 遍历旧的策略ID列表，检查是否有不在新策略列表中的ID。
+        deleted_strategy_ids = []
         for strategy_id in old_strategy_ids:
             # 如果旧列表中的ID在新列表中找不到，则说明该策略已被删除或更改。
             if strategy_id not in updated_strategy_ids:
                 logger.info(f"[smart_strategy_cache]: refresh_strategy_ids delete strategy: {strategy_id}")
-                # 从缓存中删除该策略的相关信息。
-                cls.cache.delete(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id))
+                deleted_strategy_ids.append(strategy_id)
+        # 从缓存中删除该策略的相关信息。
+        cls.delete_strategy_cache(deleted_strategy_ids)
+        return len(deleted_strategy_ids)
 
     @classmethod
     def refresh_bk_biz_ids(cls, strategies: list[dict], partial=None):
@@ -778,7 +881,7 @@ class StrategyCacheManager(CacheManager):
         bk_biz_ids = {strategy["bk_biz_id"] for strategy in strategies}
         if partial is None:
             # 全量刷新
-            return cls.cache.set(cls.BK_BIZ_IDS_CACHE_KEY, json.dumps(list(bk_biz_ids)), cls.CACHE_TIMEOUT)
+            return cls.set_if_changed(cls.BK_BIZ_IDS_CACHE_KEY, json.dumps(sorted(bk_biz_ids)))
 
         # 增量刷新
         old_bk_biz_ids = cls.get_all_bk_biz_ids()
@@ -814,7 +917,7 @@ class StrategyCacheManager(CacheManager):
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_real_time_strategy_ids: %s", e)
 
-        cls.cache.set(cls.REAL_TIME_CACHE_KEY, json.dumps(real_time_strategys), cls.CACHE_TIMEOUT)
+        return cls.set_if_changed(cls.REAL_TIME_CACHE_KEY, json.dumps(real_time_strategys))
 
     @classmethod
     def refresh_nodata_strategy_ids(cls, strategies: list[dict]):
@@ -829,7 +932,7 @@ class StrategyCacheManager(CacheManager):
                     nodata_strategy_ids.append(strategy["id"])
                     continue
 
-        cls.cache.set(cls.NO_DATA_CACHE_KEY, json.dumps(nodata_strategy_ids), cls.CACHE_TIMEOUT)
+        return cls.set_if_changed(cls.NO_DATA_CACHE_KEY, json.dumps(nodata_strategy_ids))
 
     @classmethod
     def refresh_aiops_sdk_strategy_ids(cls, strategies: list[dict]):
@@ -844,7 +947,7 @@ class StrategyCacheManager(CacheManager):
                 if intelligent_detect.get("use_sdk"):
                     aiops_sdk_strategy_ids.append(strategy["id"])
 
-        cls.cache.set(cls.AIOPS_SDK_CACHE_KEY, json.dumps(aiops_sdk_strategy_ids), cls.CACHE_TIMEOUT)
+        return cls.set_if_changed(cls.AIOPS_SDK_CACHE_KEY, json.dumps(aiops_sdk_strategy_ids))
 
     @classmethod
     def refresh_gse_alarm_strategy_ids(cls, strategies: list[dict]):
@@ -863,7 +966,7 @@ class StrategyCacheManager(CacheManager):
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_gse_alarm_strategy_ids: %s", e)
 
-        cls.cache.set(cls.GSE_ALARM_CACHE_KEY, json.dumps(gse_event_strategy_ids), cls.CACHE_TIMEOUT)
+        return cls.set_if_changed(cls.GSE_ALARM_CACHE_KEY, json.dumps(gse_event_strategy_ids))
 
     @classmethod
     def refresh_fta_alert_strategy_ids(cls, strategies: list[dict]):
@@ -892,21 +995,25 @@ class StrategyCacheManager(CacheManager):
             except Exception as e:
                 logger.exception("refresh strategy error when refresh_fta_alert_strategy_ids: %s", e)
 
-        # 批量保存 Key
-        if fta_alert_strategy_ids:
-            cls.cache.hmset(
-                cls.FTA_ALERT_CACHE_KEY, {key: json.dumps(value) for key, value in fta_alert_strategy_ids.items()}
-            )
+        # 差量保存变化的 Key
+        old_values = cls.cache.hgetall(cls.FTA_ALERT_CACHE_KEY)
+        changed_values = {}
+        for key, value in fta_alert_strategy_ids.items():
+            value = json.dumps(value)
+            if old_values.get(key) != value:
+                changed_values[key] = value
+        if changed_values:
+            cls.cache.hmset(cls.FTA_ALERT_CACHE_KEY, changed_values)
 
         # 差量删除多余的 Key
-        old_keys = cls.cache.hkeys(cls.FTA_ALERT_CACHE_KEY)
-        deleted_keys = set(old_keys) - set(fta_alert_strategy_ids.keys())
+        deleted_keys = set(old_values) - set(fta_alert_strategy_ids.keys())
         if deleted_keys:
             cls.cache.hdel(cls.FTA_ALERT_CACHE_KEY, *deleted_keys)
         cls.cache.expire(cls.FTA_ALERT_CACHE_KEY, cls.CACHE_TIMEOUT)
+        return len(changed_values) + len(deleted_keys)
 
     @classmethod
-    def refresh_strategy(cls, strategies: list[dict], old_groups=None):
+    def refresh_strategy(cls, strategies: list[dict], old_groups=None, incremental=False):
         """
         刷新策略缓存
         该方法用于更新策略的缓存，确保策略及其相关分组信息是最新的
@@ -921,17 +1028,32 @@ class StrategyCacheManager(CacheManager):
 
         :param strategies: 新的策略列表，每个策略包含其详细信息
         :param old_groups: 旧的策略分组信息，如果为None，则进行全量更新。否则进行增量更新，删除不在新策略中的旧分组
+        :param incremental: 是否按内容差量写入，只重写版本发生变化的策略及内容发生变化的分组，未变化的策略只续期
+        :return: 写入的策略数量及分组数量
         """
         # 初始化策略分组缓存结构
         strategy_groups = defaultdict(lambda: defaultdict(list))
+        old_versions = cls.cache.hgetall(cls.VERSION_CACHE_KEY) if incremental else {}
+        changed_strategy_count = 0
+        # 内容未变化只做续期的策略，续期失败(缓存已失效)时需要补写
+        unchanged_strategies = []
 
         # 开启缓存pipeline以优化写入性能
         pipeline = cls.cache.pipeline()
         for strategy in strategies:
-            # 将策略信息存储到缓存中
-            pipeline.set(
-                cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy["id"]), json.dumps(strategy), cls.CACHE_TIMEOUT
-            )
+            strategy_key = cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy["id"])
+            strategy_json = json.dumps(strategy)
+            version = cls.get_strategy_version(strategy_json)
+            if old_versions.get(str(strategy["id"])) == version:
+                # 记录续期命令在pipeline中的位置
+                unchanged_strategies.append((len(pipeline), strategy_key, strategy_json))
+                pipeline.expire(strategy_key, cls.CACHE_TIMEOUT)
+            else:
+                # 将策略信息存储到缓存中
+                pipeline.set(strategy_key, strategy_json, cls.CACHE_TIMEOUT)
+                # 策略版本需在策略详情之后写入，保证读取到新版本时策略详情已更新
+                pipeline.hset(cls.VERSION_CACHE_KEY, strategy["id"], version)
+                changed_strategy_count += 1
             # 默认周期 50s
             for item in strategy["items"]:
                 if item.get("query_md5"):
@@ -963,24 +1085,49 @@ class StrategyCacheManager(CacheManager):
 
         # 判断是否是全量更新
         refresh_all = old_groups is None
-        if refresh_all:
+        old_group_values = {}
+        if incremental:
+            old_group_values = cls.cache.hgetall(cls.STRATEGY_GROUP_CACHE_KEY)
+            old_groups = list(old_group_values) if refresh_all else old_groups
+        elif refresh_all:
             # 全量更新，获取旧的分组信息
             old_groups = cls.cache.hkeys(cls.STRATEGY_GROUP_CACHE_KEY)
 
         # 删除不在新策略中的旧分组
+        changed_group_count = 0
         for query_md5 in old_groups:
             if query_md5 not in strategy_groups:
                 if not refresh_all:
                     logger.info(f"[smart_strategy_cache]: refresh_strategy delete old group: {query_md5}")
                 pipeline.hdel(cls.STRATEGY_GROUP_CACHE_KEY, query_md5)
+                changed_group_count += 1
         # 更新新的分组信息到缓存中
         for query_md5 in strategy_groups:
-            pipeline.hset(cls.STRATEGY_GROUP_CACHE_KEY, query_md5, json.dumps(strategy_groups[query_md5]))
+            group_json = json.dumps(strategy_groups[query_md5])
+            if old_group_values.get(query_md5) == group_json:
+                continue
+            pipeline.hset(cls.STRATEGY_GROUP_CACHE_KEY, query_md5, group_json)
+            changed_group_count += 1
         # 设置缓存过期时间
         pipeline.expire(cls.STRATEGY_GROUP_CACHE_KEY, cls.CACHE_TIMEOUT)
+        pipeline.expire(cls.VERSION_CACHE_KEY, cls.CACHE_TIMEOUT)
 
         # 执行pipeline中的所有操作
-        pipeline.execute()
+        results = pipeline.execute()
+
+        # 续期失败说明策略详情已失效，重新写入
+        missing_strategies = [
+            (strategy_key, strategy_json)
+            for index, strategy_key, strategy_json in unchanged_strategies
+            if not results[index]
+        ]
+        if missing_strategies:
+            pipeline = cls.cache.pipeline()
+            for strategy_key, strategy_json in missing_strategies:
+                pipeline.set(strategy_key, strategy_json, cls.CACHE_TIMEOUT)
+            pipeline.execute()
+            changed_strategy_count += len(missing_strategies)
+        return {"strategy": changed_strategy_count, "group": changed_group_count}
 
     @classmethod
     def add_enabled_cluster_condition(cls, strategy_configs: list[dict]):
@@ -1087,12 +1234,15 @@ class StrategyCacheManager(CacheManager):
                 logger.exception("refresh strategy error when add_target_shield_condition: %s", e)
 
     @classmethod
-    def refresh(cls):
+    def refresh(cls, incremental: bool | None = None):
         """
         全量更新策略缓存
+        :param incremental: 是否差量写入缓存，默认读取 STRATEGY_CACHE_INCREMENTAL_REFRESH 配置
         """
         start_time = time.time()
         exc = None
+        if incremental is None:
+            incremental = settings.STRATEGY_CACHE_INCREMENTAL_REFRESH
 
         # 获取策略列表并缓存
         try:
@@ -1127,12 +1277,15 @@ class StrategyCacheManager(CacheManager):
                 logger.exception(f"[refresh_strategy_cache]: get data of changed_strategies_map failed: {e}")
                 exc = e
 
-        processors: list[Callable[[list[dict]], None]] = [
+        def refresh_strategy(_strategies):
+            return cls.refresh_strategy(_strategies, incremental=incremental)
+
+        processors: list[Callable[[list[dict]], Any]] = [
             cls.add_target_shield_condition,
             cls.add_enabled_cluster_condition,
             cls.refresh_strategy_ids,  # 刷新缓存策略ID
             cls.refresh_bk_biz_ids,  # 刷新缓存业务ID
-            cls.refresh_strategy,  # 刷新缓存策略详细信息和策略分组信息
+            refresh_strategy,  # 刷新缓存策略详细信息和策略分组信息
             cls.refresh_real_time_strategy_ids,  # 刷新实时数据的相关策略
             cls.refresh_gse_alarm_strategy_ids,  # 刷新gse事件策略ID列表缓存
             cls.refresh_fta_alert_strategy_ids,  # 刷新自愈策略列表缓存
@@ -1145,8 +1298,11 @@ class StrategyCacheManager(CacheManager):
         for processor in processors:
             try:
                 start = time.time()
-                processor(strategies)
-                logger.info(f"refresh strategy {processor.__name__} cost: {time.time() - start}")
+                touched = processor(strategies)
+                logger.info(
+                    f"refresh strategy {processor.__name__} cost: {time.time() - start}"
+                    + (f", touched: {touched}" if touched is not None else "")
+                )
             except Exception as e:
                 logger.exception(f"refresh strategy error when {processor.__name__}")
                 exc = e
@@ -1155,8 +1311,7 @@ class StrategyCacheManager(CacheManager):
         histories = StrategyHistoryModel.objects.filter(create_time__gt=datetime.fromtimestamp(process_time))
         if histories.exists():
             target_biz_set, to_be_deleted_strategy_ids = cls.handle_history_strategies(histories, with_group_key=False)
-            for strategy_id, _ in to_be_deleted_strategy_ids:
-                cls.cache.delete(cls.CACHE_KEY_TEMPLATE.format(strategy_id=strategy_id))
+            cls.delete_strategy_cache(strategy_id for strategy_id, _ in to_be_deleted_strategy_ids)
 
         duration = time.time() - start_time
         metrics.ALARM_CACHE_TASK_TIME.labels("0", "strategy", str(exc)).observe(duration)
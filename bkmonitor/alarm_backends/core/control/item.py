@@ -21,7 +21,7 @@ from alarm_backends.core.detect_result import CONST_MAX_LEN_CHECK_RESULT
 from bkmonitor.data_source import load_data_source
 from bkmonitor.data_source.unify_query.query import UnifyQuery
 from bkmonitor.utils.common_utils import safe_int
-from bkmonitor.utils.range import load_condition_instance
+from bkmonitor.utils.range import load_compiled_condition_instance, load_condition_instance
 from bkmonitor.utils.range.target import TargetCondition
 from constants.strategy import AGG_METHOD_REAL_TIME
 
@@ -45,7 +45,7 @@ def gen_condition_matcher(agg_condition):
     if and_cond:
         or_cond.append(and_cond)
 
-    return load_condition_instance(or_cond)
+    return load_compiled_condition_instance(or_cond)
 
 
 class Item(DetectMixin, CheckMixin, DoubleCheckMixin):
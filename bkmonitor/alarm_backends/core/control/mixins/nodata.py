@@ -24,8 +24,12 @@ from alarm_backends.constants import (
 )
 from alarm_backends.core.cache import key
 from alarm_backends.core.cache.cmdb.host import HostManager
-from alarm_backends.core.detect_result import ANOMALY_LABEL, CheckResult
-from bkmonitor.utils.common_utils import count_md5
+from alarm_backends.core.detect_result import (
+    ANOMALY_LABEL,
+    CONST_DIMENSION_BATCH_SIZE,
+    CheckResult,
+)
+from bkmonitor.utils.common_utils import chunks, count_md5
 from bkmonitor.utils.tenant import bk_biz_id_to_bk_tenant_id
 
 logger = logging.getLogger("core.control")
@@ -101,25 +105,23 @@ class CheckMixin:
 
             # 5. 生成异常记录，生成规则：1）当前监测点无数据 or 2）当前监测点有数据，但是数据上报时间晚于 last_check_point
             anomaly_data = []
-            target_dimensions_md5 = []
-            last_check_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=self.strategy.id, item_id=self.id)
-            for target_inst_dms in target_instance_dimensions:
-                target_dms_md5 = count_md5(target_inst_dms)
-                target_dimensions_md5.append(target_dms_md5)
-                # 之前检测的数据最后上报点
-                last_checkpoint_cache_field = key.LAST_CHECKPOINTS_CACHE_KEY.get_field(
-                    dimensions_md5=target_dms_md5,
-                    level=self.no_data_level,
-                )
-                last_point = key.LAST_CHECKPOINTS_CACHE_KEY.client.hget(
-                    last_check_cache_key, last_checkpoint_cache_field
-                )
+            target_dimensions_md5 = [count_md5(target_inst_dms) for target_inst_dms in target_instance_dimensions]
+            # 之前检测的数据最后上报点，只有存在上报数据的维度才需要比较
+            last_points = CheckResult.get_last_checkpoints(
+                self.strategy.id,
+                self.id,
+                [dms_md5 for dms_md5 in target_dimensions_md5 if dms_md5 in dimensions_md5_timestamp],
+                self.no_data_level,
+            )
+            recover_dimensions_md5 = []
+            for target_inst_dms, target_dms_md5 in zip(target_instance_dimensions, target_dimensions_md5):
+                last_point = last_points.get(target_dms_md5)
                 if target_dms_md5 not in dimensions_md5_timestamp or (
                     last_point and dimensions_md5_timestamp[target_dms_md5] < int(last_point)
                 ):
                     # 如果存在主机维度，判断其是否存在于业务中
                     if not self._is_host_dimension_in_business(target_inst_dms):
-                        self.recover(target_dms_md5)
+                        recover_dimensions_md5.append(target_dms_md5)
                         continue
 
                     anomaly_data.append(self._produce_anomaly_info(check_timestamp, target_inst_dms, target_dms_md5))
@@ -130,7 +132,8 @@ class CheckMixin:
                     )
                 else:
                     # recovery 历史告警事件
-                    self.recover(target_dms_md5)
+                    recover_dimensions_md5.append(target_dms_md5)
+            self.recover(*recover_dimensions_md5)
 
             # 6. 如果有不存在的目标实例，生成异常记录
             for missing_target_inst in missing_target_instances:
@@ -292,6 +295,7 @@ class CheckMixin:
         redis_pipeline = None
         processed = set()
         all_dimensions_md5 = target_dimensions_md5 + data_dimensions_md5
+        data_dimensions_md5_set = set(data_dimensions_md5)
         loop = 0
         try:
             strategy_ttl = self.get_detect_result_expire_ttl()
@@ -314,7 +318,7 @@ class CheckMixin:
                 service_type="nodata",
             )
 
-            is_anomaly = dimensions_md5 not in data_dimensions_md5
+            is_anomaly = dimensions_md5 not in data_dimensions_md5_set
             if is_anomaly:
                 # 按 60s/agg_interval 比例向上取整回填 ANOMALY tag，使 tag 密度匹配 trigger 窗口预期。
                 # - agg_interval >= 60s：steps=1，回退为单点写入（与现状一致，processor.py:205 去重前置防重复）
@@ -370,10 +374,14 @@ class CheckMixin:
         )
         CheckResult.expire_last_checkpoint_cache(strategy_id=self.strategy.id, item_id=self.id)
 
-    def recover(self, dimensions_md5):
-        key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.client.hdel(
-            key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_key(),
+    def recover(self, *dimensions_md5_list):
+        fields = [
             key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_field(
                 strategy_id=self.strategy.id, item_id=self.id, dimensions_md5=dimensions_md5
-            ),
-        )
+            )
+            for dimensions_md5 in dimensions_md5_list
+        ]
+        for sub_fields in chunks(fields, CONST_DIMENSION_BATCH_SIZE):
+            key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.client.hdel(
+                key.NO_DATA_LAST_ANOMALY_CHECKPOINTS_CACHE_KEY.get_key(), *sub_fields
+            )
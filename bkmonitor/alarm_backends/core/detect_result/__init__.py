@@ -11,15 +11,19 @@ specific language governing permissions and limitations under the License.
 
 
 import json
+from itertools import chain
 
 from alarm_backends.constants import (
     LATEST_NO_DATA_CHECK_POINT,
     LATEST_POINT_WITH_ALL_KEY,
 )
 from alarm_backends.core.cache import key
+from bkmonitor.utils.common_utils import chunks
 
 CONST_MAX_LEN_CHECK_RESULT = 30  # 检测结果缓存，默认只保留30条数据
 
+CONST_DIMENSION_BATCH_SIZE = 1000  # 维度缓存批量读写时，单条命令的字段数量
+
 ANOMALY_LABEL = "ANOMALY"  # 异常标识
 
 
@@ -141,6 +145,24 @@ class CheckResult(Result):
         detect_service.hset(last_checkpoint_cache_key, last_checkpoint_cache_field, check_point)
         return check_point
 
+    @staticmethod
+    def get_last_checkpoints(strategy_id, item_id, dimensions_md5_list, level, batch_size=CONST_DIMENSION_BATCH_SIZE):
+        """
+        批量获取维度最后检测点
+        :return: {dimensions_md5: last_checkpoint}，不存在的维度值为 None
+        """
+        if not dimensions_md5_list:
+            return {}
+        last_checkpoint_cache_key = key.LAST_CHECKPOINTS_CACHE_KEY.get_key(strategy_id=strategy_id, item_id=item_id)
+        fields = [
+            key.LAST_CHECKPOINTS_CACHE_KEY.get_field(dimensions_md5=dimensions_md5, level=level)
+            for dimensions_md5 in dimensions_md5_list
+        ]
+        pipeline = key.LAST_CHECKPOINTS_CACHE_KEY.client.pipeline(transaction=False)
+        for sub_fields in chunks(fields, batch_size):
+            pipeline.hmget(last_checkpoint_cache_key, sub_fields)
+        return dict(zip(dimensions_md5_list, chain.from_iterable(pipeline.execute())))
+
     @staticmethod
     def expire_last_checkpoint_cache(strategy_id, item_id):
         key.LAST_CHECKPOINTS_CACHE_KEY.expire(strategy_id=strategy_id, item_id=item_id)
@@ -170,6 +192,44 @@ class CheckResult(Result):
         cache_key = cls.get_md5_to_dimension_key(service_type, strategy_id, item_id)
         key.MD5_TO_DIMENSION_CACHE_KEY.client.hdel(cache_key, dimensions_md5)
 
+    @classmethod
+    def get_dimensions(cls, service_type: str, strategy_id: int, item_id: int, batch_size=CONST_DIMENSION_BATCH_SIZE):
+        """
+        分页扫描获取监控项下的全部维度
+        :return: {dimensions_md5: dimension}
+        """
+        # nodata 逻辑
+        cache_key = cls.get_md5_to_dimension_key(service_type, strategy_id, item_id)
+        client = key.MD5_TO_DIMENSION_CACHE_KEY.client
+        dimensions = {}
+        cursor = 0
+        while True:
+            cursor, page = client.hscan(cache_key, cursor=cursor, count=batch_size)
+            for dimensions_md5, dimension_data in page.items():
+                if dimension_data:
+                    dimensions[dimensions_md5] = json.loads(dimension_data)
+            if not cursor:
+                break
+        return dimensions
+
+    @classmethod
+    def remove_dimensions_by_keys(
+        cls,
+        service_type: str,
+        strategy_id: int,
+        item_id: int,
+        dimensions_md5_list,
+        batch_size=CONST_DIMENSION_BATCH_SIZE,
+    ):
+        # nodata 逻辑
+        if not dimensions_md5_list:
+            return
+        cache_key = cls.get_md5_to_dimension_key(service_type, strategy_id, item_id)
+        pipeline = key.MD5_TO_DIMENSION_CACHE_KEY.client.pipeline(transaction=False)
+        for sub_keys in chunks(list(dimensions_md5_list), batch_size):
+            pipeline.hdel(cache_key, *sub_keys)
+        pipeline.execute()
+
     @classmethod
     def get_dimensions_keys(cls, service_type, strategy_id, item_id):
         # nodata 逻辑
@@ -75,11 +75,16 @@ class MultiRedisLock:
         self._token = uniqid4()
         self._lock_success_keys = set()
 
-    def acquire(self):
-        if not self.keys:
-            return []
-
-        keys = list(set(self.keys))
+    def acquire(self, keys: list[str] = None) -> set[str]:
+        """
+        批量加锁，所有 key 的 SET NX 在一次 pipeline 中提交
+        :param keys: 需要加锁的 key，默认为全部 key，已持有的 key 不会重复加锁，可用于对加锁失败的 key 重试
+        :return: 本次加锁成功的 key
+        """
+        keys = self.keys if keys is None else keys
+        keys = [key for key in dict.fromkeys(keys) if key not in self._lock_success_keys]
+        if not keys:
+            return set()
 
         pipeline = self.client.pipeline(transaction=False)
         for key in keys:
@@ -87,17 +92,22 @@ class MultiRedisLock:
 
         results = pipeline.execute()
 
-        for index, locked in enumerate(results):
-            if locked:
-                self._lock_success_keys.add(keys[index])
-
-        return self._lock_success_keys
+        locked_keys = {key for key, locked in zip(keys, results) if locked}
+        self._lock_success_keys.update(locked_keys)
+        return locked_keys
 
-    def release(self):
-        if not self._lock_success_keys:
+    def release(self, keys: list[str] = None):
+        """
+        释放锁
+        :param keys: 需要释放的 key，默认释放全部已持有的 key
+        """
+        if keys is None:
+            lock_success_keys = list(self._lock_success_keys)
+        else:
+            lock_success_keys = [key for key in dict.fromkeys(keys) if key in self._lock_success_keys]
+        if not lock_success_keys:
             return
-
-        lock_success_keys = list(self._lock_success_keys)
+        self._lock_success_keys.difference_update(lock_success_keys)
 
         results = self.client.mget(lock_success_keys)
 
@@ -17,6 +17,7 @@ from alarm_backends.core.cluster import get_cluster
 from alarm_backends.core.lock import MultiRedisLock, RedisLock
 from alarm_backends.core.storage.redis import Cache
 from core.errors.alarm_backends import LockError
+from core.prometheus import metrics
 
 
 @contextmanager
@@ -42,7 +43,13 @@ def multi_service_lock(key_instance, keys):
     lock = None
     try:
         lock = MultiRedisLock(keys, key_instance.ttl)
-        lock.acquire()
+        start = time.time()
+        locked_keys = lock.acquire()
+        metrics.SERVICE_LOCK_ACQUIRE_TIME.labels(lock=key_instance.key_tpl).observe(time.time() - start)
+        metrics.SERVICE_LOCK_KEY_COUNT.labels(lock=key_instance.key_tpl, status="locked").inc(len(locked_keys))
+        metrics.SERVICE_LOCK_KEY_COUNT.labels(lock=key_instance.key_tpl, status="contended").inc(
+            len(set(keys)) - len(locked_keys)
+        )
         yield lock
     finally:
         if lock is not None:
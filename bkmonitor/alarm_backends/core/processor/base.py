@@ -9,7 +9,6 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import json
 from abc import ABCMeta
 
 import six
@@ -40,10 +39,11 @@ class BaseAbnormalPushProcessor(six.with_metaclass(ABCMeta, object)):
         anomaly_count = 0
         anomaly_signal_list = anomaly_signal_list or []
         pipeline = key.ANOMALY_LIST_KEY.client.pipeline(transaction=False)
+        codec = key.ANOMALY_LIST_KEY.get_codec()
 
         for item_id, outputs in six.iteritems(outputs):
             if outputs:
-                outputs_data = [json.dumps(i) for i in outputs]
+                outputs_data = [codec.dumps(i) for i in outputs]
                 anomaly_count += len(outputs_data)
                 anomaly_signal_list.append("{strategy_id}.{item_id}".format(strategy_id=strategy_id, item_id=item_id))
 
@@ -10,6 +10,7 @@ specific language governing permissions and limitations under the License.
 
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from time import monotonic
 
@@ -19,9 +20,15 @@ from redis.exceptions import RedisError
 from alarm_backends.core.cluster import get_cluster
 from alarm_backends.core.storage.redis import CACHE_BACKEND_CONF_MAP, Cache, gen_resilient_socket_conf
 from bkmonitor.models import CacheNode, CacheRouter
+from bkmonitor.utils.common_utils import chunks
 
 logger = logging.getLogger("alarm_backends")
 
+# 按节点批量获取时，单条 mget 命令的 key 数量上限
+MGET_CHUNK_SIZE = 1000
+# 按节点批量获取时，最大并发节点数
+MGET_MAX_WORKERS = 8
+
 
 class PipelineResultMismatch(RedisError):
     """pipeline 各节点返回的响应数与入队命令数不一致。
@@ -153,6 +160,49 @@ class RedisProxy(KeyRouterMixin):
 
         return self._client_pool[node.id]
 
+    def mget_by_node(self, keys, chunk_size=MGET_CHUNK_SIZE):
+        """按 key 的 strategy_id 路由到节点分组批量获取，结果与 keys 顺序一致。
+
+        原生 mget 只会按第一个 key 路由，跨节点的 key 会读不到数据。这里同一路由快照内
+        为每个 key 解析节点，每个节点一次 pipeline（按 chunk_size 切分 mget），多节点并发执行。
+        """
+        if not keys:
+            return []
+
+        node_keys = {}
+        with routing_snapshot():
+            for index, key in enumerate(keys):
+                node = get_node_by_strategy_id(self.strategy_id_from_key(key))
+                node_keys.setdefault(node.id, (node, []))[1].append(index)
+
+        # 客户端池非线程安全，在主线程中初始化
+        tasks = [(self.get_client(node), indexes) for node, indexes in node_keys.values()]
+
+        def fetch(client, indexes):
+            exception = None
+            for _ in range(3):
+                try:
+                    pipeline = client.pipeline(transaction=False)
+                    for chunk_indexes in chunks(indexes, chunk_size):
+                        pipeline.mget([keys[index] for index in chunk_indexes])
+                    return [value for values in pipeline.execute() for value in values]
+                except ConnectionError as err:
+                    exception = err
+                    client.refresh_instance()
+            raise exception
+
+        results = [None] * len(keys)
+        if len(tasks) == 1:
+            fetched = [fetch(*tasks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(tasks), MGET_MAX_WORKERS)) as executor:
+                fetched = list(executor.map(lambda task: fetch(*task), tasks))
+
+        for (_, indexes), values in zip(tasks, fetched):
+            for index, value in zip(indexes, values):
+                results[index] = value
+        return results
+
     def __getattr__(self, name):
         def handle(*args, **kwargs):
             exception = None
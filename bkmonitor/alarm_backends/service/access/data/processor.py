@@ -81,6 +81,9 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
         clear_mem_cache("host_cache")
         # 释放服务实例信息本地内存
         clear_mem_cache("service_instance_cache")
+        # 数据已完成格式化，释放原始数据
+        for record in self.record_list:
+            record.release_raw_data()
 
     def _check_circuit_breaking_before_pull(self) -> bool:
         """在数据查询前检查策略级别熔断并剔除触发熔断的策略。
@@ -148,14 +151,17 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
     def pull(self):
         pass
 
-    def _push_noise_data(self, item, record_list):
+    def _build_noise_data(self, item, record_list):
+        """
+        :summary: 计算单个item的降噪基数
+        :return: (record_key, noise_data, dimension_keys)，未开启降噪时返回 None
+        """
         noise_reduce_config = item.strategy.notice.get("options", {}).get("noise_reduce_config")
         if not (noise_reduce_config and noise_reduce_config.get("is_enabled")):
             logger.debug(
                 "skip to add noise data for strategy(%s) due to noise reduce is not enabled", item.strategy.strategy_id
             )
             return
-        client = key.NOISE_REDUCE_TOTAL_KEY.client
         dimension_hash = count_md5(noise_reduce_config["dimensions"])
         record_key = key.NOISE_REDUCE_TOTAL_KEY.get_key(
             strategy_id=item.strategy.strategy_id, noise_dimension_hash=dimension_hash
@@ -169,9 +175,9 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
             logger.debug("strategy(%s) noise reduce dimension_value(%s)", item.strategy.strategy_id, dimension_value)
             dimension_value_hash = count_md5(dimension_value)
             noise_data[dimension_value_hash] = record.data["time"]
-        client.zadd(record_key, noise_data)
-        client.expire(record_key, key.NOISE_REDUCE_TOTAL_KEY.ttl)
+        return record_key, noise_data, noise_reduce_config["dimensions"]
 
+    def _record_noise_push(self, item, record_key, dimension_keys, noise_data):
         # 非批量任务，记录日志
         if not self.sub_task_id:
             logger.info(
@@ -180,7 +186,7 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 "strategy({strategy_id}), item({item_id}), "
                 "push dimension records({records_length}).".format(
                     record_key=record_key,
-                    dimension_key="|".join(noise_reduce_config["dimensions"]),
+                    dimension_key="|".join(dimension_keys),
                     strategy_id=item.strategy.strategy_id,
                     item_id=item.id,
                     records_length=len(noise_data.keys()),
@@ -190,22 +196,22 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
             self.process_counts.setdefault("push_noise_data", {})
             self.process_counts["push_noise_data"][str(item.id)] = {
                 "record_key": record_key,
-                "dimension_key": "|".join(noise_reduce_config["dimensions"]),
+                "dimension_key": "|".join(dimension_keys),
                 "count": len(noise_data.keys()),
             }
 
-    def _push(self, item, record_list, output_client=None, data_list_key=None):
-        """
-        :summary: 推送单个item的数据到检测队列或无数据待检测队列
-        :param item
-        :param record_list
-        :param output_client
-        :param data_list_key：数据队列，默认为 key.DATA_LIST_KEY
-        """
-        data_list_key = data_list_key or key.DATA_LIST_KEY
-        client = output_client or data_list_key.client
-        output_key = data_list_key.get_key(strategy_id=item.strategy.strategy_id, item_id=item.id)
-        queue_length = client.llen(output_key)
+    def _push_noise_data(self, item, record_list):
+        noise = self._build_noise_data(item, record_list)
+        if not noise:
+            return
+        record_key, noise_data, dimension_keys = noise
+        client = key.NOISE_REDUCE_TOTAL_KEY.client
+        client.zadd(record_key, noise_data)
+        client.expire(record_key, key.NOISE_REDUCE_TOTAL_KEY.ttl)
+        self._record_noise_push(item, record_key, dimension_keys, noise_data)
+
+    @staticmethod
+    def _check_queue_length(item, output_key, queue_length):
         # 超过最大检测长度10倍(50w)说明detect模块处理能力不足,数据将被丢弃。
         if queue_length > settings.SQL_MAX_LIMIT * 10:
             msg = (
@@ -216,16 +222,22 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
             )
             raise Exception(msg)
 
-        pipeline = client.pipeline(transaction=False)
+    @staticmethod
+    def _pipeline_push(pipeline, item, record_list, output_key, data_list_key):
+        """
+        :summary: 将单个item的数据写入pipeline，由调用方负责execute
+        """
+        codec = data_list_key.get_codec()
         _offset = 0
         while _offset < len(record_list):
             chunk_records = record_list[_offset : _offset + 10000]
-            pipeline.lpush(output_key, *[json.dumps(record.data) for record in chunk_records])
+            pipeline.lpush(output_key, *[codec.dumps(record.data) for record in chunk_records])
             _offset += 10000
         # 避免监控周期大于默认key过期时间，引起数据丢失
         agg_interval = min(query_config["agg_interval"] for query_config in item.query_configs)
         pipeline.expire(output_key, max([data_list_key.ttl, agg_interval * 5]))
-        pipeline.execute()
+
+    def _record_push(self, item, record_list, output_key):
         metrics.ACCESS_PROCESS_PUSH_DATA_COUNT.labels(strategy_id=metrics.TOTAL_TAG, type="data").inc(len(record_list))
 
         # 非批量任务，记录日志
@@ -242,6 +254,104 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 "count": len(record_list),
             }
 
+    def _push(self, item, record_list, output_client=None, data_list_key=None):
+        """
+        :summary: 推送单个item的数据到检测队列或无数据待检测队列
+        :param item
+        :param record_list
+        :param output_client
+        :param data_list_key：数据队列，默认为 key.DATA_LIST_KEY
+        """
+        data_list_key = data_list_key or key.DATA_LIST_KEY
+        client = output_client or data_list_key.client
+        output_key = data_list_key.get_key(strategy_id=item.strategy.strategy_id, item_id=item.id)
+        self._check_queue_length(item, output_key, client.llen(output_key))
+
+        pipeline = client.pipeline(transaction=False)
+        self._pipeline_push(pipeline, item, record_list, output_key, data_list_key)
+        pipeline.execute()
+        self._record_push(item, record_list, output_key)
+
+    def _batch_push(self, data_pushes, noise_pushes, output_client=None):
+        """
+        :summary: 批量推送所有item的检测数据、无数据检测数据及降噪基数
+        pipeline 会按 key 中的 strategy_id 路由到对应的 redis 节点，每个节点只需一次往返：
+        1. 一次 pipeline 检查所有队列长度
+        2. 一次 pipeline 写入所有检测队列及无数据检测队列
+        3. 一次 pipeline 写入所有降噪基数(service 库，与队列不在同一个 db)
+        :param data_pushes: [(item, record_list, data_list_key)]
+        :param noise_pushes: [(item, record_list)]
+        :return: (检测数据已成功写入的策略ID集合, 队列积压异常)
+        """
+        pending_pushes = []
+        for item, record_list, data_list_key in data_pushes:
+            output_key = data_list_key.get_key(strategy_id=item.strategy.strategy_id, item_id=item.id)
+            pending_pushes.append((item, record_list, data_list_key, output_key))
+
+        # 检测队列与无数据检测队列同属 queue 库
+        client = output_client or key.DATA_LIST_KEY.client
+        overflow_error = None
+        overflow_item_ids = set()
+        pushed_strategy_ids = set()
+        if pending_pushes:
+            pipeline = client.pipeline(transaction=False)
+            for _, _, _, output_key in pending_pushes:
+                pipeline.llen(output_key)
+            queue_lengths = pipeline.execute()
+
+            pushed = []
+            pipeline = client.pipeline(transaction=False)
+            for (item, record_list, data_list_key, output_key), queue_length in zip(pending_pushes, queue_lengths):
+                try:
+                    self._check_queue_length(item, output_key, queue_length)
+                except Exception as e:
+                    # 单个队列积压不影响其他队列的推送，推送完成后再抛出
+                    logger.error(str(e))
+                    overflow_error = overflow_error or e
+                    if data_list_key == key.DATA_LIST_KEY:
+                        overflow_item_ids.add(item.id)
+                    continue
+                self._pipeline_push(pipeline, item, record_list, output_key, data_list_key)
+                pushed.append((item, record_list, data_list_key, output_key))
+            if pushed:
+                pipeline.execute()
+            for item, record_list, data_list_key, output_key in pushed:
+                self._record_push(item, record_list, output_key)
+                if data_list_key == key.DATA_LIST_KEY:
+                    pushed_strategy_ids.add(item.strategy.id)
+
+        # 推送降噪基数至redis队列
+        noise_records = []
+        for item, record_list in noise_pushes:
+            # 检测队列积压时数据未写入，不记录降噪基数
+            if item.id in overflow_item_ids:
+                continue
+            try:
+                noise = self._build_noise_data(item, record_list)
+            except BaseException as e:
+                logger.exception("push noise data of strategy(%s) error, %s", item.strategy.id, str(e))
+                continue
+            if noise:
+                noise_records.append((item, noise))
+        if noise_records:
+            try:
+                pipeline = key.NOISE_REDUCE_TOTAL_KEY.client.pipeline(transaction=False)
+                for _, (record_key, noise_data, _) in noise_records:
+                    pipeline.zadd(record_key, noise_data)
+                    pipeline.expire(record_key, key.NOISE_REDUCE_TOTAL_KEY.ttl)
+                pipeline.execute()
+            except BaseException as e:
+                logger.exception(
+                    "push noise data of strategies(%s) error, %s",
+                    ",".join(str(item.strategy.id) for item, _ in noise_records),
+                    str(e),
+                )
+            else:
+                for item, (record_key, noise_data, dimension_keys) in noise_records:
+                    self._record_noise_push(item, record_key, dimension_keys, noise_data)
+
+        return pushed_strategy_ids, overflow_error
+
     def push(self, records: list | None = None, output_client=None):
         """
         推送格式化后的数据到 detect 和 nodata 中(按单个策略，单个item项，写入不同的队列)
@@ -267,37 +377,42 @@ class BaseAccessDataProcess(base.BaseAccessProcess):
                 if record.is_retains[item_id] and not record.inhibitions[item_id]:
                     pending_to_push[item_id].append(record)
 
-        strategy_ids = set()
+        data_pushes = []
+        noise_pushes = []
         for item_id, record_list in list(pending_to_push.items()):
             item = item_id_to_item[item_id]
             if record_list:
-                strategy_ids.add(item.strategy.id)
-
                 # 推送到检测队列
-                self._push(item, record_list, output_client)
+                data_pushes.append((item, record_list, key.DATA_LIST_KEY))
+                noise_pushes.append((item, record_list))
 
-                # 推送降噪基数至redis队列
-                try:
-                    self._push_noise_data(item, record_list)
-                except BaseException as e:
-                    logger.exception("push noise data of strategy(%s) error, %s", item.strategy.id, str(e))
+            # 推送无数据处理
+            if item.no_data_config["is_enabled"]:
+                data_pushes.append((item, records, key.NO_DATA_LIST_KEY))
+
+        strategy_ids, overflow_error = self._batch_push(data_pushes, noise_pushes, output_client)
 
+        for item_id in pending_to_push:
+            item = item_id_to_item[item_id]
             logger.info(
                 "strategy_group_key(%s) strategy(%s) item(%s) push records to detect done",
                 item.strategy.strategy_group_key,
                 item.strategy.id,
                 item.id,
             )
-            # 推送无数据处理
-            if item.no_data_config["is_enabled"]:
-                self._push(item, records, output_client, key.NO_DATA_LIST_KEY)
 
-        # 推送数据处理信号
+        # 推送数据处理信号，需要在数据全部写入后推送
         if records:
             client = output_client or key.DATA_SIGNAL_KEY.client
+            pipeline = client.pipeline(transaction=False)
             if strategy_ids:
-                client.lpush(key.DATA_SIGNAL_KEY.get_key(), *list(strategy_ids))
-            client.expire(key.DATA_SIGNAL_KEY.get_key(), key.DATA_SIGNAL_KEY.ttl)
+                pipeline.lpush(key.DATA_SIGNAL_KEY.get_key(), *list(strategy_ids))
+            pipeline.expire(key.DATA_SIGNAL_KEY.get_key(), key.DATA_SIGNAL_KEY.ttl)
+            pipeline.execute()
+
+        # 已写入队列的数据信号推送完成后，再抛出队列积压异常
+        if overflow_error:
+            raise overflow_error
 
 
 class AccessDataProcess(BaseAccessDataProcess):
@@ -307,6 +422,8 @@ class AccessDataProcess(BaseAccessDataProcess):
         self.from_timestamp = None
         self.until_timestamp = None
         self.inline_trigger_items = []
+        # 流式批量处理时，当前进程内已完成的其余批次的处理结果
+        self.stream_batch_results = []
 
         if sub_task_id:
             self.batch_timestamp = int(sub_task_id.split(".")[0])
@@ -436,7 +553,11 @@ class AccessDataProcess(BaseAccessDataProcess):
                     redis_node=redis_node,
                 ).inc(point_total)
             if settings.ACCESS_DATA_BATCH_PROCESS_THRESHOLD > 0:
-                points = self.send_batch_data(points, settings.ACCESS_DATA_BATCH_PROCESS_SIZE)
+                if settings.ACCESS_DATA_STREAM_PROCESS_ENABLED:
+                    # 当前进程内逐批处理，不再下发异步任务
+                    points = self.process_stream_batch_data(points, settings.ACCESS_DATA_BATCH_PROCESS_SIZE)
+                else:
+                    points = self.send_batch_data(points, settings.ACCESS_DATA_BATCH_PROCESS_SIZE)
 
         # 过滤重复数据并实例化
         self.filter_duplicates(points)
@@ -599,8 +720,51 @@ class AccessDataProcess(BaseAccessDataProcess):
 
         client = key.ACCESS_BATCH_DATA_KEY.client
         first_batch_points = []  # 第一批数据，原地处理
+        batch_count = 0  # 批次计数
+
+        for batch_points in self.split_batch_points(points, batch_threshold):
+            batch_count += 1
+
+            # 第一批数据：数据序列最前面的部分 series 的完整时间范围，原地处理，减少延迟
+            if batch_count == 1:
+                first_batch_points = batch_points
+                continue
+
+            # 其余批次：后续 series 的完整时间范围，通过异步任务处理
+            # 生成子任务ID：格式为 {batch_timestamp}.{batch_count}
+            sub_task_id = f"{self.batch_timestamp}.{batch_count}"
+            data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
+                strategy_group_key=self.strategy_group_key, sub_task_id=sub_task_id
+            )
+            data_key.strategy_id = self.items[0].strategy.id
+
+            # 数据压缩：使用 gzip + base64 压缩数据，减少 Redis 存储空间
+            compress_batch_points = base64.b64encode(gzip.compress(json.dumps(batch_points).encode("utf-8")))
+            client.set(data_key, compress_batch_points, ex=key.ACCESS_BATCH_DATA_KEY.ttl)
+
+            # 发起异步任务：将批量数据写入 Redis 后，发起异步处理任务
+            # 任务队列：celery_service_batch（批量数据处理任务队列）
+            run_access_batch_data.delay(self.strategy_group_key, sub_task_id)
+
+        if batch_count > 1:
+            self.sub_task_id = f"{self.batch_timestamp}.1"
+            self.batch_count = batch_count
+            logger.info(
+                f"strategy_group_key({self.strategy_group_key}), split {len(points)} access data into {batch_count} batch tasks"
+            )
+
+        return first_batch_points
+
+    @staticmethod
+    def split_batch_points(points: list[dict], batch_threshold: int):
+        """
+        按数据量拆分数据点，逐批返回（保障时间点完整性）
+
+        - 拆分触发条件：当累积数据量达到阈值且遇到新时间点时，触发拆分
+        - 当数据点数不足阈值或当前记录与前一个记录属于同一时间点时，继续累积，不触发拆分
+        """
         latest_record_timestamp = None  # 上一个记录的时间戳，用于判断是否遇到新时间点
-        last_batch_index, batch_count = 0, 0  # last_batch_index: 上一批次的结束位置，batch_count: 批次计数
+        last_batch_index = 0  # 上一批次的结束位置
 
         # 遍历数据点（从前往后），按数据量拆分（保障时间点完整性）
         for index, record in enumerate(points):
@@ -617,47 +781,62 @@ class AccessDataProcess(BaseAccessDataProcess):
                 latest_record_timestamp = timestamp
                 continue  # 继续累积
 
-            # 触发拆分：当数据量达到阈值（index - last_batch_index >= batch_threshold）
-            # 且遇到新时间点（latest_record_timestamp != timestamp）
-            # 且不是最后一条记录时，触发拆分
-            batch_count += 1
-
             # 确定当前批次的数据范围
             if index == len(points) - 1:
                 # 最后一条记录：包含从 last_batch_index 到结尾的所有数据
-                batch_points = points[last_batch_index:]
+                yield points[last_batch_index:]
             else:
                 # 非最后一条记录：包含从 last_batch_index 到 index（不含）的数据
-                batch_points = points[last_batch_index:index]
+                yield points[last_batch_index:index]
 
-            # 第一批数据：数据序列最前面的部分 series 的完整时间范围，原地处理，减少延迟
-            if batch_count == 1:
-                first_batch_points = batch_points
-            else:
-                # 其余批次：后续 series 的完整时间范围，通过异步任务处理
-                # 生成子任务ID：格式为 {batch_timestamp}.{batch_count}
-                sub_task_id = f"{self.batch_timestamp}.{batch_count}"
-                data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
-                    strategy_group_key=self.strategy_group_key, sub_task_id=sub_task_id
-                )
-                data_key.strategy_id = self.items[0].strategy.id
+            # 记录下一轮的起始位置
+            last_batch_index = index
 
-                # 数据压缩：使用 gzip + base64 压缩数据，减少 Redis 存储空间
-                compress_batch_points = base64.b64encode(gzip.compress(json.dumps(batch_points).encode("utf-8")))
-                client.set(data_key, compress_batch_points, ex=key.ACCESS_BATCH_DATA_KEY.ttl)
+    def process_stream_batch_data(self, points: list[dict], batch_threshold: int = 50000) -> list[dict]:
+        """
+        流式批量处理：与 send_batch_data 的拆分方式一致，但其余批次在当前进程内依次完成去重、过滤、格式化及推送，
+        每批处理完即释放，不再经过 Redis 中转及异步任务，避免数据序列化/压缩的开销。
 
-                # 发起异步任务：将批量数据写入 Redis 后，发起异步处理任务
-                # 任务队列：celery_service_batch（批量数据处理任务队列）
-                run_access_batch_data.delay(self.strategy_group_key, sub_task_id)
+        返回：
+            list[dict]: 第一批数据，由当前任务继续处理
+        """
+        self.batch_timestamp = int(time.time())
 
-            # 记录下一轮的起始位置
-            last_batch_index = index
+        first_batch_points = []
+        batch_count = 0
+        for batch_points in self.split_batch_points(points, batch_threshold):
+            batch_count += 1
+            if batch_count == 1:
+                first_batch_points = batch_points
+                continue
+
+            sub_task_id = f"{self.batch_timestamp}.{batch_count}"
+            try:
+                processor = AccessStreamBatchDataProcess(
+                    self.strategy_group_key, sub_task_id=sub_task_id, items=self.items, points=batch_points
+                )
+                self.stream_batch_results.append(processor.process())
+            except Exception as e:
+                # 单个批次失败不影响其余批次，失败结果交由主任务汇总
+                logger.exception(
+                    f"strategy_group_key({self.strategy_group_key}) stream batch({sub_task_id}) process error: {e}"
+                )
+                self.stream_batch_results.append(
+                    {
+                        "sub_task_id": sub_task_id,
+                        "result": False,
+                        "error": str(e),
+                        "process_counts": {},
+                        "inline_trigger_items": [],
+                    }
+                )
 
         if batch_count > 1:
             self.sub_task_id = f"{self.batch_timestamp}.1"
             self.batch_count = batch_count
             logger.info(
-                f"strategy_group_key({self.strategy_group_key}), split {len(points)} access data into {batch_count} batch tasks"
+                f"strategy_group_key({self.strategy_group_key}), "
+                f"stream process {len(points)} access data in {batch_count} batches"
             )
 
         return first_batch_points
@@ -688,6 +867,8 @@ class AccessDataProcess(BaseAccessDataProcess):
         max_queried_data_time = 0
 
         non_duplicate_records = []
+        # 同一批数据点共享维度值，降低大批量数据的内存占用
+        dimension_table = {}
 
         for record in reversed(points):
             # 先进行轻量级 value 检查
@@ -708,12 +889,12 @@ class AccessDataProcess(BaseAccessDataProcess):
                 duplicate_counts += 1
                 # 有优先级的策略，重复数据需要保留，后续再过滤
                 if have_priority:
-                    point = DataRecord(self.items, record)
+                    point = DataRecord(self.items, record, dimension_table)
                     point.is_duplicate = True
                     records.append(point)
             else:
                 # 非重复数据创建 DataRecord
-                point = DataRecord(self.items, record)
+                point = DataRecord(self.items, record, dimension_table)
                 records.append(point)
                 non_duplicate_records.append(point)
 
@@ -1138,7 +1319,7 @@ class AccessDataProcess(BaseAccessDataProcess):
             ).inc()
             return
 
-        # 等待分批任务结果
+        # 等待分批任务结果（流式批量处理的结果已在当前进程内得到）
         batch_results = [
             {
                 "sub_task_id": self.sub_task_id,
@@ -1148,6 +1329,7 @@ class AccessDataProcess(BaseAccessDataProcess):
                 "inline_trigger_items": self.inline_trigger_items,
             }
         ]
+        batch_results.extend(self.stream_batch_results)
         wait_start_time = time.time()
         while len(batch_results) < self.batch_count and time.time() - wait_start_time < 5 * constants.CONST_MINUTES:
             batch_result = client.brpop(result_key, timeout=1)
@@ -1383,6 +1565,40 @@ class AccessBatchDataProcess(AccessDataProcess):
         client.expire(result_key, key.ACCESS_BATCH_DATA_RESULT_KEY.ttl)
 
 
+class AccessStreamBatchDataProcess(AccessDataProcess):
+    """
+    流式分批处理器：由主任务在当前进程内创建，直接处理拆分后的批量数据。
+
+    与 AccessBatchDataProcess 的区别：
+    - 数据直接由主任务传入，无需从 Redis 读取及解压
+    - 复用主任务已加载的策略项
+    - 处理结果直接返回给主任务，无需写入结果队列
+    """
+
+    def __init__(self, *args, items: list[Item], points: list[dict], **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.sub_task_id is None:
+            raise ValueError("sub_task_id is required")
+        self.items = items
+        self.points = points
+
+    def pull(self):
+        # 数据交由 record 持有后即释放引用，保证处理完成后内存可以及时回收
+        points, self.points = self.points, None
+        self.filter_duplicates(points)
+
+    def process(self):
+        # AccessDataProcess.process 用于主任务汇总分批结果，不返回异常，这里直接执行 pull -> handle -> push
+        exc = base.BaseAccessProcess.process(self)
+        return {
+            "sub_task_id": self.sub_task_id,
+            "result": not exc,
+            "error": str(exc) if exc else "",
+            "process_counts": self.process_counts,
+            "inline_trigger_items": self.inline_trigger_items,
+        }
+
+
 class AccessRealTimeDataProcess(BaseAccessDataProcess):
     """
     实时监控数据拉取
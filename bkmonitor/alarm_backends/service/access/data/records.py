@@ -10,7 +10,6 @@ specific language governing permissions and limitations under the License.
 
 import logging
 import time
-from collections import defaultdict
 from typing import TYPE_CHECKING
 
 from django.conf import settings
@@ -100,6 +99,31 @@ def get_value_from_raw_data(raw_data: dict, item: "Item"):
         return raw_data.get("_result_")
 
 
+class ItemRetains(dict):
+    """
+    记录数据点在各 item 下经过 filter 之后是否仍然保留，未记录的 item 默认保留
+    与 defaultdict(lambda: True) 行为一致，但无需为每个数据点创建默认值函数
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        self[key] = True
+        return True
+
+
+class ItemInhibitions(dict):
+    """
+    记录数据点在各 item 下是否被抑制，未记录的 item 默认不抑制
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        self[key] = False
+        return False
+
+
 class DataRecord(base.BaseRecord):
     """
     raw_data:
@@ -129,10 +153,11 @@ class DataRecord(base.BaseRecord):
     items: list["Item"]
     _item: "Item"
 
-    def __init__(self, item_or_items: "Item | list[Item]", raw_data: dict):
+    def __init__(self, item_or_items: "Item | list[Item]", raw_data: dict, dimension_table: dict | None = None):
         """
         :param item_or_items: 具有相同查询条件的item集合
         :param raw_data: 原始数据记录
+        :param dimension_table: 维度值共享表，同一批数据点共用，相同的维度值只保留一份
         """
         super().__init__(raw_data)
 
@@ -147,9 +172,10 @@ class DataRecord(base.BaseRecord):
             self._item.strategy.scenario
         )  # 监控对象，相同查询条件的items，监控场景一定是相同的，由rt的label决定
 
-        self.is_retains = defaultdict(lambda: True)  # 保留记录，记录当前record经过filter之后是否仍然保留下来
+        self.is_retains = ItemRetains()  # 保留记录，记录当前record经过filter之后是否仍然保留下来
         self.is_duplicate = False  # 是否重复记录，记录当前record是否是重复记录
-        self.inhibitions = defaultdict(bool)  # 抑制记录，记录当前record是否被抑制
+        self.inhibitions = ItemInhibitions()  # 抑制记录，记录当前record是否被抑制
+        self.dimension_table = dimension_table
 
     @cached_property
     def bk_tenant_id(self) -> str:
@@ -257,6 +283,13 @@ class DataRecord(base.BaseRecord):
     def clean_dimensions(self):
         return self.dimensions
 
+    def release_raw_data(self):
+        """
+        数据格式化完成后，后续流程只依赖 data，释放原始数据以降低大批量数据的内存占用
+        """
+        self.raw_data = None
+        self.dimension_table = None
+
     ###################
     # PRIVATE METHODS #
     ###################
@@ -283,6 +316,13 @@ class DataRecord(base.BaseRecord):
                     if not self._is_proc_port_value_exist(field_value):
                         continue
                 dimensions[field] = field_value
+
+        if self.dimension_table is not None:
+            # 同一维度组合在不同时间点重复出现，共享维度值字符串，避免每个数据点各持有一份
+            # 维度名来自 item 配置或 json 解析时的键缓存，本身已是共享对象
+            for key, value in dimensions.items():
+                if isinstance(value, str):
+                    dimensions[key] = self.dimension_table.setdefault(value, value)
         return dimensions
 
     @staticmethod
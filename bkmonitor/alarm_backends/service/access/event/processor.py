@@ -144,8 +144,9 @@ class BaseAccessEventProcess(BaseAccessProcess, QoSMixin):
 
         # 1. split by strategy_id
         pending_to_push = {}
+        codec = key.ANOMALY_LIST_KEY.get_codec()
         for e in self.record_list:
-            data_str = e.to_str()
+            data_str = codec.dumps(e.data)
             for item in e.items:
                 strategy_id = item.strategy.id
                 item_id = item.id
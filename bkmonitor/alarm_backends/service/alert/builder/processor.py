@@ -30,6 +30,10 @@ from constants.action import AssignMode
 from constants.alert import EventStatus
 from core.prometheus import metrics
 
+# 告警加锁失败时，在当前进程内重试的次数及间隔(秒)，重试后仍失败再延后5s重新入队
+ALERT_LOCK_LOCAL_RETRY_TIMES = 2
+ALERT_LOCK_LOCAL_RETRY_INTERVAL = 0.2
+
 
 class AlertBuilder(BaseAlertProcessor):
     def __init__(self):
@@ -73,9 +77,11 @@ class AlertBuilder(BaseAlertProcessor):
         cached_alerts = self.list_alerts_content_from_cache(events)
         return {alert.dedupe_md5: alert for alert in cached_alerts}
 
-    def dedupe_events_to_alerts(self, events: list[Event]):
+    def dedupe_events_to_alerts(self, events: list[Event], retry_times: int = 0, lock_wait_start: float = None):
         """
         将事件进行去重，生成告警并保存
+        :param retry_times: 加锁失败后本地重试的次数
+        :param lock_wait_start: 首次加锁的时间，用于统计加锁等待耗时
         """
 
         def _report_latency(report_events):
@@ -110,6 +116,8 @@ class AlertBuilder(BaseAlertProcessor):
         if not events:
             return []
         lock_keys = [ALERT_UPDATE_LOCK.get_key(dedupe_md5=event.dedupe_md5) for event in events]
+        lock_wait_start = lock_wait_start or time.time()
+        retry_locally = False
 
         with multi_service_lock(ALERT_UPDATE_LOCK, lock_keys) as lock:
             success_locked_events = []
@@ -121,6 +129,8 @@ class AlertBuilder(BaseAlertProcessor):
                 else:
                     fail_locked_events.append(event)
 
+            if success_locked_events:
+                metrics.ALERT_PROCESS_LOCK_WAIT_TIME.labels(status="locked").observe(time.time() - lock_wait_start)
             _report_latency(success_locked_events)
 
             # 对加锁成功的告警才能进行操作
@@ -134,7 +144,11 @@ class AlertBuilder(BaseAlertProcessor):
             snapshot_count = self.update_alert_snapshot(alerts)
             self.logger.info("[alert.builder update alert snapshot]: %s", snapshot_count)
 
-            if fail_locked_events:
+            if fail_locked_events and retry_times < ALERT_LOCK_LOCAL_RETRY_TIMES:
+                # 加锁失败的告警，等当前批次释放锁后在本地重试，避免重新下发任务带来的延迟
+                retry_locally = True
+            elif fail_locked_events:
+                metrics.ALERT_PROCESS_LOCK_WAIT_TIME.labels(status="deferred").observe(time.time() - lock_wait_start)
                 from alarm_backends.service.alert.builder.tasks import (
                     dedupe_events_to_alerts,
                 )
@@ -169,6 +183,17 @@ class AlertBuilder(BaseAlertProcessor):
                 is_saved="1" if alert.should_refresh_db() else "0",
             ).inc()
 
+        if retry_locally:
+            self.logger.info(
+                "[alert.builder locked] %s alerts is locked, retry(%s) locally in %ss: %s",
+                len(fail_locked_events),
+                retry_times + 1,
+                ALERT_LOCK_LOCAL_RETRY_INTERVAL,
+                ",".join([event.dedupe_md5 for event in fail_locked_events]),
+            )
+            time.sleep(ALERT_LOCK_LOCAL_RETRY_INTERVAL)
+            alerts.extend(self.dedupe_events_to_alerts(fail_locked_events, retry_times + 1, lock_wait_start))
+
         return alerts
 
     def handle(self, events: list[Event]):
@@ -11,7 +11,7 @@ specific language governing permissions and limitations under the License.
 import json
 import logging
 
-from alarm_backends.core.alert import Alert, Event
+from alarm_backends.core.alert import Alert
 from alarm_backends.core.alert.alert import AlertKey
 from alarm_backends.core.cache import clear_mem_cache
 from alarm_backends.core.cache.key import ALERT_DEDUPE_CONTENT_KEY, ALERT_UPDATE_LOCK
@@ -26,8 +26,24 @@ from alarm_backends.service.alert.manager.checker.upgrade import UpgradeChecker
 from alarm_backends.service.alert.processor import BaseAlertProcessor
 from bkmonitor.documents import AlertDocument
 from bkmonitor.documents.base import BulkActionType
+from bkmonitor.utils.thread_backend import ThreadPool
+from constants.alert import EventStatus
 from core.prometheus import metrics
 
+# 用户修改字段，这些字段只有在ES是最准的
+USER_MODIFIED_FIELDS = [
+    "id",
+    "assignee",
+    "is_handled",
+    "handle_stage",
+    "is_ack",
+    "is_ack_noticed",
+    "ack_operator",
+    "appointee",
+    "supervisor",
+    "extra_info",
+]
+
 INSTALLED_CHECKERS = (
     NextStatusChecker,
     CloseStatusChecker,
@@ -47,34 +63,27 @@ class AlertManager(BaseAlertProcessor):
         # 本批告警状态是否已落库(save_alerts 完成)。用于区分 broker 异常发生在 finalize 前后:
         # finalize 后(send_signal)再抛 broker 异常会丢 signal、终态不会被下周期重发,不应计 deferred。
         self.alerts_finalized = False
+        # 加锁后读取的告警维度当前缓存内容，dedupe_md5 -> 告警数据(不存在为 None)
+        self.current_alert_contents = {}
 
     def fetch_alerts(self) -> list[Alert]:
-        # 1. 根据告警ID，从ES拉出数据
-        alerts = Alert.mget(self.alert_keys)
+        # 用户修改字段只依赖告警ID，与快照读取并发执行
+        alert_ids = [alert_key.alert_id for alert_key in self.alert_keys if alert_key.alert_id]
+        pool = ThreadPool(1)
+        try:
+            alert_docs_result = pool.apply_async(
+                AlertDocument.mget, kwds={"ids": alert_ids, "fields": USER_MODIFIED_FIELDS}
+            )
+            # 1. 根据告警ID，优先从快照拉取，快照不存在再从ES拉取
+            alerts = Alert.mget(self.alert_keys)
+            alert_docs = {alert_doc.id: alert_doc for alert_doc in alert_docs_result.get()}
+        finally:
+            pool.close()
 
         # 2. 补充用户修改字段，这些字段只有在ES是最准的，需要刷进去
-        fields = [
-            "id",
-            "assignee",
-            "is_handled",
-            "handle_stage",
-            "is_ack",
-            "is_ack_noticed",
-            "ack_operator",
-            "appointee",
-            "supervisor",
-            "extra_info",
-        ]
-        alert_docs = {
-            alert_doc.id: alert_doc
-            for alert_doc in AlertDocument.mget(
-                ids=[alert.id for alert in alerts],
-                fields=fields,
-            )
-        }
         for alert in alerts:
             if alert.id in alert_docs:
-                for field in fields:
+                for field in USER_MODIFIED_FIELDS:
                     if field == "extra_info":
                         # 以DB为主，同时合并check阶段新增内容
                         extra_info = getattr(alert_docs[alert.id], field, None)
@@ -84,6 +93,38 @@ class AlertManager(BaseAlertProcessor):
                         alert.data[field] = getattr(alert_docs[alert.id], field, None)
         return alerts
 
+    def get_current_alert_contents(self, alerts: list[Alert]) -> dict[str, dict]:
+        """
+        获取告警维度当前在缓存中的告警内容，按 dedupe_md5 返回原始数据
+        加锁后缓存内容不会再被其他模块修改，已读取过的维度直接复用，不再重复读取
+        """
+        alerts_to_fetch = {}
+        for alert in alerts:
+            if alert.dedupe_md5 not in self.current_alert_contents:
+                alerts_to_fetch.setdefault(alert.dedupe_md5, alert)
+
+        if alerts_to_fetch:
+            alert_dedupe_keys = [
+                ALERT_DEDUPE_CONTENT_KEY.get_key(strategy_id=alert.strategy_id or 0, dedupe_md5=dedupe_md5)
+                for dedupe_md5, alert in alerts_to_fetch.items()
+            ]
+            alert_data = ALERT_DEDUPE_CONTENT_KEY.client.mget_by_node(alert_dedupe_keys)
+            for dedupe_md5, current_alert_data in zip(alerts_to_fetch, alert_data):
+                current_alert = None
+                if current_alert_data:
+                    try:
+                        current_alert = json.loads(current_alert_data)
+                    except Exception:
+                        self.logger.warning("Failed to parse alert from cache: %s", current_alert_data)
+                # 缓存中不存在的维度也记录下来，避免重复读取
+                self.current_alert_contents[dedupe_md5] = current_alert
+
+        return {
+            alert.dedupe_md5: self.current_alert_contents[alert.dedupe_md5]
+            for alert in alerts
+            if self.current_alert_contents[alert.dedupe_md5]
+        }
+
     def filter_alerts(self, alerts: list[Alert]) -> list[Alert]:
         """
         过滤不需要处理的告警
@@ -91,35 +132,16 @@ class AlertManager(BaseAlertProcessor):
         :return:
         """
         # 1. 已关闭的告警 在ES拉取后到加锁处理前刚好被关闭了，此时拿到的这批alerts部分告警在redis已经是关闭状态了
-        alert_dedupe_keys = [
-            ALERT_DEDUPE_CONTENT_KEY.get_key(strategy_id=alert.strategy_id, dedupe_md5=alert.dedupe_md5)
-            for alert in alerts
-        ]
         fetched_alert_ids = set([alert.id for alert in alerts])
 
-        alert_data = ALERT_DEDUPE_CONTENT_KEY.client.mget(alert_dedupe_keys)
-        current_alerts_mapping = {}
-        for current_alert_data in alert_data:
-            if not current_alert_data:
-                # 如果从缓存中获取不到告警，表示当前告警应该为最新的告警信息，跳过过滤
-                continue
-            try:
-                current_alert = json.loads(current_alert_data)
-                current_alert = Alert(current_alert)
-            except Exception:
-                # 如果从缓存中获取不到告警，表示当前告警应该为最新的告警信息，跳过过滤
-                self.logger.warning("Failed to parse alert from cache: %s", current_alert_data)
-                continue
-            # 构造mapping，方便后续过滤
-            current_alerts_mapping[current_alert.dedupe_md5] = current_alert
+        # 如果从缓存中获取不到告警，表示当前告警应该为最新的告警信息，跳过过滤
+        current_alerts_mapping = self.get_current_alert_contents(alerts)
         new_alerts = []
         for alert in alerts:
-            if alert.dedupe_md5 in current_alerts_mapping:
-                # 如果缓存中存在当前告警，则使用缓存中的告警状态进行判断
-                cache_alert = current_alerts_mapping.get(alert.dedupe_md5)
-                if cache_alert and not cache_alert.is_abnormal():
-                    # 如果缓存二次确认状态不为异常则过滤掉，拉取的都是异常告警，若不一致说明此时告警可能已经被关闭或者恢复
-                    continue
+            cache_alert = current_alerts_mapping.get(alert.dedupe_md5)
+            if cache_alert and cache_alert.get("status") != EventStatus.ABNORMAL:
+                # 如果缓存二次确认状态不为异常则过滤掉，拉取的都是异常告警，若不一致说明此时告警可能已经被关闭或者恢复
+                continue
             # 其他情况正常进行处理
             new_alerts.append(alert)
         # 打印过滤日志(包含过滤的告警id)
@@ -203,10 +225,10 @@ class AlertManager(BaseAlertProcessor):
             checker.check_all()
 
         # 3. 更新缓存，只更新当前dedupe_md5的alert_id和需要更新的alert_id一致的部分，或者cache不存在的部分
-        active_alerts = self.list_alerts_content_from_cache(
-            [Event(data=alert.top_event, do_clean=False) for alert in alerts]
-        )
-        active_alerts_mapping = {alert.dedupe_md5: alert.id for alert in active_alerts}
+        active_alerts_mapping = {
+            dedupe_md5: current_alert.get("id")
+            for dedupe_md5, current_alert in self.get_current_alert_contents(alerts).items()
+        }
         update_count, finished_count = self.update_alert_cache(
             [
                 alert
@@ -13,6 +13,7 @@ import logging
 import time
 from collections import defaultdict
 
+from django.conf import settings
 from elasticsearch.helpers import BulkIndexError
 
 from alarm_backends.core.alert import Alert, Event
@@ -53,8 +54,8 @@ class BaseAlertProcessor:
             )
             dedupe_md5_list.extend(md5_list)
 
-        # 这里不能用 mget 进行优化，因为告警按 strategy_id 分组路由到不同的 redis 集群
-        alert_data = [ALERT_DEDUPE_CONTENT_KEY.client.get(cache_key) for cache_key in cache_keys]
+        # 告警按 strategy_id 分组路由到不同的 redis 集群，需要按节点分组进行 mget
+        alert_data = ALERT_DEDUPE_CONTENT_KEY.client.mget_by_node(cache_keys)
 
         alerts = []
 
@@ -137,6 +138,12 @@ class BaseAlertProcessor:
         if not log_documents:
             return []
 
+        if settings.ALERT_ES_WRITE_COALESCE_ENABLED:
+            # 流水只追加写入，交由合并器跨批次刷写；告警文档带有状态，始终在锁内同步写入
+            AlertLog.bulk_create_coalesced(log_documents)
+            logger.info("[save alert log document] coalesced(%d)", len(log_documents))
+            return
+
         start_time = time.time()
         errors = []
         try:
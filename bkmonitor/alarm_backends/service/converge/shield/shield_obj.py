@@ -10,6 +10,8 @@ specific language governing permissions and limitations under the License.
 
 import copy
 import logging
+import time
+from collections import defaultdict
 
 import arrow
 from django.utils.translation import gettext as _
@@ -27,6 +29,7 @@ from bkmonitor.utils.range import (
     load_field_instance,
 )
 from bkmonitor.utils.range.conditions import AndCondition, Condition, EqualCondition, OrCondition
+from bkmonitor.utils.range.fields import DimensionField
 from bkmonitor.utils.range.period import TimeMatch, TimeMatchBySingle
 from bkmonitor.utils.send import Sender
 from bkmonitor.utils.tenant import bk_biz_id_to_bk_tenant_id
@@ -541,3 +544,158 @@ class AlertShieldObj(ShieldObj):
     def is_match(self, alert: AlertDocument):
         source_time = arrow.now()
         return self.time_check.is_match(source_time) and self.dimension_check.is_match(self.get_dimension(alert))
+
+
+class AlertShieldIndex:
+    """
+    业务屏蔽配置的进程内索引
+
+    按策略ID、维度等值条件建立倒排，告警只需要与候选屏蔽配置逐个匹配，
+    避免屏蔽配置较多时每条告警都与业务下全部屏蔽配置做一次完整匹配。
+    索引只用于缩小候选范围，最终结果仍以 AlertShieldObj.is_match 为准。
+    """
+
+    # 索引有效期，动态分组等依赖外部缓存的配置需要定期重建
+    TTL = 60
+
+    # 优先用于建立索引的维度，策略ID区分度最高
+    PRIORITY_INDEX_FIELDS = ("strategy_id",)
+    # 区分度较低的维度，仅在没有其他等值维度时使用
+    LOW_PRIORITY_INDEX_FIELDS = ("level",)
+
+    # 进程内缓存 {bk_biz_id: AlertShieldIndex}
+    _biz_index_cache = {}
+
+    def __init__(self, configs, version=None):
+        self.version = version if version is not None else self.get_version(configs)
+        self.create_time = time.time()
+        self.shield_objs = {}
+        # {(维度名, 维度值): [shield_id]}
+        self.dimension_index = defaultdict(list)
+        self.index_fields = set()
+        # 无法建立索引的屏蔽配置，每条告警都需要匹配
+        self.unindexed_shield_ids = []
+
+        for config in configs:
+            shield_obj = AlertShieldObj(config)
+            self.shield_objs[shield_obj.id] = shield_obj
+            self._add(shield_obj)
+
+    @classmethod
+    def get_version(cls, configs):
+        """
+        屏蔽配置的版本，配置有增删改时版本发生变化
+        """
+        return tuple((config["id"], str(config.get("update_time"))) for config in configs)
+
+    @classmethod
+    def get_index(cls, bk_biz_id, configs):
+        """
+        获取业务的屏蔽索引，屏蔽配置发生变化或索引过期时重建
+        """
+        version = cls.get_version(configs)
+        index = cls._biz_index_cache.get(bk_biz_id)
+        if index is None or index.version != version or index.is_expired():
+            index = cls(configs, version=version)
+            cls._biz_index_cache[bk_biz_id] = index
+        return index
+
+    def is_expired(self):
+        return time.time() - self.create_time > self.TTL
+
+    @classmethod
+    def get_index_keys(cls, condition):
+        """
+        获取条件对应的索引键，告警命中条件时，其维度必然命中其中至少一个索引键
+        :return: {(维度名, 维度值)}，条件无法建立索引时返回 None
+        """
+        if type(condition) is EqualCondition:
+            # 仅普通维度字段的取值可以直接比较，ip、拓扑节点等字段存在特殊匹配逻辑
+            if type(condition.cond_field) is not DimensionField:
+                return None
+            name = condition.cond_field.name
+            return {(name, value) for value in condition.cond_field.to_str_list()}
+
+        if isinstance(condition, OrCondition):
+            # 或条件需要每个分支都能建立索引，索引键取并集
+            index_keys = set()
+            for sub_condition in condition.conditions:
+                sub_index_keys = cls.get_index_keys(sub_condition)
+                if sub_index_keys is None:
+                    return None
+                index_keys.update(sub_index_keys)
+            return index_keys or None
+
+        if isinstance(condition, AndCondition):
+            # 与条件选取任意一个能建立索引的子条件即可，优先选择区分度高的维度
+            candidates = []
+            for sub_condition in condition.conditions:
+                sub_index_keys = cls.get_index_keys(sub_condition)
+                if sub_index_keys:
+                    candidates.append(sub_index_keys)
+            if not candidates:
+                return None
+            return min(candidates, key=lambda index_keys: (cls.get_index_priority(index_keys), len(index_keys)))
+
+        return None
+
+    @classmethod
+    def get_index_priority(cls, index_keys):
+        """
+        索引键的优先级，数值越小区分度越高
+        """
+
+        def field_priority(name):
+            if name in cls.PRIORITY_INDEX_FIELDS:
+                return 0
+            if name in cls.LOW_PRIORITY_INDEX_FIELDS:
+                return 2
+            return 1
+
+        return max(field_priority(name) for name, __ in index_keys)
+
+    def _add(self, shield_obj):
+        index_keys = self.get_index_keys(shield_obj.dimension_check)
+        if not index_keys:
+            self.unindexed_shield_ids.append(shield_obj.id)
+            return
+
+        for name, value in index_keys:
+            self.index_fields.add(name)
+            self.dimension_index[(name, value)].append(shield_obj.id)
+
+    def get_candidates(self, alert: AlertDocument):
+        """
+        获取告警需要匹配的候选屏蔽配置
+        """
+        now = arrow.now()
+        candidate_ids = set(self.unindexed_shield_ids)
+        if self.dimension_index:
+            dimension = AlertShieldObj._get_cached_alert_dimension(alert)
+            for name in self.index_fields:
+                if name not in dimension:
+                    continue
+                for value in DimensionField(name, dimension[name]).to_str_list():
+                    candidate_ids.update(self.dimension_index.get((name, value), []))
+
+        # 按配置顺序返回，并过滤不在生效时间范围内的屏蔽配置
+        return [
+            shield_obj
+            for shield_id, shield_obj in self.shield_objs.items()
+            if shield_id in candidate_ids and shield_obj.time_check.is_datetime_match(now)
+        ]
+
+    def match(self, alert: AlertDocument):
+        """
+        获取告警命中的屏蔽配置
+        :return: (命中的屏蔽配置列表, 候选屏蔽配置数量)
+        """
+        candidates = self.get_candidates(alert)
+        return [shield_obj for shield_obj in candidates if shield_obj.is_match(alert)], len(candidates)
+
+    def get_shield_objs(self, shield_ids):
+        """
+        按屏蔽配置ID获取屏蔽对象
+        """
+        shield_ids = {str(shield_id) for shield_id in shield_ids}
+        return [shield_obj for shield_id, shield_obj in self.shield_objs.items() if str(shield_id) in shield_ids]
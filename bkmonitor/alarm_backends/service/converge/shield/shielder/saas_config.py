@@ -22,12 +22,13 @@ from alarm_backends.core.cache.shield import ShieldCacheManager
 from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.i18n import i18n
 from alarm_backends.service.alert.qos.influence import get_failure_scope_config
-from alarm_backends.service.converge.shield.shield_obj import AlertShieldObj
+from alarm_backends.service.converge.shield.shield_obj import AlertShieldIndex, AlertShieldObj
 from bkmonitor.documents.alert import AlertDocument
 from bkmonitor.models import ActionInstance, time_tools
 from bkmonitor.utils import extended_json
 from bkmonitor.utils.common_utils import safe_int
 from constants.shield import ShieldType
+from core.prometheus import metrics
 
 from .base import BaseShielder
 
@@ -52,7 +53,7 @@ class AlertShieldConfigShielder(BaseShielder):
         if config_ids:
             # 已经进行过屏蔽匹配了， 这里直接返回
             config_ids: list[str] = json.loads(config_ids)
-            return [AlertShieldObj(config) for config in self.configs if str(config["id"]) in config_ids]
+            return self.shield_index.get_shield_objs(config_ids)
         return None
 
     def set_shield_objs_cache(self):
@@ -81,15 +82,18 @@ class AlertShieldConfigShielder(BaseShielder):
             logger.exception(
                 "[load shield failed] alert(%s) strategy(%s) detail:(%s)", self.alert.id, self.alert.strategy_id, error
             )
+        self.shield_index = AlertShieldIndex.get_index(self.alert.event.bk_biz_id, self.configs)
 
         shield_objs_cache = self.get_shield_objs_from_cache()
         from_cache = True
         if shield_objs_cache is None:
-            self.shield_objs = []
-            for config in self.configs:
-                shield_obj = AlertShieldObj(config)
-                if shield_obj.is_match(alert):
-                    self.shield_objs.append(shield_obj)
+            # 通过屏蔽索引过滤出候选屏蔽配置，只对候选配置进行完整匹配
+            self.shield_objs, candidate_count = self.shield_index.match(alert)
+            bk_biz_id = self.alert.event.bk_biz_id
+            metrics.CONVERGE_SHIELD_CANDIDATE_COUNT.labels(bk_biz_id=bk_biz_id).observe(candidate_count)
+            metrics.CONVERGE_SHIELD_MATCH_COUNT.labels(
+                bk_biz_id=bk_biz_id, status="hit" if self.shield_objs else "miss"
+            ).inc()
             self.set_shield_objs_cache()
             from_cache = False
         else:
@@ -8,7 +8,6 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import json
 import logging
 from copy import deepcopy
 from dataclasses import dataclass, field
@@ -371,7 +370,8 @@ class DoubleCheckSumStrategy(DoubleCheckStrategy):
         if "__debug__" in point.data:
             logger.info(f"[二次检测] dummy push {point.data}")
         else:
-            data_list_key.client.lpush(output_key, *[json.dumps(point.data) for point in points])
+            codec = data_list_key.get_codec()
+            data_list_key.client.lpush(output_key, *[codec.dumps(point.data) for point in points])
             key.DATA_SIGNAL_KEY.client.lpush(key.DATA_SIGNAL_KEY.get_key(), *[self.item.strategy.strategy_id])
 
         logger.info(
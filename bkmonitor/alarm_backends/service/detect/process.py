@@ -91,7 +91,7 @@ class DetectProcess(BaseAbnormalPushProcessor):
             # 队列左进右出，lrange 取出时需要做一次倒序才能保证先进先出
             for record in reversed(records):
                 try:
-                    data_point = DataPoint(json.loads(record), item)
+                    data_point = DataPoint(key.DATA_LIST_KEY.loads(record), item)
                     # fill data point into inputs list
                     self.inputs[item.id].append(data_point)
                 except ValueError:
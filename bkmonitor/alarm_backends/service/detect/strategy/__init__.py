@@ -12,10 +12,9 @@ import concurrent.futures
 import copy
 import functools
 import inspect
-import json
 import logging
 import time
-from collections import Counter
+from collections import Counter, defaultdict
 
 from django.conf import settings
 from django.template import Context, Template
@@ -24,7 +23,12 @@ from django.utils.translation import gettext as _
 from alarm_backends.core.cache import key
 from alarm_backends.service.access.data.records import DataRecord
 from alarm_backends.service.detect import AnomalyDataPoint, DataPoint
-from alarm_backends.templatetags.unit import unit_auto_convert, unit_convert_min
+from alarm_backends.templatetags.unit import (
+    unit_auto_convert,
+    unit_convert_min,
+    unit_min_converter,
+)
+from bkmonitor.utils.common_utils import chunks
 from constants.aiops import SDKDetectStatus
 from core.errors.alarm_backends.detect import (
     HistoryDataNotExists,
@@ -36,12 +40,27 @@ from core.unit import load_unit
 
 logger = logging.getLogger("detect")
 
+# 历史数据缺失时间段超过该数量时，合并为一个时间段查询
+HISTORY_QUERY_MAX_RANGES = 3
+# 批量加载历史数据时单次 HMGET 的字段数量
+HISTORY_HMGET_CHUNK_SIZE = 5000
+
 
 class DetectContext(dict):
     def __getattr__(self, item):
         return self.__getitem__(item)
 
 
+@functools.lru_cache(maxsize=1024)
+def get_compiled_template(template_string):
+    """
+    获取编译后的异常描述模板
+    desc_tpl 由算法类、算法配置及单位决定，同一策略的模板文本固定，按模板文本缓存即可避免逐点重复解析
+    """
+    # 这里的模板固定可控，但是安全扫描提示风险，因此添加忽略
+    return Template(template_string)  # nosec
+
+
 class Algorithms:
     """
     检测算法基类，定义一个算法对象。
@@ -78,12 +97,16 @@ class Algorithms:
         context.update(self.extra_context(context))
         return context
 
-    def _detect(self, data_point):
+    @staticmethod
+    def validate_data_point(data_point):
         # validate data_point fabric
         for attr in DataPoint.context_field:
             if not hasattr(data_point, attr):
                 raise InvalidDataPoint(data_point=data_point)
 
+    def _detect(self, data_point):
+        self.validate_data_point(data_point)
+
         context = self.get_context(data_point)
         if "__debug__" not in data_point.as_dict():
             return eval(self.byte_code, {}, context)
@@ -122,8 +145,8 @@ class Algorithms:
         if not self.desc_tpl:
             return ""
         context = Context(self.get_context(data_point))
-        # 这里的模板固定可控，但是安全扫描提示风险，因此添加忽略
-        return Template(self.desc_tpl).render(context)  # nosec
+        # 惰性翻译的模板需按当前语言转换为字符串后再取缓存
+        return get_compiled_template(str(self.desc_tpl)).render(context)
 
     def detect_records(self, data_points, level):
         """
@@ -224,6 +247,8 @@ class BasicAlgorithmsCollection(Algorithms):
     desc_tpl = ""
     # op is Or or And
     expr_op = "and"
+    # 是否支持按 item 批量检测(需实现 batch_detect)，子类改写检测表达式时需要同步关闭
+    batch_detect_enabled = False
 
     def __init__(self, config, unit="", extra_config=None):
         """
@@ -271,6 +296,55 @@ class BasicAlgorithmsCollection(Algorithms):
         """
         yield ExprDetectAlgorithms("None", self.desc_tpl)
 
+    def detect_records(self, data_points, level):
+        if not (self.batch_detect_enabled and settings.ENABLE_DETECT_BATCH_MODE):
+            return super().detect_records(data_points, level)
+
+        if isinstance(data_points, DataPoint):
+            data_points = [data_points]
+        anomaly_points = []
+        for data_point, check_result in zip(data_points, self.batch_detect(data_points)):
+            if not check_result:
+                continue
+            ap = self.gen_anomaly_point(data_point, check_result, level)
+            logger.info(
+                f"[detect] strategy({ap.data_point.item.strategy.id}) item({ap.data_point.item.id}) level[{level}] 发现异常点: {ap.__dict__}"
+            )
+            anomaly_points.append(ap)
+
+        return anomaly_points
+
+    def batch_detect(self, data_points):
+        """
+        To be implemented
+        作用：按 item 批量检测，逐个返回与 data_points 一一对应的检测结果(同 detect 的返回值)
+        """
+        raise NotImplementedError
+
+    def detect_single(self, data_point):
+        """
+        批量检测中无法批量计算的数据点(如带 __debug__ 标记的调试数据)，回退到逐点检测
+        """
+        try:
+            return self.detect(data_point)
+        except Exception as e:
+            logger.debug(e)
+
+    @staticmethod
+    def build_anomaly_point(detector, data_point, anomaly_message=None):
+        """
+        批量检测命中后构造异常点，未指定异常描述时按表达式检测器的模板渲染
+        """
+        anomaly_point = AnomalyDataPoint(data_point=data_point, detector=detector)
+        if anomaly_message is None:
+            try:
+                anomaly_message = detector._format_message(data_point)
+            except Exception as e:
+                logger.error(f"format anomaly message error: {e}")
+                anomaly_message = ""
+        anomaly_point.anomaly_message = anomaly_message
+        return anomaly_point
+
     def detect(self, data_point):
         # 调用表达式检测算法的detect
         anomaly = []
@@ -300,6 +374,7 @@ class HistoryPointFetcher:
 
     def query_history_points(self, data_points):
         item = data_points[0].item
+        agg_interval = item.query_configs[0]["agg_interval"]
         # 按时间从小到大排序
         sorted_data_points = sorted(data_points, key=lambda x: x.timestamp)
         offsets = self.get_history_offsets(item)
@@ -314,56 +389,125 @@ class HistoryPointFetcher:
                 self._publish_history_points(item, data_points)
                 continue
 
-            records = []
             from_timestamp, until_timestamp = (
                 sorted_data_points[0].timestamp - end,
-                sorted_data_points[-1].timestamp - start + item.query_configs[0]["agg_interval"],
+                sorted_data_points[-1].timestamp - start + agg_interval,
             )
 
-            accessed = None
-            for history_timestamp in range(from_timestamp, until_timestamp, item.query_configs[0]["agg_interval"]):
-                if accessed is None:
-                    accessed = True
-                accessed = accessed and self._check_history_points(item, history_timestamp)
+            # 历史时刻的数据都已经查过的部分无需再查询，只查询缺失的时间段
+            missing_ranges = self._get_missing_history_ranges(
+                item, list(range(from_timestamp, until_timestamp, agg_interval))
+            )
+            for range_from, range_until in missing_ranges:
+                self._query_and_publish_history_points(item, range_from, range_until)
+
+        # 批量预加载本批数据点对应的历史数据，避免检测时逐个 history key 读取
+        self._local_history_storage = {}
+        self.load_history_points(item, data_points)
+
+    def _query_and_publish_history_points(self, item, from_timestamp, until_timestamp):
+        """
+        查询历史时间段的数据并发布到缓存
+        """
+        item_records = item.query_record(from_timestamp, until_timestamp)
+        if item.query.is_partial:
+            # 历史数据查询结果不完整（VM vmstorage 节点临时不可用），跳过本次缓存写入，等待下个周期重新触发。
+            # is_partial=True 由 unify-query 透传自 VictoriaMetrics：vmselect 在查询时发现有 vmstorage 节点
+            # 不可达，无法获取完整数据，故将结果标记为 partial。节点恢复后下个周期可正常查询。
+            # 影响：本批次依赖该 offset 历史数据的环比/同比检测失效（漏报 1 个 agg_interval），
+            #       下个周期 cache miss 后重新查询，存储恢复后自动恢复正常。
+            #       静态阈值（Threshold）等不依赖历史数据的算法不受影响。
+            logger.warning(
+                "strategy(%s) item(%s) history query is partial, skip cache writing, time_range(%s, %s)",
+                item.strategy.id,
+                item.id,
+                from_timestamp,
+                until_timestamp,
+            )
+            return
 
-            if accessed:
-                # 历史时刻的数据都已经查过
-                continue
+        records = []
+        for record in item_records:
+            point = DataRecord(item, record)
+            if point.value:
+                records.append(adapter_data_access_2_detect(point, item))
 
-            item_records = item.query_record(from_timestamp, until_timestamp)
-            if item.query.is_partial:
-                # 历史数据查询结果不完整（VM vmstorage 节点临时不可用），跳过本次缓存写入，等待下个周期重新触发。
-                # is_partial=True 由 unify-query 透传自 VictoriaMetrics：vmselect 在查询时发现有 vmstorage 节点
-                # 不可达，无法获取完整数据，故将结果标记为 partial。节点恢复后下个周期可正常查询。
-                # 影响：本批次依赖该 offset 历史数据的环比/同比检测失效（漏报 1 个 agg_interval），
-                #       下个周期 cache miss 后重新查询，存储恢复后自动恢复正常。
-                #       静态阈值（Threshold）等不依赖历史数据的算法不受影响。
-                logger.warning(
-                    "strategy(%s) item(%s) history query is partial, skip cache writing, time_range(%s, %s)",
-                    item.strategy.id,
-                    item.id,
-                    from_timestamp,
-                    until_timestamp,
-                )
+        self._publish_history_points(item, records)
+
+    def _get_missing_history_ranges(self, item, history_timestamps):
+        """
+        通过一次 pipeline 检查历史时刻的数据是否已经拉取过，返回缺失的时间段列表 [(from, until), ...]
+        缺失的时间段较零散时合并为一个时间段查询，避免产生过多的后端查询
+        """
+        if not history_timestamps:
+            return []
+
+        agg_interval = item.query_configs[0]["agg_interval"]
+        history_key_maker = functools.partial(
+            key.HISTORY_DATA_KEY.get_key, strategy_id=item.strategy.id, item_id=item.id
+        )
+        pipeline = key.HISTORY_DATA_KEY.client.pipeline(transaction=False)
+        for history_timestamp in history_timestamps:
+            pipeline.exists(history_key_maker(timestamp=history_timestamp))
+        accessed_list = pipeline.execute()
+
+        missing_ranges = []
+        for history_timestamp, accessed in zip(history_timestamps, accessed_list):
+            if accessed:
                 continue
+            if missing_ranges and missing_ranges[-1][1] == history_timestamp:
+                missing_ranges[-1][1] = history_timestamp + agg_interval
+            else:
+                missing_ranges.append([history_timestamp, history_timestamp + agg_interval])
 
-            for record in item_records:
-                point = DataRecord(item, record)
-                if point.value:
-                    records.append(adapter_data_access_2_detect(point, item))
+        if len(missing_ranges) > HISTORY_QUERY_MAX_RANGES:
+            return [(missing_ranges[0][0], missing_ranges[-1][1])]
+        return [tuple(missing_range) for missing_range in missing_ranges]
 
-            self._local_history_storage = {}
-            self._publish_history_points(item, records)
+    def iter_history_timestamps(self, item, timestamp):
+        """
+        获取数据点所有 offset 对应的历史时刻
+        """
+        agg_interval = item.query_configs[0]["agg_interval"]
+        for offset in self.get_history_offsets(item):
+            if isinstance(offset, tuple):
+                start, end = offset
+                yield from range(timestamp - end, timestamp - start + 1, agg_interval)
+            else:
+                yield timestamp - offset
 
-    def _check_history_points(self, item, history_timestamp):
+    def load_history_points(self, item, data_points):
         """
-        检查历史时刻的数据是否已经拉取过，如果存在，则更新过期时间。
+        批量加载数据点对应的历史数据到本地缓存
+        按 history key 汇总需要的维度，在一次 pipeline 中通过 HMGET 只读取需要的记录
         """
-        client = key.HISTORY_DATA_KEY.client
-        history_key = key.HISTORY_DATA_KEY.get_key(
-            strategy_id=item.strategy.id, item_id=item.id, timestamp=history_timestamp
+        if not getattr(self, "_local_history_storage", None):
+            self._local_history_storage = {}
+
+        history_key_maker = functools.partial(
+            key.HISTORY_DATA_KEY.get_key, strategy_id=item.strategy.id, item_id=item.id
         )
-        return client.exists(history_key)
+        history_fields = defaultdict(set)
+        for point in data_points:
+            dimensions_md5 = point.record_id.split(".")[0]
+            for history_timestamp in self.iter_history_timestamps(item, point.timestamp):
+                history_key = history_key_maker(timestamp=history_timestamp)
+                if history_key not in self._local_history_storage:
+                    history_fields[history_key].add(dimensions_md5)
+
+        if not history_fields:
+            return
+
+        requests = []
+        pipeline = key.HISTORY_DATA_KEY.client.pipeline(transaction=False)
+        for history_key, fields in history_fields.items():
+            for chunked_fields in chunks(list(fields), HISTORY_HMGET_CHUNK_SIZE):
+                pipeline.hmget(history_key, chunked_fields)
+                requests.append((history_key, chunked_fields))
+
+        for (history_key, fields), values in zip(requests, pipeline.execute()):
+            records = self._local_history_storage.setdefault(history_key, {})
+            records.update({field: value for field, value in zip(fields, values) if value is not None})
 
     def _publish_history_points(self, item, history_points):
         """
@@ -376,10 +520,11 @@ class HistoryPointFetcher:
             key.HISTORY_DATA_KEY.get_key, strategy_id=item.strategy.id, item_id=item.id
         )
         # bulk cache json data
+        codec = key.HISTORY_DATA_KEY.get_codec()
         history_points_map = {}
         for point in history_points:
             points_with_timestamp_map = history_points_map.setdefault(point.timestamp, {})
-            points_with_timestamp_map[point.record_id.split(".")[0]] = json.dumps(point.as_dict())
+            points_with_timestamp_map[point.record_id.split(".")[0]] = codec.dumps(point.as_dict())
 
         for timestamp, _points_with_timestamp_map in history_points_map.items():
             history_key = history_key_maker(timestamp=timestamp)
@@ -407,7 +552,7 @@ class HistoryPointFetcher:
                 return DataPoint({"value": self._default, "time": history_timestamp}, item)
             return
 
-        return DataPoint(json.loads(raw_data), item)
+        return DataPoint(key.HISTORY_DATA_KEY.loads(raw_data), item)
 
     def get_history_offsets(self, item):
         """
@@ -452,6 +597,56 @@ class RangeRatioAlgorithmsCollection(BasicAlgorithmsCollection, HistoryPointFetc
                 self.ceil_desc_tpl,
             )
 
+    def batch_detect(self, data_points):
+        """
+        批量同比/环比检测：单位换算函数按单位只生成一次，直接计算上升/下降占比，
+        仅对异常点渲染异常描述
+        """
+        checks = []
+        if self.validated_config["floor"]:
+            floor = self.validated_config["floor"]
+            checks.append(
+                lambda value, history_value: (value or history_value) and value <= history_value * (100 - floor) * 0.01
+            )
+        if self.validated_config["ceil"]:
+            ceil = self.validated_config["ceil"]
+            checks.append(
+                lambda value, history_value: (value or history_value) and value >= history_value * (100 + ceil) * 0.01
+            )
+
+        converters = {}
+        for data_point in data_points:
+            if "__debug__" in data_point.as_dict():
+                yield self.detect_single(data_point)
+                continue
+
+            try:
+                self.validate_data_point(data_point)
+                history_data_point = self.history_point_fetcher(data_point)
+                if history_data_point is None:
+                    yield None
+                    continue
+
+                unit = data_point.unit
+                if unit not in converters:
+                    converters[unit] = unit_min_converter(unit)
+                value = converters[unit](data_point.value)
+                history_value = converters[unit](history_data_point.value)
+
+                anomaly = []
+                for detector, check in zip(self.detectors, checks):
+                    if check(value, history_value):
+                        anomaly.append(self.build_anomaly_point(detector, data_point))
+                        if self.expr_op == "or":
+                            break
+                    elif self.expr_op == "and":
+                        anomaly = []
+                        break
+            except Exception as e:
+                logger.debug(e)
+                anomaly = None
+            yield anomaly
+
     def extra_context(self, context):
         env = dict()
         history_data_point = self.history_point_fetcher(context.data_point)
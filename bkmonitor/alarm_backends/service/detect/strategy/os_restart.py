@@ -48,6 +48,7 @@ class OsRestart(SimpleRingRatio):
     expr_op = "and"
     desc_tpl = _("当前服务器在{{data_point.value}}秒前发生系统重启事件")
     config_serializer = None
+    batch_detect_enabled = False
 
     def gen_expr(self):
         # 主机运行时长在0到600秒之间
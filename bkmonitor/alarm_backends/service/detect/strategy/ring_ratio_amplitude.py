@@ -24,6 +24,7 @@ from alarm_backends.service.detect.strategy.simple_ring_ratio import SimpleRingR
 class RingRatioAmplitude(SimpleRingRatio):
     config_serializer = RingRatioAmplitudeSerializer
     expr_op = "and"
+    batch_detect_enabled = False
     desc_tpl = _(
         "{% load unit %} - 前一时刻值{{history_data_point.value|auto_unit:unit}}的绝对值 >= "
         "前一时刻值{{history_data_point.value|auto_unit:unit}} * {{ratio}} + {{shock}}{{unit|unit_suffix:algorithm_unit}}"
@@ -15,15 +15,32 @@ specific language governing permissions and limitations under the License.
 
 import ast
 import logging
+import operator
 
 from bk_monitor_base.strategy import THRESHOLD_ALLOWED_METHODS, ThresholdSerializer
+from django.utils.html import conditional_escape
 from django.utils.safestring import mark_safe
 
 from alarm_backends.service.detect.strategy import BasicAlgorithmsCollection, ExprDetectAlgorithms
+from alarm_backends.templatetags.unit import (
+    unit_convert_min,
+    unit_min_converter,
+    unit_suffix,
+)
 from core.errors.alarm_backends.detect import InvalidThresholdConfig
 
 logger = logging.getLogger("detect")
 
+# 阈值表达式比较符对应的比较函数，供批量检测使用
+COMPARE_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
 
 class AlgorithmsAST(ast.NodeTransformer):
     """
@@ -33,9 +50,31 @@ class AlgorithmsAST(ast.NodeTransformer):
     pass
 
 
+class ThresholdExprDetectAlgorithms(ExprDetectAlgorithms):
+    """
+    阈值表达式检测器
+    异常描述只与数据单位及算法单位相关，按单位缓存格式化结果，无需为每个异常点渲染模板
+    """
+
+    def __init__(self, expr, desc_tpl, method_desc, threshold):
+        self.method_desc = method_desc
+        self.threshold = threshold
+        self._messages = {}
+        super().__init__(expr, desc_tpl)
+
+    def _format_message(self, data_point):
+        unit = data_point.unit
+        if unit not in self._messages:
+            # 与模板渲染保持一致：单位后缀为模板变量输出，需要转义
+            suffix = conditional_escape(unit_suffix(unit, self.unit))
+            self._messages[unit] = f" {self.method_desc} {self.threshold}{suffix}"
+        return self._messages[unit]
+
+
 class AndThreshold(BasicAlgorithmsCollection):
     config_serializer = ThresholdSerializer.AndSerializer
     expr_op = "and"
+    batch_detect_enabled = True
 
     desc_tpl = "{{% load unit %}} {method_desc} {threshold}{{{{unit|unit_suffix:algorithm_unit}}}}"
 
@@ -49,14 +88,70 @@ class AndThreshold(BasicAlgorithmsCollection):
             expr_list.append(
                 f"unit_convert_min(value, unit) {comp} unit_convert_min({threshold}, unit, algorithm_unit)"
             )
-            tpl_list.append(self.desc_tpl.format(method_desc=mark_safe(comp.replace("==", "=")), threshold=threshold))
+            tpl_list.append((mark_safe(comp.replace("==", "=")), threshold))
 
         # no more effect
         if not expr_list:
             raise InvalidThresholdConfig(dict(config=self.validated_config))
 
-        for args in zip(expr_list, tpl_list):
-            yield ExprDetectAlgorithms(*args)
+        for expr, (method_desc, threshold) in zip(expr_list, tpl_list):
+            yield ThresholdExprDetectAlgorithms(
+                expr, self.desc_tpl.format(method_desc=method_desc, threshold=threshold), method_desc, threshold
+            )
+
+    def compile_thresholds(self, unit):
+        """
+        预先完成阈值的单位换算
+        :return: [(比较函数, 换算后的阈值, 表达式检测器), ...]，存在无法批量比较的比较符时返回 None
+        """
+        thresholds = []
+        for t_config, detector in zip(self.validated_config, self.detectors):
+            compare = COMPARE_OPERATORS.get(THRESHOLD_ALLOWED_METHODS[t_config["method"]])
+            if compare is None:
+                return None
+            thresholds.append((compare, unit_convert_min(t_config["threshold"], unit, self.unit), detector))
+        return thresholds
+
+    def compile_threshold_groups(self, unit):
+        """
+        生成批量检测的阈值组，组内为且关系，组间为或关系
+        """
+        thresholds = self.compile_thresholds(unit)
+        return None if thresholds is None else [thresholds]
+
+    def batch_detect(self, data_points):
+        """
+        批量阈值检测：同一 item 的数据点单位一致，阈值换算每个单位只做一次，
+        数据点只需换算一次当前值再与各阈值比较
+        """
+        # unit -> (当前值换算函数, 阈值组)
+        plans = {}
+        for data_point in data_points:
+            if "__debug__" in data_point.as_dict():
+                yield self.detect_single(data_point)
+                continue
+
+            anomaly = []
+            try:
+                self.validate_data_point(data_point)
+                unit = data_point.unit
+                if unit not in plans:
+                    plans[unit] = (unit_min_converter(unit), self.compile_threshold_groups(unit))
+                converter, threshold_groups = plans[unit]
+                if threshold_groups is None:
+                    yield self.detect_single(data_point)
+                    continue
+
+                value = converter(data_point.value)
+                for thresholds in threshold_groups:
+                    if not all(compare(value, threshold) for compare, threshold, _ in thresholds):
+                        continue
+                    anomaly = [self.build_anomaly_point(detector, data_point) for _, _, detector in thresholds]
+                    break
+            except Exception as e:
+                logger.debug(e)
+                anomaly = None
+            yield anomaly
 
 
 class Threshold(AndThreshold):
@@ -66,3 +161,7 @@ class Threshold(AndThreshold):
     def gen_expr(self):
         for t_config in self.validated_config:
             yield AndThreshold(t_config, self.unit)
+
+    def compile_threshold_groups(self, unit):
+        threshold_groups = [detector.compile_thresholds(unit) for detector in self.detectors]
+        return None if None in threshold_groups else threshold_groups
@@ -24,7 +24,7 @@ from bkmonitor.action.alert_assign import (
     UpgradeRuleMatch,
 )
 from bkmonitor.documents import AlertDocument
-from bkmonitor.utils.range import load_condition_instance
+from bkmonitor.utils.range import load_compiled_condition_instance
 from constants.action import ActionNoticeType, AssignMode, UserGroupType, NoticeWay
 
 logger = logging.getLogger("fta_action.run")
@@ -75,11 +75,9 @@ class BackendAssignMatchManager(AlertAssignMatchManager):
         if self.assign_mode is None or AssignMode.BY_RULE not in self.assign_mode:
             # 如果没有分派规则或者当前配置不需要分派的情况下，不做分派适配
             return matched_rules
-        for priority_id in AssignCacheManager.get_assign_priority_by_biz_id(self.bk_biz_id):
-            groups = AssignCacheManager.get_assign_groups_by_priority(self.bk_biz_id, priority_id)
-            group_rules = []
-            for group_id in groups:
-                group_rules.extend(AssignCacheManager.get_assign_rules_by_group(self.bk_biz_id, group_id))
+        # 通过规则索引过滤掉等值条件不可能满足的规则，只对候选规则做完整的条件匹配
+        rule_index = AssignCacheManager.get_assign_rule_index(self.bk_biz_id)
+        for group_rules in rule_index.iter_candidate_rules(self.dimensions, self.rule_snaps):
             for rule in group_rules:
                 rule_match_obj = AssignRuleMatch(rule, self.rule_snaps.get(str(rule["id"])), self.alert)
                 if rule_match_obj.is_matched(dimensions=self.dimensions):
@@ -351,7 +349,7 @@ class AlertAssigneeManager:
             or_conditions.append(and_conditions)
 
         # 使用分派的条件匹配器
-        condition_matcher = load_condition_instance(or_conditions, False)
+        condition_matcher = load_compiled_condition_instance(or_conditions, False)
         return condition_matcher.is_match(dimensions)
 
     def get_appointee_notify_info(self, notify_configs=None):
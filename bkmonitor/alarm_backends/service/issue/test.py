@@ -54,7 +54,7 @@ def _update_strategy_cache_issue_config(strategy_id: int) -> bool:
         if cfg
         else None
     )
-    StrategyCacheManager.cache.set(cache_key, json.dumps(strategy_dict), StrategyCacheManager.CACHE_TIMEOUT)
+    StrategyCacheManager.set_strategy_cache(strategy_id, strategy_dict)
     return True
 
 
@@ -10,7 +10,6 @@ specific language governing permissions and limitations under the License.
 """
 
 
-import json
 import logging
 
 import arrow
@@ -23,10 +22,14 @@ from alarm_backends.core.lock.service_lock import service_lock
 from alarm_backends.core.processor.base import BaseAbnormalPushProcessor
 from alarm_backends.service.access.data.token import TokenBucket
 from alarm_backends.service.detect import DataPoint
+from bkmonitor.utils.common_utils import chunks
 from core.prometheus import metrics
 
 logger = logging.getLogger("nodata")
 
+# 拉取无数据检测队列时，单次 lrange 读取的数据量
+NODATA_PULL_CHUNK_SIZE = 5000
+
 
 class CheckProcessor(BaseAbnormalPushProcessor):
     def __init__(self, strategy_id):
@@ -71,82 +74,82 @@ class CheckProcessor(BaseAbnormalPushProcessor):
             )
             return
 
-        records = client.lrange(data_channel, -total_points, -1)
-        metrics.NODATA_PROCESS_PULL_DATA_COUNT.labels(strategy_id=metrics.TOTAL_TAG).inc(len(records))
+        metrics.NODATA_PROCESS_PULL_DATA_COUNT.labels(strategy_id=metrics.TOTAL_TAG).inc(total_points)
+        logger.info(
+            "[nodata] strategy({}) item({}) check_timestamp({}) pull records({})".format(
+                self.strategy_id, item.id, check_timestamp, total_points
+            )
+        )
 
         unexpected_record_count = 0
         last_unexpected_record = None
-        if records:
-            client.ltrim(data_channel, 0, -total_points - 1)
-            logger.info(
-                "[nodata] strategy({}) item({}) check_timestamp({}) pull records({})".format(
-                    self.strategy_id, item.id, check_timestamp, total_points
-                )
-            )
-            future_records = []
-            for record in records:
+        # 未来周期的数据只保留(时间戳, 原始数据)，需要重新放回队列
+        future_records = []
+        # 当前检测点之前无数据时，取未来最早一个周期的数据
+        earliest_future_timestamp = None
+        earliest_future_points = []
+
+        # 数据从队列左侧写入，从右侧按批次读取，每条数据只解码一次
+        for start in range(-total_points, 0, NODATA_PULL_CHUNK_SIZE):
+            end = min(start + NODATA_PULL_CHUNK_SIZE - 1, -1)
+            for record in client.lrange(data_channel, start, end):
                 try:
-                    data_point = DataPoint(json.loads(record), item)
-                    if data_point.timestamp <= check_timestamp:
-                        self.inputs[item.id].append(data_point)
-                    else:
-                        future_records.append(record)
-                except ValueError:
+                    data_point = DataPoint(key.NO_DATA_LIST_KEY.loads(record), item)
+                    timestamp = data_point.timestamp
+                except (ValueError, AttributeError):
                     unexpected_record_count += 1
                     last_unexpected_record = record
+                    continue
 
-            # 如果当前监测点之前无数据，但是未来有数据，那么取未来一个周期的数据
-            if not self.inputs[item.id] and future_records:
-                record = future_records[0]
-                data_point = DataPoint(json.loads(record), item)
-                earliest_future_timestamp = data_point.timestamp
-                earliest_future_points = [data_point]
-                earliest_future_records_idx = [0]
-                for index, record in enumerate(future_records[1:]):
-                    data_point = DataPoint(json.loads(record), item)
-                    # 遇到更早时间数据，重置 earliest_future_points 和 earliest_future_records_idx
-                    if data_point.timestamp < earliest_future_timestamp:
-                        earliest_future_timestamp = data_point.timestamp
-                        earliest_future_points = [data_point]
-                        earliest_future_records_idx = [index + 1]
-                    # 遇到和当前最早时间一致的数据，加入 earliest_future_points 和 earliest_future_records_idx
-                    elif data_point.timestamp == earliest_future_timestamp:
-                        earliest_future_points.append(data_point)
-                        earliest_future_records_idx.append(index + 1)
-
-                self.inputs[item.id] = earliest_future_points
-                future_records = [
-                    record for index, record in enumerate(future_records) if index not in earliest_future_records_idx
-                ]
-                logger.info(
-                    "[nodata] strategy({}) item({}) check_timestamp({}) get future_timestamp({}) {} records,"
-                    "其中之一: {}".format(
-                        self.strategy_id,
-                        item.id,
-                        check_timestamp,
-                        earliest_future_timestamp,
-                        len(earliest_future_records_idx),
-                        data_point._raw_input,
-                    )
-                )
+                if timestamp <= check_timestamp:
+                    self.inputs[item.id].append(data_point)
+                    earliest_future_points = []
+                    continue
 
-            # 当前检测周期之后的数据或者未来周期非最早时间的数据，重新放入队列等待后续检测
-            if future_records:
-                client.rpush(data_channel, *future_records)
-            if unexpected_record_count > 0:
-                logger.error(
-                    "[nodata] strategy({}) item({}) check_timestamp({}) 发现非期望格式的待检测数据{}条,"
-                    "其中之一: {}".format(
-                        self.strategy_id, item.id, check_timestamp, unexpected_record_count, last_unexpected_record
-                    )
+                future_records.append((timestamp, record))
+                if self.inputs[item.id]:
+                    continue
+                # 遇到更早时间数据，重置 earliest_future_points
+                if earliest_future_timestamp is None or timestamp < earliest_future_timestamp:
+                    earliest_future_timestamp = timestamp
+                    earliest_future_points = [data_point]
+                # 遇到和当前最早时间一致的数据，加入 earliest_future_points
+                elif timestamp == earliest_future_timestamp:
+                    earliest_future_points.append(data_point)
+        client.ltrim(data_channel, 0, -total_points - 1)
+
+        # 如果当前监测点之前无数据，但是未来有数据，那么取未来一个周期的数据
+        if not self.inputs[item.id] and future_records:
+            self.inputs[item.id] = earliest_future_points
+            future_records = [record for record in future_records if record[0] != earliest_future_timestamp]
+            logger.info(
+                "[nodata] strategy({}) item({}) check_timestamp({}) get future_timestamp({}) {} records,"
+                "其中之一: {}".format(
+                    self.strategy_id,
+                    item.id,
+                    check_timestamp,
+                    earliest_future_timestamp,
+                    len(earliest_future_points),
+                    earliest_future_points[0]._raw_input,
                 )
+            )
 
-            logger.info(
-                "[nodata] strategy({}) item({}) check_timestamp({}) 拉取数据({})条".format(
-                    self.strategy_id, item.id, check_timestamp, len(self.inputs[item.id])
+        # 当前检测周期之后的数据或者未来周期非最早时间的数据，重新放入队列等待后续检测
+        for sub_records in chunks(future_records, NODATA_PULL_CHUNK_SIZE):
+            client.rpush(data_channel, *[record for _, record in sub_records])
+        if unexpected_record_count > 0:
+            logger.error(
+                "[nodata] strategy({}) item({}) check_timestamp({}) 发现非期望格式的待检测数据{}条,其中之一: {}".format(
+                    self.strategy_id, item.id, check_timestamp, unexpected_record_count, last_unexpected_record
                 )
             )
 
+        logger.info(
+            "[nodata] strategy({}) item({}) check_timestamp({}) 拉取数据({})条".format(
+                self.strategy_id, item.id, check_timestamp, len(self.inputs[item.id])
+            )
+        )
+
     def handle_data(self, item, check_timestamp):
         # check no data
         data_points = self.inputs[item.id]
@@ -132,28 +132,26 @@ class BaseScenario:
     def get_history_dimensions(self):
         no_data_dimensions = set(self.get_no_data_dimensions())
         no_data_dimensions.add(NO_DATA_TAG_DIMENSION)
-        history_dimensions_keys = CheckResult.get_dimensions_keys(
+        dimensions = CheckResult.get_dimensions(
             service_type="nodata", strategy_id=self.strategy.id, item_id=self.item.id
         )
         history_dimensions = []
-        for dms_key in history_dimensions_keys:
-            dimension = CheckResult.get_dimension_by_key(
-                service_type="nodata",
-                strategy_id=self.strategy.id,
-                item_id=self.item.id,
-                dimensions_md5=dms_key,
-            )
-            if dimension:
-                if set(dimension.keys()) == no_data_dimensions:
-                    history_dimensions.append(dimension)
-                else:
-                    # 清理旧维度数据
-                    CheckResult.remove_dimension_by_key(
-                        service_type="nodata",
-                        strategy_id=self.strategy.id,
-                        item_id=self.item.id,
-                        dimensions_md5=dms_key,
-                    )
+        expired_dimensions_md5 = []
+        for dms_key, dimension in dimensions.items():
+            if not dimension:
+                continue
+            if set(dimension.keys()) == no_data_dimensions:
+                history_dimensions.append(dimension)
+            else:
+                expired_dimensions_md5.append(dms_key)
+
+        # 清理旧维度数据
+        CheckResult.remove_dimensions_by_keys(
+            service_type="nodata",
+            strategy_id=self.strategy.id,
+            item_id=self.item.id,
+            dimensions_md5_list=expired_dimensions_md5,
+        )
         return history_dimensions
 
 
@@ -11,6 +11,7 @@ specific language governing permissions and limitations under the License.
 
 
 import logging
+from collections import defaultdict
 
 from django.utils.translation import gettext as _
 
@@ -54,6 +55,8 @@ class AnomalyChecker(object):
         # shortcut
         self.dimensions_md5 = self.record_parser.dimensions_md5
         self.source_time = self.record_parser.source_time
+        # 批量预取的检测窗口数据 {level: [(label, score), ...]}
+        self.prefetched_check_results = {}
 
     @staticmethod
     def is_no_data_point(point):
@@ -165,14 +168,13 @@ class AnomalyChecker(object):
                 anomaly_level = level
         return anomaly_level, anomaly_timestamps
 
-    def _check_anomaly_by_level(self, level):
+    def get_trigger_config(self, level):
         """
-        检测某个级别的异常点是否满足触发条件
+        获取某个级别的触发配置，该级别没有配置时返回 None
         :param str level: 告警级别
-        :return: 二元组：是否被触发，异常次数
         """
         try:
-            trigger_config = self.trigger_configs[level]
+            return self.trigger_configs[level]
         except KeyError:
             trigger_configs = self.trigger_configs.values()
             if not trigger_configs:
@@ -182,11 +184,16 @@ class AnomalyChecker(object):
                         self.strategy_id, self.item_id, level
                     )
                 )
-                return False, []
+                return None
 
             # 默认兜底，trigger 配置当前所有告警级别默认一致
-            trigger_config = list(trigger_configs)[0]
+            return list(trigger_configs)[0]
 
+    def get_check_window(self, level, trigger_config):
+        """
+        获取某个级别的检测窗口
+        :return: 三元组：检测结果缓存key，窗口起始时间，窗口结束时间
+        """
         check_cache_key = CHECK_RESULT_CACHE_KEY.get_key(
             strategy_id=self.strategy_id,
             item_id=self.item_id,
@@ -195,9 +202,61 @@ class AnomalyChecker(object):
         )
         # 在对应的打点队列中取出打点信息。时间范围为source_time前后的一个窗口偏移量
         check_window_offset = trigger_config["check_window_size"] * self.check_window_unit - 1
-        check_results = CHECK_RESULT_CACHE_KEY.client.zrangebyscore(
-            name=check_cache_key, min=self.source_time - check_window_offset, max=self.source_time, withscores=True
-        )
+        return check_cache_key, self.source_time - check_window_offset, self.source_time
+
+    @classmethod
+    def prefetch_check_results(cls, checkers):
+        """
+        批量预取异常点各级别的检测窗口
+        按检测结果缓存key(即 dimensions_md5 + level)分组，同组的检测窗口合并后在一次 pipeline 中读取，
+        再在内存中按各异常点的检测窗口切分
+        :param list[AnomalyChecker] checkers: 同一策略项的异常点检测器
+        """
+        windows = defaultdict(list)
+        for checker in checkers:
+            if not checker.trigger_configs:
+                # 未配置触发条件，检测时直接跳过，无需预取
+                continue
+            for level in checker.point["anomaly"]:
+                trigger_config = checker.get_trigger_config(level)
+                check_cache_key, min_score, max_score = checker.get_check_window(level, trigger_config)
+                windows[check_cache_key].append((checker, level, min_score, max_score))
+
+        if not windows:
+            return
+
+        pipeline = CHECK_RESULT_CACHE_KEY.client.pipeline(transaction=False)
+        for check_cache_key, group in windows.items():
+            pipeline.zrangebyscore(
+                name=check_cache_key,
+                min=min(window[2] for window in group),
+                max=max(window[3] for window in group),
+                withscores=True,
+            )
+
+        for group, check_results in zip(windows.values(), pipeline.execute()):
+            for checker, level, min_score, max_score in group:
+                checker.prefetched_check_results[level] = [
+                    (label, score) for label, score in check_results if min_score <= score <= max_score
+                ]
+
+    def _check_anomaly_by_level(self, level):
+        """
+        检测某个级别的异常点是否满足触发条件
+        :param str level: 告警级别
+        :return: 二元组：是否被触发，异常次数
+        """
+        trigger_config = self.get_trigger_config(level)
+        if trigger_config is None:
+            return False, []
+
+        if level in self.prefetched_check_results:
+            check_results = self.prefetched_check_results[level]
+        else:
+            check_cache_key, min_score, max_score = self.get_check_window(level, trigger_config)
+            check_results = CHECK_RESULT_CACHE_KEY.client.zrangebyscore(
+                name=check_cache_key, min=min_score, max=max_score, withscores=True
+            )
         # 统计包含异常标记的key的数量，并与trigger_count进行比较
         anomaly_timestamps = []
         for label, score in check_results:
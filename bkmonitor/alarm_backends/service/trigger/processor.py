@@ -21,6 +21,7 @@ from alarm_backends.core.cache.key import ANOMALY_LIST_KEY, ANOMALY_SIGNAL_KEY,
 from alarm_backends.core.control.strategy import Strategy
 from alarm_backends.core.storage.redis_cluster import get_node_by_strategy_id, routing_snapshot
 from alarm_backends.service.trigger.checker import AnomalyChecker
+from bkmonitor.utils.common_utils import chunks
 from bkmonitor.utils.tenant import bk_biz_id_to_bk_tenant_id
 from core.errors.alarm_backends import StrategyNotFound
 from core.prometheus import metrics
@@ -35,6 +36,8 @@ logger = logging.getLogger("trigger")
 class TriggerProcessor:
     # 单次处理量(默认为全量处理)
     MAX_PROCESS_COUNT = 0
+    # 批量预取检测窗口时，单批处理的异常点数量
+    CHECK_BATCH_SIZE = 1000
 
     def __init__(self, strategy_id, item_id):
         self.strategy_id = int(strategy_id)
@@ -454,20 +457,49 @@ class TriggerProcessor:
         if not in_alarm_time:
             logger.info("[trigger] strategy(%s) not in alarm time: %s, skipped", self.strategy_id, message)
         else:
-            for point in self.anomaly_points:
-                try:
-                    self.process_point(point)
-                except Exception as e:
-                    error_message = f"[process error] strategy({self.strategy_id}), item({self.item_id}) reason: {e} \norigin data: {point}"
-                    logger.exception(error_message)
+            for points in chunks(self.anomaly_points, self.CHECK_BATCH_SIZE):
+                self.process_points(points)
 
         self.push()
         return pulled_count
 
-    def process_point(self, point):
-        point = json.loads(point)
+    def process_points(self, points):
+        """
+        批量处理异常点：先在一次 pipeline 中预取所有异常点的检测窗口，再逐个在内存中判断是否触发
+        """
+        checkers = []
+        for point in points:
+            try:
+                checkers.append(self.build_checker(point))
+            except Exception as e:
+                error_message = f"[process error] strategy({self.strategy_id}), item({self.item_id}) reason: {e} \norigin data: {point}"
+                logger.exception(error_message)
+
+        try:
+            AnomalyChecker.prefetch_check_results(checkers)
+        except Exception as e:
+            # 预取失败时，检测器回退到逐个查询检测窗口
+            logger.exception(
+                f"[prefetch check results error] strategy({self.strategy_id}), item({self.item_id}) reason: {e}"
+            )
+
+        for checker in checkers:
+            try:
+                self.process_checker(checker)
+            except Exception as e:
+                error_message = f"[process error] strategy({self.strategy_id}), item({self.item_id}) reason: {e} \norigin data: {checker.point}"
+                logger.exception(error_message)
+
+    def build_checker(self, point):
+        point = ANOMALY_LIST_KEY.loads(point)
         strategy = self.get_strategy_snapshot(point["strategy_snapshot_key"])
-        checker = AnomalyChecker(point, strategy, self.item_id)
+        return AnomalyChecker(point, strategy, self.item_id)
+
+    def process_point(self, point):
+        self.process_checker(self.build_checker(point))
+
+    def process_checker(self, checker):
+        point = checker.point
         anomaly_records, event_record = checker.check()
 
         if self.is_alarmd_reference_selected() and not checker.is_no_data_point(point):
@@ -31,6 +31,19 @@ def unit_convert_min(value, unit, suffix=None):
     return unit.convert_to_max(value, suffix, decimal=settings.POINT_PRECISION)[0]
 
 
+def unit_min_converter(unit, suffix=None):
+    """
+    生成与 unit_convert_min 等价的换算函数，单位只在生成时解析一次，适用于同一单位的批量换算
+    """
+    unit = load_unit(unit)
+    decimal = settings.POINT_PRECISION
+
+    def _convert(value):
+        return unit.convert_to_max(value, suffix, decimal=decimal)[0]
+
+    return _convert
+
+
 @register.filter(name="unit_suffix")
 def unit_suffix(unit, suffix):
     unit = load_unit(unit)
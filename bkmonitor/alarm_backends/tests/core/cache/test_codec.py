@@ -0,0 +1,118 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import json
+
+import mock
+import pytest
+from django.conf import settings
+
+from alarm_backends.core.cache import codec as queue_codec
+from alarm_backends.core.cache import key
+
+RECORD_COUNT = 100
+
+
+def build_data_record(index):
+    # access 推送到检测队列的数据格式
+    return {
+        "record_id": f"{index:032x}.1569246480",
+        "value": 1.38 + index,
+        "values": {"timestamp": 1569246480, "load5": 1.38 + index},
+        "dimensions": {
+            "bk_target_ip": f"127.0.{index // 256}.{index % 256}",
+            "bk_target_cloud_id": "0",
+            "bk_topo_node": ["biz|2", "set|5", "module|9"],
+            "device_name": "/dev/vda1",
+            "name": "主机磁盘",
+        },
+        "time": 1569246480,
+    }
+
+
+def build_anomaly_record(index):
+    # detect 推送到异常队列的数据格式
+    return {
+        "data": build_data_record(index),
+        "anomaly": {
+            "2": {
+                "anomaly_message": "avg(5分钟平均负载) >= 1.0, 当前值1.38",
+                "anomaly_id": f"{index:032x}.1569246480.31.61.2",
+                "anomaly_time": "2019-09-23 13:48:00",
+            }
+        },
+        "strategy_snapshot_key": "bk_bkmonitor.ee.cache.strategy.snapshot.31.1569246479",
+    }
+
+
+class TestQueueCodec:
+    @pytest.mark.parametrize("codec_name", ["json", "ujson", "orjson"])
+    def test_round_trip(self, codec_name):
+        record = build_anomaly_record(1)
+        payload = queue_codec.dumps(record, codec_name)
+        assert queue_codec.loads(payload) == record
+
+        codec = queue_codec.get_write_codec(codec_name)
+        if codec is queue_codec.LEGACY_CODEC:
+            # legacy 编码保持原有格式，不带版本头
+            assert payload == json.dumps(record)
+        else:
+            assert payload.startswith(codec.header)
+
+    def test_legacy_payload(self):
+        record = build_data_record(1)
+        assert queue_codec.loads(json.dumps(record)) == record
+        assert queue_codec.loads(json.dumps(record).encode("utf-8")) == record
+
+    def test_unknown_header(self):
+        with pytest.raises(ValueError):
+            queue_codec.loads("\x1ex9:{}")
+        with pytest.raises(ValueError):
+            queue_codec.loads("\x1eu1{}")
+
+    def test_missing_dependency(self):
+        record = build_data_record(1)
+        payload = queue_codec.CODECS_BY_NAME["orjson"].header + json.dumps(record)
+        # 写入端编码依赖缺失时回退到 legacy json
+        with mock.patch.object(queue_codec, "orjson", None):
+            assert queue_codec.get_write_codec("orjson") is queue_codec.LEGACY_CODEC
+            # 读取端依赖缺失时，使用可用的 json 解码器兜底
+            assert queue_codec.loads(payload) == record
+
+    def test_key_codec(self):
+        record = build_data_record(1)
+        with mock.patch.object(settings, "ALARM_QUEUE_CODEC", "ujson", create=True):
+            payload = key.DATA_LIST_KEY.dumps(record)
+            assert key.DATA_LIST_KEY.get_codec() is queue_codec.get_write_codec("ujson")
+            # 未开启编解码的 key 保持 legacy 编码
+            assert key.DATA_SIGNAL_KEY.get_codec() is queue_codec.LEGACY_CODEC
+
+        with mock.patch.object(settings, "ALARM_QUEUE_CODEC", "json", create=True):
+            # 写入端回滚后，队列中已写入的新格式数据依然可以消费
+            assert key.DATA_LIST_KEY.loads(payload) == record
+            assert key.DATA_LIST_KEY.dumps(record) == json.dumps(record)
+
+    def test_codec_round_trip_and_size(self):
+        records = [build_anomaly_record(i) for i in range(RECORD_COUNT)]
+        legacy_size = None
+        for codec_name in ["json", "ujson", "orjson"]:
+            codec = queue_codec.get_write_codec(codec_name)
+            if codec.name != codec_name:
+                continue
+
+            payloads = [codec.dumps(record) for record in records]
+            decoded = [queue_codec.loads(payload) for payload in payloads]
+            payload_size = sum(len(payload.encode("utf-8")) for payload in payloads)
+            assert decoded == records
+            if legacy_size is None:
+                legacy_size = payload_size
+            else:
+                # 紧凑编码不转义中文，数据体积应小于 legacy 编码
+                assert payload_size < legacy_size
@@ -0,0 +1,195 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import json
+
+import mock
+import pytest
+
+from alarm_backends.core.cache.strategy import StrategyCacheManager
+
+STRATEGY_ID = 990001
+QUERY_MD5 = "strategy-cache-test-group"
+
+
+def build_strategy(strategy_id=STRATEGY_ID, name="cpu usage", query_md5=""):
+    return {
+        "id": strategy_id,
+        "bk_biz_id": 2,
+        "name": name,
+        "items": [
+            {
+                "id": strategy_id,
+                "name": "usage",
+                "query_md5": query_md5,
+                "query_configs": [
+                    {
+                        "agg_method": "AVG",
+                        "agg_dimension": ["bk_target_ip", "bk_target_cloud_id"],
+                        "agg_condition": [{"key": "bk_target_ip", "method": "eq", "value": [f"127.0.0.{i}"]}]
+                        if i
+                        else [],
+                        "agg_interval": 60,
+                        "metric_field": "usage",
+                        "result_table_id": "system.cpu_summary",
+                        "data_source_label": "bk_monitor",
+                        "data_type_label": "time_series",
+                    }
+                    for i in range(20)
+                ],
+                "algorithms": [{"config": [{"threshold": 90, "method": "gte"}], "level": 1, "type": "Threshold"}],
+            }
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_strategy_cache():
+    StrategyCacheManager.clear_local_cache()
+    yield
+    StrategyCacheManager.delete_strategy_cache([STRATEGY_ID, STRATEGY_ID + 1])
+    StrategyCacheManager.cache.hdel(StrategyCacheManager.STRATEGY_GROUP_CACHE_KEY, QUERY_MD5)
+    StrategyCacheManager.clear_local_cache()
+
+
+class TestStrategyLocalCache:
+    def test_version_hit(self):
+        strategy = build_strategy()
+        StrategyCacheManager.refresh_strategy([strategy], old_groups=[])
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategy
+
+        # 版本未变化时不再拉取策略详情
+        with mock.patch.object(StrategyCacheManager.cache, "get") as mock_get:
+            assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategy
+            mock_get.assert_not_called()
+
+    def test_version_changed(self):
+        StrategyCacheManager.refresh_strategy([build_strategy()], old_groups=[])
+        StrategyCacheManager.get_strategy_by_id(STRATEGY_ID)
+
+        strategy = build_strategy(name="cpu usage changed")
+        StrategyCacheManager.refresh_strategy([strategy], old_groups=[])
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategy
+
+        # 策略删除后，版本一并删除，不再命中进程内缓存
+        StrategyCacheManager.delete_strategy_cache([STRATEGY_ID])
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) is None
+
+    def test_legacy_cache_without_version(self):
+        strategy = build_strategy()
+        StrategyCacheManager.cache.set(
+            StrategyCacheManager.CACHE_KEY_TEMPLATE.format(strategy_id=STRATEGY_ID), json.dumps(strategy)
+        )
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategy
+        assert str(STRATEGY_ID) not in StrategyCacheManager._local_cache
+
+    def test_returned_config_isolated(self):
+        strategy = build_strategy()
+        StrategyCacheManager.refresh_strategy([strategy], old_groups=[])
+
+        # 调用方会修改策略配置，修改不能影响进程内缓存
+        config = StrategyCacheManager.get_strategy_by_id(STRATEGY_ID)
+        config["items"][0]["query_configs"][1]["agg_condition"][0].pop("value")
+        config["name"] = "modified"
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategy
+
+    def test_local_cache_size(self):
+        with mock.patch.object(StrategyCacheManager, "LOCAL_CACHE_SIZE", 2):
+            for strategy_id in range(3):
+                StrategyCacheManager.set_local_strategy(strategy_id, "v", {"id": strategy_id})
+            assert list(StrategyCacheManager._local_cache) == ["1", "2"]
+
+    def test_local_cache_hit_miss_and_eviction(self):
+        strategies = [build_strategy(), build_strategy(STRATEGY_ID + 1)]
+        StrategyCacheManager.refresh_strategy(strategies, old_groups=[])
+
+        with mock.patch.object(StrategyCacheManager.cache, "get", wraps=StrategyCacheManager.cache.get) as mock_get:
+            # 首次读取未命中，拉取策略详情
+            assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategies[0]
+            assert mock_get.call_count == 1
+
+            # 版本未变化，命中进程内缓存
+            assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategies[0]
+            assert mock_get.call_count == 1
+
+            # 版本变化，未命中，重新拉取
+            changed_strategy = build_strategy(name="cpu usage changed")
+            StrategyCacheManager.refresh_strategy([changed_strategy, strategies[1]], old_groups=[])
+            assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == changed_strategy
+            assert mock_get.call_count == 2
+
+            # 超过缓存数量上限时淘汰最久未使用的策略
+            with mock.patch.object(StrategyCacheManager, "LOCAL_CACHE_SIZE", 1):
+                assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID + 1) == strategies[1]
+                assert list(StrategyCacheManager._local_cache) == [str(STRATEGY_ID + 1)]
+                assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == changed_strategy
+            assert mock_get.call_count == 4
+
+    def test_issue_config_change_updates_version(self):
+        from bkmonitor.models import issue
+
+        StrategyCacheManager.refresh_strategy([build_strategy()], old_groups=[])
+        assert "issue_config" not in StrategyCacheManager.get_strategy_by_id(STRATEGY_ID)
+
+        # issue_config 局部写回策略缓存后，进程内缓存需要感知到变更
+        cfg = mock.MagicMock(is_enabled=True, aggregate_dimensions=["bk_target_ip"], conditions=[], alert_levels=[1])
+        with (
+            mock.patch.object(issue, "_has_cache_role", return_value=True),
+            mock.patch.object(issue.StrategyIssueConfig, "objects") as mock_objects,
+        ):
+            mock_objects.filter.return_value.first.return_value = cfg
+            issue.refresh_strategy_cache_on_issue_config_change(
+                issue.StrategyIssueConfig, mock.MagicMock(strategy_id=STRATEGY_ID)
+            )
+
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID)["issue_config"] == {
+            "is_enabled": True,
+            "aggregate_dimensions": ["bk_target_ip"],
+            "conditions": [],
+            "alert_levels": [1],
+        }
+
+
+class TestStrategyIncrementalRefresh:
+    def test_set_if_changed(self):
+        key = StrategyCacheManager.CACHE_KEY_TEMPLATE.format(strategy_id=STRATEGY_ID)
+        assert StrategyCacheManager.set_if_changed(key, "[1]")
+        assert not StrategyCacheManager.set_if_changed(key, "[1]")
+        assert StrategyCacheManager.cache.ttl(key) > 0
+        assert StrategyCacheManager.set_if_changed(key, "[1, 2]")
+
+    def test_refresh_changed_strategy(self):
+        strategies = [
+            build_strategy(query_md5=QUERY_MD5),
+            build_strategy(STRATEGY_ID + 1, query_md5=QUERY_MD5),
+        ]
+        touched = StrategyCacheManager.refresh_strategy(strategies, old_groups=[], incremental=True)
+        assert touched == {"strategy": 2, "group": 1}
+
+        # 内容未变化时不重写策略及分组
+        touched = StrategyCacheManager.refresh_strategy(strategies, old_groups=[], incremental=True)
+        assert touched == {"strategy": 0, "group": 0}
+
+        strategies[1]["name"] = "changed"
+        touched = StrategyCacheManager.refresh_strategy(strategies, old_groups=[], incremental=True)
+        assert touched == {"strategy": 1, "group": 0}
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID + 1) == strategies[1]
+
+        # 策略详情失效但版本仍存在时，续期失败需要补写
+        StrategyCacheManager.cache.delete(StrategyCacheManager.CACHE_KEY_TEMPLATE.format(strategy_id=STRATEGY_ID))
+        touched = StrategyCacheManager.refresh_strategy(strategies, old_groups=[], incremental=True)
+        assert touched == {"strategy": 1, "group": 0}
+        assert StrategyCacheManager.get_strategy_by_id(STRATEGY_ID) == strategies[0]
+
+        # 分组内容变化
+        touched = StrategyCacheManager.refresh_strategy(strategies[:1], old_groups=[], incremental=True)
+        assert touched == {"strategy": 0, "group": 1}
+        group = json.loads(StrategyCacheManager.cache.hget(StrategyCacheManager.STRATEGY_GROUP_CACHE_KEY, QUERY_MD5))
+        assert list(group) == [str(STRATEGY_ID), "bk_biz_id", "interval_list", "strategy_source"]
@@ -103,3 +103,44 @@ class TestDetectResult(TestCase):
             CheckResult.get_dimensions_keys(service_type="detect", strategy_id=1, item_id=1),
             [check_result1.dimensions_md5],
         )
+
+    def test_get_dimensions(self):
+        dimensions = {}
+        for index in range(5):
+            dimension = {"bk_target_ip": f"127.0.0.{index}", "bk_target_cloud_id": 0}
+            check_result = CheckResult(
+                strategy_id=2, item_id=2, dimensions_md5=count_md5(dimension), level=2, service_type="nodata"
+            )
+            check_result.update_key_to_dimension(dimension)
+            dimensions[check_result.dimensions_md5] = dimension
+        CheckResult.pipeline().execute()
+
+        self.assertEqual(
+            CheckResult.get_dimensions(service_type="nodata", strategy_id=2, item_id=2, batch_size=2), dimensions
+        )
+
+        removed_md5_list = list(dimensions)[:3]
+        CheckResult.remove_dimensions_by_keys(
+            service_type="nodata", strategy_id=2, item_id=2, dimensions_md5_list=removed_md5_list, batch_size=2
+        )
+        for dimensions_md5 in removed_md5_list:
+            dimensions.pop(dimensions_md5)
+        self.assertEqual(CheckResult.get_dimensions(service_type="nodata", strategy_id=2, item_id=2), dimensions)
+
+    def test_get_last_checkpoints(self):
+        dimensions_md5_list = [count_md5({"bk_target_ip": f"127.0.0.{index}"}) for index in range(5)]
+        for check_point, dimensions_md5 in enumerate(dimensions_md5_list[:3]):
+            CheckResult.update_last_checkpoint_by_d_md5(2, 2, dimensions_md5, check_point + 100, 2)
+
+        last_checkpoints = CheckResult.get_last_checkpoints(2, 2, dimensions_md5_list, 2, batch_size=2)
+        self.assertEqual(
+            last_checkpoints,
+            {
+                dimensions_md5_list[0]: "100",
+                dimensions_md5_list[1]: "101",
+                dimensions_md5_list[2]: "102",
+                dimensions_md5_list[3]: None,
+                dimensions_md5_list[4]: None,
+            },
+        )
+        self.assertEqual(CheckResult.get_last_checkpoints(2, 2, [], 2), {})
@@ -0,0 +1,57 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from alarm_backends.core.cache.key import ALERT_UPDATE_LOCK
+from alarm_backends.core.lock import MultiRedisLock
+from alarm_backends.core.lock.service_lock import multi_service_lock
+from alarm_backends.core.storage.redis import Cache
+
+LOCK_KEYS = [ALERT_UPDATE_LOCK.get_key(dedupe_md5=f"multi_lock_test_{index}") for index in range(4)]
+
+
+class TestMultiRedisLock:
+    def setup_method(self):
+        self.client = Cache("service-lock")
+        self.client.delete(*LOCK_KEYS)
+
+    def teardown_method(self):
+        self.client.delete(*LOCK_KEYS)
+
+    def test_acquire_subset(self):
+        self.client.set(LOCK_KEYS[0], "other", ex=60)
+
+        lock = MultiRedisLock(LOCK_KEYS + LOCK_KEYS[1:2], 60)
+        assert lock.acquire() == set(LOCK_KEYS[1:])
+        assert not lock.is_locked(LOCK_KEYS[0])
+
+        # 已持有的 key 不重复加锁，竞争中的 key 释放后可以重试加锁
+        assert lock.acquire(LOCK_KEYS) == set()
+        self.client.delete(LOCK_KEYS[0])
+        assert lock.acquire(LOCK_KEYS) == {LOCK_KEYS[0]}
+        assert all(lock.is_locked(key) for key in LOCK_KEYS)
+
+    def test_release_subset(self):
+        lock = MultiRedisLock(LOCK_KEYS, 60)
+        lock.acquire()
+
+        assert lock.release(LOCK_KEYS[:2]) == LOCK_KEYS[:2]
+        assert self.client.mget(LOCK_KEYS) == [None, None, lock._token, lock._token]
+        assert not lock.is_locked(LOCK_KEYS[0])
+
+        # 锁已被其他实例持有时不能释放
+        self.client.set(LOCK_KEYS[2], "other", ex=60)
+        assert lock.release() == [LOCK_KEYS[3]]
+        assert self.client.get(LOCK_KEYS[2]) == "other"
+
+    def test_multi_service_lock(self):
+        self.client.set(LOCK_KEYS[0], "other", ex=60)
+        with multi_service_lock(ALERT_UPDATE_LOCK, LOCK_KEYS) as lock:
+            assert [lock.is_locked(key) for key in LOCK_KEYS] == [False, True, True, True]
+        assert self.client.mget(LOCK_KEYS) == ["other", None, None, None]
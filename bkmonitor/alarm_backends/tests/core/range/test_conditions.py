@@ -10,6 +10,11 @@ specific language governing permissions and limitations under the License.
 """
 
 
+from bkmonitor.utils.range import (
+    compiled_condition_cache,
+    load_compiled_condition_instance,
+    load_condition_instance,
+)
 from bkmonitor.utils.range.conditions import (
     AndCondition,
     EqualCondition,
@@ -23,9 +28,13 @@ from bkmonitor.utils.range.conditions import (
     NotRegularCondition,
     OrCondition,
     RegularCondition,
+    compile_regex,
 )
 from bkmonitor.utils.range.fields import DimensionField
 
+RULE_COUNT = 30
+ALERT_COUNT = 20
+
 
 class TestCondition(object):
     def test_equal(self):
@@ -211,3 +220,78 @@ class TestCondition(object):
         and_condition.add(condition3)
         assert not and_condition.is_match({"key": "123"})
         assert and_condition.is_match({"key": "1234235678"})
+
+
+def build_rule_conditions(index):
+    return [
+        [
+            {"field": "bk_biz_id", "method": "eq", "value": [str(index % 10)]},
+            {"field": "alert.name", "method": "reg", "value": [rf"^cpu_{index}\d*$", "mem.*"]},
+            {"field": "ip", "method": "eq", "value": [f"127.0.{index % 256}.{i}" for i in range(50)]},
+        ],
+        [
+            {"field": "alert.name", "method": "include", "value": [f"disk_{index}"]},
+            {"field": "severity", "method": "lte", "value": [2]},
+        ],
+    ]
+
+
+def build_alert_dimensions(index):
+    return {
+        "bk_biz_id": str(index % 10),
+        "alert.name": f"cpu_{index}1",
+        "ip": f"127.0.{index % 256}.{index % 50}",
+        "severity": 1,
+    }
+
+
+class TestCompiledCondition(object):
+    def test_regex_cache(self):
+        assert compile_regex(r"\d+") is compile_regex(r"\d+")
+        assert compile_regex("(") is None
+
+        # 非法表达式之后的条件不再参与匹配
+        condition = RegularCondition(DimensionField("key", ["(", "value"]))
+        assert not condition.is_match({"key": "value"})
+        condition = RegularCondition(DimensionField("key", ["value", "("]))
+        assert condition.is_match({"key": "value"})
+
+    def test_optimize(self):
+        condition = load_condition_instance(
+            [
+                [
+                    {"field": "key", "method": "reg", "value": "v.*"},
+                    {"field": "key", "method": "include", "value": "v"},
+                    {"field": "key", "method": "eq", "value": "value"},
+                ]
+            ]
+        )
+        and_condition = condition.conditions[0]
+        assert [type(cond) for cond in and_condition.conditions] == [
+            EqualCondition,
+            IncludeCondition,
+            RegularCondition,
+        ]
+        assert condition.is_match({"key": "value"})
+        assert not condition.is_match({"key": "v"})
+
+    def test_compiled_cache(self):
+        compiled_condition_cache.clear()
+        conditions = build_rule_conditions(1)
+        condition = load_compiled_condition_instance(conditions, False)
+        assert load_compiled_condition_instance(build_rule_conditions(1), False) is condition
+        assert load_compiled_condition_instance(conditions, True) is not condition
+
+        # 配置被原地修改后重新编译，且不影响已缓存的条件对象
+        conditions[0][0]["value"] = ["2"]
+        assert load_compiled_condition_instance(conditions, False) is not condition
+        assert condition.is_match(build_alert_dimensions(1))
+
+    def test_compiled_match_equals_rebuild(self):
+        compiled_condition_cache.clear()
+        rules = [build_rule_conditions(i) for i in range(RULE_COUNT)]
+        alerts = [build_alert_dimensions(i) for i in range(ALERT_COUNT)]
+
+        expected = [[load_condition_instance(rule, False).is_match(alert) for rule in rules] for alert in alerts]
+        result = [[load_compiled_condition_instance(rule, False).is_match(alert) for rule in rules] for alert in alerts]
+        assert result == expected
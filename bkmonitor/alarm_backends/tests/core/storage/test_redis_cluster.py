@@ -192,6 +192,59 @@ class TestPipelineProxyCascade:
         assert pipe.command_stack == []
 
 
+class _FakeMgetPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.buffer = []
+
+    def mget(self, keys):
+        self.buffer.append(list(keys))
+        return self
+
+    def execute(self):
+        self.client.mget_calls.extend(self.buffer)
+        return [[f"{self.client.node.id}:{k}" for k in keys] for keys in self.buffer]
+
+
+class _FakeMgetClient:
+    def __init__(self, node):
+        self.node = node
+        self.mget_calls = []
+
+    def pipeline(self, *args, **kwargs):
+        return _FakeMgetPipeline(self)
+
+
+class TestMgetByNode:
+    def test_groups_keys_by_node_and_keeps_order(self, mocker):
+        nodes = {"A": _Node("node-A"), "B": _Node("node-B")}
+        clients = {node.id: _FakeMgetClient(node) for node in nodes.values()}
+        mocker.patch.object(redis_cluster, "_refresh_strategy_router_cache")
+        mocker.patch.object(
+            redis_cluster,
+            "_resolve_node",
+            side_effect=lambda strategy_id, *args: nodes["A"] if strategy_id < 200 else nodes["B"],
+        )
+        mocker.patch.object(RedisProxy, "get_client", side_effect=lambda n: clients[n.id])
+
+        keys = [_key(1, 101), _key(2, 201), _key(3, 102), _key(4, 202), _key(5, 103)]
+        result = RedisProxy("service").mget_by_node(keys, chunk_size=2)
+
+        assert result == [
+            "node-A:snap:101:1",
+            "node-B:snap:201:2",
+            "node-A:snap:102:3",
+            "node-B:snap:202:4",
+            "node-A:snap:103:5",
+        ]
+        # 每个节点一次 pipeline，按 chunk_size 切分 mget
+        assert clients["node-A"].mget_calls == [["snap:101:1", "snap:102:3"], ["snap:103:5"]]
+        assert clients["node-B"].mget_calls == [["snap:201:2", "snap:202:4"]]
+
+    def test_empty_keys(self):
+        assert RedisProxy("service").mget_by_node([]) == []
+
+
 class TestRedisNodeConnectionConf:
     """分片节点连接构造: 历史上 gen_connection_conf 只取 db, 无任何 socket 超时(主切换时读无限挂起)。"""
 
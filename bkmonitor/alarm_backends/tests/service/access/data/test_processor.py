@@ -21,6 +21,7 @@ from django.conf import settings
 
 from alarm_backends.core.cache import key
 from alarm_backends.service.access.data import AccessBatchDataProcess, AccessDataProcess
+from alarm_backends.service.access.data.processor import AccessStreamBatchDataProcess
 from bkmonitor.models import CacheNode
 from bkmonitor.utils.common_utils import count_md5
 from constants.strategy import MULTI_METRIC_DATA_SOURCES
@@ -47,6 +48,13 @@ class MockRecord:
         self.inhibitions = defaultdict(lambda: False)
 
 
+def build_strategy_config(strategy_id):
+    strategy_config = copy.deepcopy(STRATEGY_CONFIG_V3)
+    strategy_config["id"] = strategy_id
+    strategy_config["items"][0]["id"] = strategy_id
+    return strategy_config
+
+
 class TestAccessDataProcess:
     def setup_method(self):
         CacheNode.refresh_from_settings()
@@ -153,6 +161,62 @@ class TestAccessDataProcess:
         )
         assert len(result) == 1
 
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
+    )
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_group_detail", return_value={"1": [1]}
+    )
+    @mock.patch("alarm_backends.core.control.item.Item.query_record", return_value=query_record)
+    @mock.patch("alarm_backends.service.access.tasks.run_access_batch_data")
+    def test_pull_stream_batch(self, mock_batch, mock_records, mock_strategy_group, mock_strategy):
+        strategy_group_key = "123456789"
+        acc_data = AccessDataProcess(strategy_group_key)
+        with (
+            mock.patch.object(settings, "ACCESS_DATA_BATCH_PROCESS_THRESHOLD", 2),
+            mock.patch.object(settings, "ACCESS_DATA_BATCH_PROCESS_SIZE", 1),
+            mock.patch.object(settings, "ACCESS_DATA_STREAM_PROCESS_ENABLED", True, create=True),
+        ):
+            acc_data.pull()
+
+        # 其余批次在当前进程内处理完成，不再写入 Redis 及下发异步任务
+        data_key = key.ACCESS_BATCH_DATA_KEY.get_key(
+            strategy_group_key=strategy_group_key, sub_task_id=f"{acc_data.batch_timestamp}.2"
+        )
+        assert key.ACCESS_BATCH_DATA_KEY.client.get(data_key) is None
+        assert mock_batch.delay.call_count == 0
+
+        assert len(acc_data.record_list) == 1
+        assert acc_data.batch_count == 2
+        assert acc_data.sub_task_id == f"{acc_data.batch_timestamp}.1"
+        assert len(acc_data.stream_batch_results) == 1
+        assert acc_data.stream_batch_results[0]["sub_task_id"] == f"{acc_data.batch_timestamp}.2"
+        assert acc_data.stream_batch_results[0]["result"] is True
+
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
+    )
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_group_detail", return_value={"1": [1]}
+    )
+    @mock.patch("alarm_backends.core.control.item.Item.query_record", return_value=query_record)
+    @mock.patch("alarm_backends.service.access.tasks.run_access_batch_data")
+    def test_pull_stream_batch_failed(self, mock_batch, mock_records, mock_strategy_group, mock_strategy):
+        strategy_group_key = "123456789"
+        acc_data = AccessDataProcess(strategy_group_key)
+        with (
+            mock.patch.object(settings, "ACCESS_DATA_BATCH_PROCESS_THRESHOLD", 2),
+            mock.patch.object(settings, "ACCESS_DATA_BATCH_PROCESS_SIZE", 1),
+            mock.patch.object(settings, "ACCESS_DATA_STREAM_PROCESS_ENABLED", True, create=True),
+            mock.patch.object(AccessStreamBatchDataProcess, "push", side_effect=Exception("push failed")),
+        ):
+            acc_data.pull()
+
+        # 分批处理失败时，结果中需要带上真实的异常
+        assert len(acc_data.stream_batch_results) == 1
+        assert acc_data.stream_batch_results[0]["result"] is False
+        assert acc_data.stream_batch_results[0]["error"] == "push failed"
+
     @mock.patch(
         "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id", return_value=STRATEGY_CONFIG_V3
     )
@@ -222,6 +286,49 @@ class TestAccessDataProcess:
         )
         assert client.zrangebyscore(record_key, start_timestamp, int(time.time() + 1)) == []
 
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_by_id",
+        side_effect=lambda strategy_id: build_strategy_config(strategy_id),
+    )
+    @mock.patch(
+        "alarm_backends.core.cache.strategy.StrategyCacheManager.get_strategy_group_detail",
+        return_value={"1": [1], "2": [2]},
+    )
+    def test_push_queue_overflow(self, mock_strategy_group, mock_strategy):
+        strategy_group_key = "123456789"
+        acc_data = AccessDataProcess(strategy_group_key)
+        record = MockRecord(STANDARD_DATA)
+        record.items = acc_data.items
+        record.is_retains = {item.id: True for item in acc_data.items}
+        acc_data.record_list = [record]
+
+        # 策略1的检测队列积压，策略2正常
+        client = key.DATA_LIST_KEY.client
+        overflow_key = key.DATA_LIST_KEY.get_key(strategy_id=1, item_id=1)
+        normal_key = key.DATA_LIST_KEY.get_key(strategy_id=2, item_id=2)
+        client.delete(overflow_key, normal_key)
+        client.lpush(overflow_key, "{}")
+        signal_client = key.DATA_SIGNAL_KEY.client
+        signal_client.delete(key.DATA_SIGNAL_KEY.get_key())
+        noise_dimension_hash = count_md5(["bk_target_ip", "bk_target_cloud_id"])
+        noise_keys = [
+            key.NOISE_REDUCE_TOTAL_KEY.get_key(strategy_id=strategy_id, noise_dimension_hash=noise_dimension_hash)
+            for strategy_id in [1, 2]
+        ]
+        noise_client = key.NOISE_REDUCE_TOTAL_KEY.client
+        noise_client.delete(*noise_keys)
+        with mock.patch.object(settings, "SQL_MAX_LIMIT", 0), pytest.raises(Exception):
+            acc_data.push()
+
+        # 积压的队列不再写入，其余数据正常推送并发出处理信号后再抛出异常
+        assert client.llen(overflow_key) == 1
+        assert client.llen(normal_key) == 1
+        assert signal_client.lrange(key.DATA_SIGNAL_KEY.get_key(), 0, -1) == ["2"]
+
+        # 积压队列的数据未写入，不记录降噪基数
+        for record_key, expected in zip(noise_keys, [0, 1]):
+            assert noise_client.zcard(record_key) == expected
+
 
 class TestLimitRecordsByTimePoints:
     """测试 _limit_records_by_time_points 方法（方案 B：限制处理时间点数量）"""
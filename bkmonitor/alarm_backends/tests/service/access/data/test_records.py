@@ -9,6 +9,7 @@ specific language governing permissions and limitations under the License.
 """
 
 import copy
+import json
 
 from alarm_backends.core.cache.strategy import StrategyCacheManager
 from alarm_backends.core.control.strategy import Strategy
@@ -16,6 +17,46 @@ from alarm_backends.service.access.data.records import DataRecord
 
 from .config import FORMAT_RAW_DATA, STANDARD_DATA, STRATEGY_CONFIG_V3
 
+SERIES_COUNT = 5
+TIME_COUNT = 3
+
+
+def build_raw_data_list():
+    """
+    构造 SERIES_COUNT * TIME_COUNT 个数据点
+    """
+    points = []
+    for timestamp_index in range(TIME_COUNT):
+        for series_index in range(SERIES_COUNT):
+            points.append(
+                {
+                    "bk_target_ip": f"127.0.0.{series_index}",
+                    "load5": series_index / 100,
+                    "bk_target_cloud_id": "0",
+                    "_time_": 1569246480 + timestamp_index * 60,
+                    "_result_": series_index / 100,
+                }
+            )
+    return points
+
+
+def clean_records(item, raw_data_list, compact):
+    """
+    模拟 access 处理流程：实例化 -> 格式化 -> 推送序列化，返回推送数据
+    """
+    dimension_table = {} if compact else None
+    records = [DataRecord(item, raw_data, dimension_table).clean() for raw_data in raw_data_list]
+    if compact:
+        for record in records:
+            record.release_raw_data()
+
+    outputs = []
+    for record in records:
+        data = json.loads(json.dumps(record.data))
+        data.pop("access_time")
+        outputs.append(data)
+    return outputs
+
 
 class TestRecords:
     def test_record(self, mocker):
@@ -43,3 +84,33 @@ class TestRecords:
         item.query.is_partial = False
         complete_record = DataRecord(item, FORMAT_RAW_DATA).clean()
         assert "is_partial" not in complete_record.data
+
+    def test_dimension_table(self, mocker):
+        get_strategy_by_id = mocker.patch.object(StrategyCacheManager, "get_strategy_by_id")
+        get_strategy_by_id.return_value = copy.deepcopy(STRATEGY_CONFIG_V3)
+        item = Strategy(1).items[0]
+
+        dimension_table = {}
+        raw_data_list = [json.loads(json.dumps(FORMAT_RAW_DATA)) for __ in range(2)]
+        records = [DataRecord(item, raw_data, dimension_table).clean() for raw_data in raw_data_list]
+        for record in records:
+            record.release_raw_data()
+            assert record.raw_data is None
+            record.data.pop("access_time", None)
+            record.data.pop("dimension_fields", None)
+            assert record.data == STANDARD_DATA
+
+        assert records[0].dimensions["bk_target_ip"] is records[1].dimensions["bk_target_ip"]
+        assert records[0].is_retains[item.id] is True
+        assert records[0].inhibitions[item.id] is False
+
+    def test_compact_record_round_trip(self, mocker):
+        get_strategy_by_id = mocker.patch.object(StrategyCacheManager, "get_strategy_by_id")
+        get_strategy_by_id.return_value = copy.deepcopy(STRATEGY_CONFIG_V3)
+        item = Strategy(1).items[0]
+
+        # 共享维度及释放原始数据后，推送的数据与原始处理方式一致
+        origin_outputs = clean_records(item, build_raw_data_list(), compact=False)
+        compact_outputs = clean_records(item, build_raw_data_list(), compact=True)
+        assert compact_outputs == origin_outputs
+        assert len(compact_outputs) == SERIES_COUNT * TIME_COUNT
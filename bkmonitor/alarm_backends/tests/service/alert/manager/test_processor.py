@@ -9,15 +9,42 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import json
+from types import SimpleNamespace
+
+import mock
 from django.test import TestCase
 
 from alarm_backends.core.alert import Alert
 from alarm_backends.core.alert.alert import AlertKey
 from alarm_backends.core.cache.key import ALERT_DEDUPE_CONTENT_KEY
-from alarm_backends.service.alert.manager.processor import AlertManager
+from alarm_backends.service.alert.manager.processor import (
+    USER_MODIFIED_FIELDS,
+    AlertManager,
+)
+from bkmonitor.documents import AlertDocument
 from bkmonitor.models import CacheNode
 
 
+def build_alert(alert_id, dedupe_md5, status="ABNORMAL"):
+    return Alert(
+        {
+            "id": alert_id,
+            "dedupe_md5": dedupe_md5,
+            "end_time": None,
+            "create_time": 1617504052,
+            "begin_time": 1617504052,
+            "first_anomaly_time": 1617504052,
+            "latest_time": 1617504052,
+            "status": status,
+            "severity": 0,
+            "event": {"id": "event-1"},
+            "strategy_id": 333,
+            "extra_info": {"strategy": {"id": 333}},
+        }
+    )
+
+
 class TestProcessor(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -58,3 +85,48 @@ class TestProcessor(TestCase):
         snapshot_alert = Alert.get_from_snapshot(alert_key)
         self.assertIsNotNone(snapshot_alert)
         self.assertEqual(snapshot_alert.id, alert.id)
+
+    def test_fetch_alerts(self):
+        alert = build_alert("4444555667", "68e9f0598d72a4b6de2675d491e5b923")
+        alert_key = AlertKey(alert_id=alert.id, strategy_id=alert.strategy_id)
+        processor = AlertManager([alert_key])
+        processor.update_alert_snapshot([alert])
+
+        alert_doc = SimpleNamespace(
+            id=alert.id,
+            assignee=["admin"],
+            is_ack=True,
+            extra_info=SimpleNamespace(to_dict=lambda: {"rule_snaps": {"1": {}}}),
+        )
+        with mock.patch.object(AlertDocument, "mget", return_value=[alert_doc]) as mget:
+            alerts = processor.fetch_alerts()
+
+        # 用户修改字段按告警ID拉取，不依赖快照读取结果
+        mget.assert_called_once_with(ids=[alert.id], fields=USER_MODIFIED_FIELDS)
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0].data["assignee"], ["admin"])
+        self.assertTrue(alerts[0].data["is_ack"])
+        self.assertIsNone(alerts[0].data["appointee"])
+        self.assertEqual(alerts[0].data["extra_info"], {"strategy": {"id": 333}, "rule_snaps": {"1": {}}})
+
+    def test_filter_alerts(self):
+        abnormal_alert = build_alert("4444555668", "68e9f0598d72a4b6de2675d491e5b924")
+        closed_alert = build_alert("4444555669", "68e9f0598d72a4b6de2675d491e5b925")
+        uncached_alert = build_alert("4444555670", "68e9f0598d72a4b6de2675d491e5b926")
+        for alert, status in ((abnormal_alert, "ABNORMAL"), (closed_alert, "CLOSED")):
+            content = dict(alert.to_dict(), status=status)
+            ALERT_DEDUPE_CONTENT_KEY.client.set(
+                ALERT_DEDUPE_CONTENT_KEY.get_key(strategy_id=alert.strategy_id, dedupe_md5=alert.dedupe_md5),
+                json.dumps(content),
+            )
+
+        processor = AlertManager([])
+        alerts = processor.filter_alerts([abnormal_alert, closed_alert, uncached_alert])
+        self.assertEqual([alert.id for alert in alerts], [abnormal_alert.id, uncached_alert.id])
+
+        # 加锁期间复用已读取的缓存内容，不再重复读取
+        with mock.patch.object(ALERT_DEDUPE_CONTENT_KEY.client, "mget_by_node") as mget_by_node:
+            contents = processor.get_current_alert_contents(alerts)
+            mget_by_node.assert_not_called()
+        self.assertEqual(list(contents), [abnormal_alert.dedupe_md5])
+        self.assertEqual(contents[abnormal_alert.dedupe_md5]["id"], abnormal_alert.id)
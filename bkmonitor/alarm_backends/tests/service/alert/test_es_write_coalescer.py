@@ -0,0 +1,151 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+from unittest import TestCase, mock
+
+from django.conf import settings
+
+from alarm_backends.core.alert import Alert
+from alarm_backends.service.alert.processor import BaseAlertProcessor
+from bkmonitor.documents import AlertDocument, AlertLog
+from bkmonitor.documents.base import BulkActionType, BulkWriteCoalescer
+
+INDEX = "write_20210404_bkfta_alert_log"
+
+
+def build_create(doc_id, source):
+    action = {"_op_type": BulkActionType.CREATE, "_index": INDEX, "_source": source}
+    if doc_id is not None:
+        action["_id"] = doc_id
+    return action
+
+
+def build_alert(alert_id, refresh_db):
+    alert = Alert(
+        {
+            "id": alert_id,
+            "dedupe_md5": "68e9f0598d72a4b6de2675d491e5b922",
+            "end_time": None,
+            "create_time": 1617504052,
+            "begin_time": 1617504052,
+            "latest_time": 1617504052,
+            "first_anomaly_time": 1617504052,
+            "status": "ABNORMAL",
+            "severity": 1,
+        }
+    )
+    alert._refresh_db = refresh_db
+    return alert
+
+
+class TestBulkWriteCoalescer(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(AlertLog, "bulk_actions")
+        self.bulk_actions = patcher.start()
+        self.addCleanup(patcher.stop)
+        # 默认不触发后台刷写，由用例主动刷写
+        self.coalescer = BulkWriteCoalescer(AlertLog, batch_size=100, flush_interval=60, max_backlog=1000)
+
+    def tearDown(self):
+        # 停止后台线程，避免用例结束后继续写入
+        self.coalescer.stop(timeout=5)
+        self.assertFalse(self.coalescer._worker and self.coalescer._worker.is_alive())
+
+    def test_dedupe_by_id(self):
+        self.coalescer.write([build_create("1", {"a": 1})])
+        self.coalescer.write([build_create("1", {"a": 2}), build_create("2", {})])
+        self.assertEqual(self.coalescer.backlog, 2)
+        self.bulk_actions.assert_not_called()
+
+        self.assertEqual(self.coalescer.flush(), 2)
+        actions = self.bulk_actions.call_args[0][0]
+        self.assertEqual([action["_id"] for action in actions], ["1", "2"])
+        self.assertEqual(actions[0]["_source"], {"a": 2})
+        self.assertEqual(self.coalescer.backlog, 0)
+
+    def test_actions_without_id(self):
+        action = build_create(None, {"alert_id": "1"})
+        self.coalescer.write([action, dict(action)])
+        self.assertEqual(self.coalescer.backlog, 2)
+
+    def test_reject_non_append_only(self):
+        update_action = {"_op_type": BulkActionType.UPDATE, "_index": INDEX, "_id": "1", "doc": {"status": "CLOSED"}}
+        with self.assertRaises(ValueError):
+            self.coalescer.write([update_action])
+        self.assertEqual(self.coalescer.backlog, 0)
+
+    def test_backlog_flush(self):
+        self.coalescer.max_backlog = 3
+        self.coalescer.write([build_create(str(i), {}) for i in range(2)])
+        self.bulk_actions.assert_not_called()
+
+        # 积压达到上限时由写入方同步刷写
+        self.coalescer.write([build_create("3", {})])
+        self.assertEqual(len(self.bulk_actions.call_args[0][0]), 3)
+        self.assertEqual(self.coalescer.backlog, 0)
+
+    def test_flush_by_batch_size(self):
+        self.coalescer.batch_size = 2
+        self.coalescer.max_backlog = 5
+        self.coalescer.write([build_create(str(i), {}) for i in range(5)])
+        self.assertEqual([len(call[0][0]) for call in self.bulk_actions.call_args_list], [2, 2, 1])
+
+    def test_background_flush(self):
+        self.coalescer.flush_interval = 0.05
+        self.coalescer.write([build_create("1", {})])
+
+        deadline = time.time() + 5
+        while not self.bulk_actions.called and time.time() < deadline:
+            time.sleep(0.01)
+        self.bulk_actions.assert_called_once()
+        self.assertEqual(self.coalescer.backlog, 0)
+
+    def test_stop(self):
+        self.coalescer.write([build_create("1", {})])
+        self.assertEqual(self.coalescer.stop(timeout=5), 1)
+        self.assertFalse(self.coalescer._worker.is_alive())
+
+        # 停止后直接同步写入
+        self.coalescer.write([build_create("2", {})])
+        self.assertEqual(self.bulk_actions.call_count, 2)
+        self.assertEqual(self.coalescer.backlog, 0)
+
+
+class TestSaveAlertsCoalesce(TestCase):
+    @mock.patch.object(settings, "ALERT_ES_WRITE_COALESCE_ENABLED", True, create=True)
+    @mock.patch.object(AlertDocument, "bulk_create")
+    def test_save_alerts_always_sync(self, bulk_create):
+        alerts = [build_alert("1", refresh_db=True), build_alert("2", refresh_db=False)]
+        BaseAlertProcessor.save_alerts(alerts, action=BulkActionType.UPSERT, force_save=True)
+
+        # 告警文档带有状态，开启合并后依然同步写入
+        self.assertEqual([document.id for document in bulk_create.call_args[0][0]], ["1", "2"])
+
+    @mock.patch.object(settings, "ALERT_ES_WRITE_COALESCE_ENABLED", True, create=True)
+    @mock.patch.object(AlertLog, "bulk_create")
+    @mock.patch.object(AlertLog, "bulk_create_coalesced")
+    @mock.patch.object(Alert, "list_log_documents", return_value=[AlertLog(alert_id=["1"])])
+    def test_save_alert_logs(self, list_log_documents, bulk_create_coalesced, bulk_create):
+        alerts = [build_alert("1", refresh_db=True), build_alert("2", refresh_db=False)]
+        BaseAlertProcessor.save_alert_logs(alerts)
+
+        bulk_create.assert_not_called()
+        self.assertEqual(len(bulk_create_coalesced.call_args[0][0]), 2)
+
+    @mock.patch.object(settings, "ALERT_ES_WRITE_COALESCE_ENABLED", False, create=True)
+    @mock.patch.object(AlertLog, "bulk_create")
+    @mock.patch.object(AlertLog, "bulk_create_coalesced")
+    @mock.patch.object(Alert, "list_log_documents", return_value=[AlertLog(alert_id=["1"])])
+    def test_save_alert_logs_disabled(self, list_log_documents, bulk_create_coalesced, bulk_create):
+        BaseAlertProcessor.save_alert_logs([build_alert("1", refresh_db=False)])
+
+        bulk_create_coalesced.assert_not_called()
+        self.assertEqual(len(bulk_create.call_args[0][0]), 1)
@@ -7,11 +7,16 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 import pytest
 
-from alarm_backends.service.converge.shield.shield_obj import ShieldObj
+from alarm_backends.service.converge.shield.shield_obj import (
+    AlertShieldIndex,
+    AlertShieldObj,
+    ShieldObj,
+)
 from bkmonitor.utils.shield import BaseShieldDisplayManager, format_dimension_conditions_display
 
 pytestmark = pytest.mark.django_db
@@ -130,6 +135,84 @@ class TestQuickAlertShieldMatch:
         assert shield_obj.dimension_check.is_match(_alert_data(pod=POD_B)) is False
 
 
+def _index_config(shield_id, dimension_config, category="strategy", begin_offset=-1, end_offset=1):
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "id": shield_id,
+        "bk_biz_id": 2,
+        "category": category,
+        "scope_type": "instance",
+        "cycle_config": {},
+        "begin_time": now + timedelta(hours=begin_offset),
+        "end_time": now + timedelta(hours=end_offset),
+        "dimension_config": dimension_config,
+    }
+
+
+class TestAlertShieldIndex:
+    def setup_method(self):
+        AlertShieldIndex._biz_index_cache.clear()
+
+    def _build_index(self):
+        configs = [
+            _index_config(1, {"strategy_id": STRATEGY_ID}),
+            _index_config(2, {"strategy_id": [STRATEGY_ID + 1, STRATEGY_ID + 2]}),
+            _index_config(
+                3,
+                {"dimension_conditions": [{"key": "tags.namespace", "value": [NAMESPACE], "method": "eq"}]},
+                category="dimension",
+            ),
+            _index_config(
+                4,
+                {"dimension_conditions": [{"key": "tags.namespace", "value": ["ns-.*"], "method": "reg"}]},
+                category="dimension",
+            ),
+            _index_config(5, {"strategy_id": STRATEGY_ID}, begin_offset=1, end_offset=2),
+        ]
+        return AlertShieldIndex.get_index(2, configs), configs
+
+    def test_candidates(self):
+        index, configs = self._build_index()
+        assert index.unindexed_shield_ids == [4]
+
+        alert = mock.MagicMock(id="1", strategy_id=STRATEGY_ID)
+        with mock.patch.object(AlertShieldObj, "_get_cached_alert_dimension", return_value=_alert_data()):
+            # 未生效的屏蔽配置 5 以及其他策略的屏蔽配置 2 不作为候选
+            assert [shield_obj.id for shield_obj in index.get_candidates(alert)] == [1, 3, 4]
+
+            shield_objs, candidate_count = index.match(alert)
+            assert candidate_count == 3
+            assert [shield_obj.id for shield_obj in shield_objs] == [1, 3, 4]
+
+            # 与逐条匹配的结果保持一致
+            assert [config["id"] for config in configs if AlertShieldObj(config).is_match(alert)] == [1, 3, 4]
+
+        alert = mock.MagicMock(id="2", strategy_id=STRATEGY_ID + 2)
+        with mock.patch.object(
+            AlertShieldObj,
+            "_get_cached_alert_dimension",
+            return_value=_alert_data(namespace="prod", strategy_id=STRATEGY_ID + 2),
+        ):
+            assert [shield_obj.id for shield_obj in index.get_candidates(alert)] == [2, 4]
+            shield_objs, candidate_count = index.match(alert)
+            assert [shield_obj.id for shield_obj in shield_objs] == [2]
+
+    def test_index_cache(self):
+        index, configs = self._build_index()
+        assert AlertShieldIndex.get_index(2, configs) is index
+        assert [shield_obj.id for shield_obj in index.get_shield_objs(["1", "3"])] == [1, 3]
+
+        # 屏蔽配置变更后重建索引
+        configs = configs[:2]
+        new_index = AlertShieldIndex.get_index(2, configs)
+        assert new_index is not index
+        assert list(new_index.shield_objs) == [1, 2]
+
+        # 索引过期后重建
+        new_index.create_time -= AlertShieldIndex.TTL + 1
+        assert AlertShieldIndex.get_index(2, configs) is not new_index
+
+
 class TestShieldDisplay:
     def test_format_dimension_conditions_display(self):
         content = format_dimension_conditions_display(
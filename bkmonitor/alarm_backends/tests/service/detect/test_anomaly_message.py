@@ -0,0 +1,58 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import mock
+from django.template import Context, Template
+
+from alarm_backends.service.detect.strategy import get_compiled_template
+from alarm_backends.service.detect.strategy.simple_ring_ratio import SimpleRingRatio
+from alarm_backends.service.detect.strategy.threshold import Threshold
+from alarm_backends.tests.service.detect.mocked_data import (
+    datapoint6,
+    datapoint99,
+    mock_datapoint_with_value,
+)
+
+POINT_COUNT = 20
+
+
+class TestAnomalyMessage:
+    def test_compiled_template_cache(self):
+        desc_tpl = "{% load unit %}{{unit|unit_suffix:algorithm_unit}}"
+        assert get_compiled_template(desc_tpl) is get_compiled_template(desc_tpl)
+
+    def test_threshold_formatter(self):
+        algorithms_config = [
+            [{"threshold": 6, "method": "gt"}, {"threshold": 99, "method": "lte"}, {"threshold": 50, "method": "neq"}],
+            [{"threshold": 6, "method": "eq"}],
+        ]
+        detect_engine = Threshold(config=algorithms_config, unit="")
+        for and_threshold in detect_engine.detectors:
+            for detector in and_threshold.detectors:
+                for data_point in (datapoint99, datapoint6):
+                    expected = Template(detector.desc_tpl).render(Context(detector.get_context(data_point)))
+                    assert detector._format_message(data_point) == expected
+
+    def test_ring_ratio_messages(self):
+        with mock.patch(
+            "alarm_backends.service.detect.strategy.simple_ring_ratio.SimpleRingRatio.history_point_fetcher",
+            return_value=datapoint99,
+        ):
+            detect_engine = SimpleRingRatio(config={"floor": 50, "ceil": 100})
+            detector = detect_engine.detectors[1]
+            data_points = [mock_datapoint_with_value(200 + i) for i in range(POINT_COUNT)]
+
+            expected = [
+                Template(str(detector.desc_tpl)).render(Context(detector.get_context(data_point)))
+                for data_point in data_points
+            ]
+            messages = [detector._format_message(data_point) for data_point in data_points]
+
+        assert messages == expected
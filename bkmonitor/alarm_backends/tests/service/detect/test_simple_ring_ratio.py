@@ -12,9 +12,14 @@ specific language governing permissions and limitations under the License.
 
 import mock
 import pytest
+from django.conf import settings
 
+from alarm_backends.core.cache import key
+from alarm_backends.core.storage.redis_cluster import get_node_by_strategy_id
+from alarm_backends.service.detect import DataPoint as DetectDataPoint
 from alarm_backends.service.detect.strategy.simple_ring_ratio import SimpleRingRatio
 from alarm_backends.tests.service.detect import DataPoint
+from bkmonitor.models import CacheNode
 from core.errors.alarm_backends.detect import (
     InvalidAlgorithmsConfig,
     InvalidDataPoint,
@@ -106,6 +111,70 @@ class TestSimpleRingRatio(object):
             assert len(anomaly_result) == 1
             assert anomaly_result[0].anomaly_message == "avg(测试指标)较前一时刻(99%)下降超过50.0%, 当前值0%"
 
+    def test_batch_detect(self):
+        with mock.patch(
+            "alarm_backends.service.detect.strategy.simple_ring_ratio.SimpleRingRatio.history_point_fetcher",
+            return_value=datapoint99,
+        ):
+            from .mocked_data import mock_datapoint_with_value
+
+            data_points = [mock_datapoint_with_value(value) for value in (200, 100, 99, 0)]
+            algorithms_config = {"floor": 50, "ceil": 100}
+            detect_engine = SimpleRingRatio(config=algorithms_config)
+            expected = [(ap.data_point, ap.anomaly_message) for ap in detect_engine.detect_records(data_points, 1)]
+
+            with mock.patch.object(settings, "ENABLE_DETECT_BATCH_MODE", True, create=True):
+                anomaly_result = detect_engine.detect_records(data_points, 1)
+
+            assert [(ap.data_point, ap.anomaly_message) for ap in anomaly_result] == expected
+            assert [ap.data_point.value for ap in anomaly_result] == [200, 0]
+            assert anomaly_result[1].anomaly_message == "avg(测试指标)较前一时刻(99%)下降超过50.0%, 当前值0%"
+
+    def test_batch_detect_without_history(self):
+        with mock.patch(
+            "alarm_backends.service.detect.strategy.simple_ring_ratio.SimpleRingRatio.history_point_fetcher",
+            return_value=None,
+        ):
+            from .mocked_data import mock_datapoint_with_value
+
+            detect_engine = SimpleRingRatio(config={"floor": 50, "ceil": 100})
+            with mock.patch.object(settings, "ENABLE_DETECT_BATCH_MODE", True, create=True):
+                assert detect_engine.detect_records([mock_datapoint_with_value(200)], 1) == []
+
+    @pytest.mark.django_db
+    def test_load_history_points(self):
+        from .mocked_data import mock_datapoint_with_value
+
+        get_node_by_strategy_id(0)
+        CacheNode.refresh_from_settings()
+
+        data_point = mock_datapoint_with_value(200)
+        item = data_point.item
+        history_timestamp = data_point.timestamp - 60
+        history_point = DetectDataPoint(
+            {
+                "record_id": f"{data_point.record_id}.{history_timestamp}",
+                "value": 99,
+                "values": {"timestamp": history_timestamp, "mocked_metric": 99},
+                "dimensions": {"mocked": "mocked"},
+                "time": history_timestamp,
+            },
+            item,
+        )
+        detect_engine = SimpleRingRatio(config={"floor": 50, "ceil": 100})
+        detect_engine._publish_history_points(item, [history_point])
+
+        # 只有未缓存过的时间段需要查询
+        missing_ranges = detect_engine._get_missing_history_ranges(
+            item, [history_timestamp - 120, history_timestamp - 60, history_timestamp]
+        )
+        assert missing_ranges == [(history_timestamp - 120, history_timestamp)]
+
+        # 预加载后，检测时不再逐个 history key 读取
+        detect_engine.load_history_points(item, [data_point])
+        with mock.patch.object(key.HISTORY_DATA_KEY.client, "hgetall", side_effect=AssertionError("hgetall")):
+            assert detect_engine.history_point_fetcher(data_point).value == 99
+
     def test_detect_with_invalid_datapoint(self):
         algorithms_config = {"floor": 99, "ceil": 99}
         with pytest.raises(InvalidDataPoint):
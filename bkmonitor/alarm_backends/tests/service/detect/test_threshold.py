@@ -8,7 +8,9 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+import mock
 import pytest
+from django.conf import settings
 
 from alarm_backends.service.detect import DataPoint
 from alarm_backends.service.detect.strategy.threshold import Threshold
@@ -19,6 +21,7 @@ from alarm_backends.tests.service.detect.mocked_data import (
     datapoint50,
     datapoint99,
     item_config,
+    mock_datapoint_with_value,
     mock_unify_query,
     mocked_data_source,
 )
@@ -143,3 +146,31 @@ class TestThreshold(object):
 
         anomaly_records = detect_engine.detect_records([datapoint], 1)
         assert anomaly_records[0].anomaly_message == "avg(测试指标) >= 1.0KiB, 当前值1.000977KiB"
+
+    def test_batch_detect(self):
+        algorithms_config = [
+            [{"threshold": 6, "method": "gt"}, {"threshold": 99, "method": "lte"}, {"threshold": 50, "method": "neq"}],
+            [{"threshold": 6, "method": "eq"}],
+        ]
+        data_points = [datapoint99, datapoint50, datapoint6]
+        detect_engine = Threshold(config=algorithms_config)
+        expected = [(ap.data_point, ap.anomaly_message) for ap in detect_engine.detect_records(data_points, 1)]
+
+        with mock.patch.object(settings, "ENABLE_DETECT_BATCH_MODE", True, create=True):
+            with mock.patch.object(Threshold, "detect", side_effect=AssertionError("should not detect per point")):
+                anomaly_result = detect_engine.detect_records(data_points, 1)
+
+        assert [(ap.data_point, ap.anomaly_message) for ap in anomaly_result] == expected
+        assert [ap.data_point for ap in anomaly_result] == [datapoint99, datapoint6]
+        assert len(anomaly_result[0].child_detector) == 3
+        assert anomaly_result[1].anomaly_message == "avg(测试指标) = 6.0%, 当前值6%"
+
+    def test_batch_detect_skip_invalid_value(self):
+        algorithms_config = [[{"threshold": 50.0, "method": "gte"}]]
+        detect_engine = Threshold(config=algorithms_config)
+        invalid_datapoint = mock_datapoint_with_value(None)
+
+        with mock.patch.object(settings, "ENABLE_DETECT_BATCH_MODE", True, create=True):
+            anomaly_result = detect_engine.detect_records([invalid_datapoint, datapoint99], 1)
+
+        assert [ap.data_point for ap in anomaly_result] == [datapoint99]
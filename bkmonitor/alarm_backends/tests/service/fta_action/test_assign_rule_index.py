@@ -0,0 +1,158 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import itertools
+
+import mock
+
+from alarm_backends.core.cache.assign import AssignCacheManager
+from bkmonitor.action.alert_assign import AssignRuleIndex, AssignRuleMatch
+
+
+def build_rule(rule_id, conditions):
+    return {"id": rule_id, "conditions": conditions, "user_groups": [1], "actions": []}
+
+
+RULES = [
+    # 单个等值条件
+    build_rule(1, [{"field": "alert.name", "value": ["cpu"], "method": "eq"}]),
+    # 多个 and 条件，任取一个等值条件索引
+    build_rule(
+        2,
+        [
+            {"field": "alert.name", "value": ["disk"], "method": "include"},
+            {"field": "bk_host_id", "value": [1, 2], "method": "eq", "condition": "and"},
+        ],
+    ),
+    # or 分支均有等值条件
+    build_rule(
+        3,
+        [
+            {"field": "tags.target", "value": " 127.0.0.1 ", "method": "eq"},
+            {"field": "alert.labels", "value": ["db"], "method": "eq", "condition": "or"},
+        ],
+    ),
+    # or 分支中存在无法索引的条件
+    build_rule(
+        4,
+        [
+            {"field": "tags.target", "value": ["127.0.0.1"], "method": "eq"},
+            {"field": "alert.name", "value": ["mem"], "method": "include", "condition": "or"},
+        ],
+    ),
+    # 特殊维度不参与索引
+    build_rule(5, [{"field": "ip", "value": ["127.0.0.1"], "method": "eq"}]),
+    # 空条件值不生效
+    build_rule(
+        6,
+        [
+            {"field": "bk_host_id", "value": [], "method": "eq"},
+            {"field": "alert.name", "value": ["cpu"], "method": "neq", "condition": "and"},
+        ],
+    ),
+    build_rule(7, []),
+]
+
+DIMENSIONS_LIST = [
+    {"alert.name": name, "bk_host_id": host_id, "tags.target": target, "alert.labels": labels, "ip": target}
+    for name, host_id, target, labels in itertools.product(
+        ["cpu", "disk", "mem", "load"],
+        ["1", "3", None],
+        ["127.0.0.1", "127.0.0.2"],
+        [["db"], [], ["web", "db"]],
+    )
+]
+
+
+def match_rule_ids(rules, dimensions, rule_snaps=None):
+    rule_snaps = rule_snaps or {}
+    return [
+        rule["id"] for rule in rules if AssignRuleMatch(rule, rule_snaps.get(str(rule["id"]))).is_matched(dimensions)
+    ]
+
+
+class TestAssignRuleIndex:
+    def test_build_index(self):
+        priority_index = AssignRuleIndex.build_index(RULES)
+        assert [RULES[position]["id"] for position in priority_index["full_match"]] == [4, 5, 6, 7]
+        assert priority_index["values"] == {
+            "alert.name": {"cpu": {0}},
+            "bk_host_id": {"1": {1}, "2": {1}},
+            "tags.target": {"127.0.0.1": {2}},
+            "alert.labels": {"db": {2}},
+        }
+
+    def test_candidate_rules(self):
+        rule_index = AssignRuleIndex([RULES])
+        for dimensions in DIMENSIONS_LIST:
+            candidate_rules = next(rule_index.iter_candidate_rules(dimensions))
+            # 索引过滤后的匹配结果与全量匹配一致
+            assert match_rule_ids(candidate_rules, dimensions) == match_rule_ids(RULES, dimensions)
+
+        dimensions = {"alert.name": "load", "bk_host_id": "3", "tags.target": "127.0.0.2", "alert.labels": []}
+        assert [rule["id"] for rule in next(rule_index.iter_candidate_rules(dimensions))] == [4, 5, 6, 7]
+
+    def test_candidate_rules_with_snaps(self):
+        rule_index = AssignRuleIndex([RULES])
+        dimensions = {"alert.name": "load"}
+        # 已适配过的规则没有变化时直接视为适配，需要保留在候选规则中
+        rule_snaps = {"1": dict(RULES[0])}
+        candidate_rules = next(rule_index.iter_candidate_rules(dimensions, rule_snaps))
+        assert [rule["id"] for rule in candidate_rules] == [1, 4, 5, 6, 7]
+
+    def test_priority_order(self):
+        rule_index = AssignRuleIndex([RULES[:1], RULES[1:2]])
+        candidates = list(rule_index.iter_candidate_rules({"alert.name": "cpu", "bk_host_id": "2"}))
+        assert [[rule["id"] for rule in rules] for rules in candidates] == [[1], [2]]
+
+    def test_rule_index_cache(self):
+        AssignCacheManager.clear()
+        with (
+            mock.patch.object(AssignCacheManager, "get_assign_priority_by_biz_id", return_value=[2, 1]),
+            mock.patch.object(
+                AssignCacheManager, "get_assign_groups_by_priority", side_effect=lambda bk_biz_id, priority: {priority}
+            ),
+            mock.patch.object(
+                AssignCacheManager,
+                "get_assign_rules_by_group",
+                side_effect=lambda bk_biz_id, group_id: RULES[group_id:],
+            ) as get_rules,
+        ):
+            rule_index = AssignCacheManager.get_assign_rule_index(2)
+            assert AssignCacheManager.get_assign_rule_index(2) is rule_index
+            assert get_rules.call_count == 2
+            assert rule_index.priority_rules == [RULES[2:], RULES[1:]]
+        AssignCacheManager.clear()
+
+    def test_candidate_rules_equal_full_match(self):
+        # 包含特殊维度(不参与索引)条件的规则
+        rules = RULES + [
+            build_rule(8, [{"field": "bk_target_ip", "value": ["127.0.0.2"], "method": "eq"}]),
+            build_rule(
+                9,
+                [
+                    {"field": "alert.name", "value": ["load"], "method": "eq"},
+                    {"field": "ip", "value": ["127.0.0.2"], "method": "eq", "condition": "and"},
+                ],
+            ),
+        ]
+        # 规则 1 未变化，直接视为适配；规则 2 条件已变化，需要重新匹配
+        rule_snaps = {
+            "1": dict(RULES[0]),
+            "2": build_rule(2, [{"field": "alert.name", "value": ["load"], "method": "eq"}]),
+        }
+        rule_index = AssignRuleIndex([rules])
+        for snaps in [None, rule_snaps]:
+            for dimensions in DIMENSIONS_LIST:
+                dimensions = dict(dimensions, bk_target_ip=dimensions["ip"])
+                candidate_rules = next(rule_index.iter_candidate_rules(dimensions, snaps))
+                result = match_rule_ids(candidate_rules, dimensions, snaps)
+                expected = match_rule_ids(rules, dimensions, snaps)
+                assert result == expected
@@ -105,3 +105,10 @@ class MockCheckResult:
 
     def remove_dimension_by_key(self, service_type: str, strategy_id: int, item_id: int, dimensions_md5):
         self.dimensions.pop(dimensions_md5)
+
+    def get_dimensions(self, service_type: str, strategy_id: int, item_id: int):
+        return copy.deepcopy(self.dimensions)
+
+    def remove_dimensions_by_keys(self, service_type: str, strategy_id: int, item_id: int, dimensions_md5_list):
+        for dimensions_md5 in dimensions_md5_list:
+            self.dimensions.pop(dimensions_md5)
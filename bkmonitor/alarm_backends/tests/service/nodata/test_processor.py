@@ -0,0 +1,97 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from alarm_backends.core.cache import key
+from alarm_backends.service.nodata import processor as nodata_processor
+from alarm_backends.service.nodata.processor import CheckProcessor
+
+STRATEGY_ID = 1
+CHECK_TIMESTAMP = 1569246480
+
+
+def build_record(index, timestamp):
+    return {
+        "record_id": f"{index}.{timestamp}",
+        "value": index,
+        "values": {"timestamp": timestamp, "load5": index},
+        "dimensions": {"bk_target_ip": f"127.0.0.{index}"},
+        "time": timestamp,
+    }
+
+
+class TestPullData(TestCase):
+    databases = {"monitor_api", "default"}
+
+    def setUp(self):
+        self.item = SimpleNamespace(id=1)
+        self.processor = CheckProcessor.__new__(CheckProcessor)
+        self.processor.strategy_id = STRATEGY_ID
+        self.processor.inputs = {}
+        self.data_channel = key.NO_DATA_LIST_KEY.get_key(strategy_id=STRATEGY_ID, item_id=self.item.id)
+        self.client = key.NO_DATA_LIST_KEY.client
+        self.client.delete(self.data_channel)
+
+    def tearDown(self):
+        self.client.delete(self.data_channel)
+
+    def push(self, records):
+        # 与 access 一致，数据从左侧写入，从右侧读取
+        for record in records:
+            if not isinstance(record, str):
+                record = key.NO_DATA_LIST_KEY.dumps(record)
+            self.client.lpush(self.data_channel, record)
+
+    def remaining_records(self):
+        return [json.loads(record) for record in self.client.lrange(self.data_channel, 0, -1)]
+
+    @patch.object(nodata_processor, "NODATA_PULL_CHUNK_SIZE", 2)
+    def test_pull_current_records(self):
+        future_record = build_record(3, CHECK_TIMESTAMP + 60)
+        self.push(
+            [
+                build_record(1, CHECK_TIMESTAMP - 60),
+                future_record,
+                "not json",
+                build_record(2, CHECK_TIMESTAMP),
+                build_record(4, CHECK_TIMESTAMP + 120),
+            ]
+        )
+        self.processor.pull_data(self.item, CHECK_TIMESTAMP)
+
+        self.assertEqual([point.value for point in self.processor.inputs[self.item.id]], [2, 1])
+        # 未来数据按读取顺序放回队列
+        self.assertEqual(self.remaining_records(), [build_record(4, CHECK_TIMESTAMP + 120), future_record])
+
+    @patch.object(nodata_processor, "NODATA_PULL_CHUNK_SIZE", 2)
+    def test_pull_earliest_future_records(self):
+        self.push(
+            [
+                build_record(1, CHECK_TIMESTAMP + 120),
+                build_record(2, CHECK_TIMESTAMP + 60),
+                build_record(3, CHECK_TIMESTAMP + 180),
+                build_record(4, CHECK_TIMESTAMP + 60),
+                build_record(5, CHECK_TIMESTAMP + 120),
+            ]
+        )
+        self.processor.pull_data(self.item, CHECK_TIMESTAMP)
+
+        # 当前检测点之前无数据时，取未来最早一个周期的数据
+        self.assertEqual([point.value for point in self.processor.inputs[self.item.id]], [4, 2])
+        self.assertEqual([record["value"] for record in self.remaining_records()], [5, 3, 1])
+
+    def test_pull_empty_queue(self):
+        self.processor.pull_data(self.item, CHECK_TIMESTAMP)
+        self.assertEqual(self.processor.inputs[self.item.id], [])
@@ -11,6 +11,7 @@ specific language governing permissions and limitations under the License.
 
 import copy
 import json
+from unittest import mock
 
 import arrow
 import pytest
@@ -313,6 +314,27 @@ class TestChecker(TestCase):
         self.assertFalse(is_triggered)
         self.assertListEqual(anomaly_timestamps, [])
 
+    def test_prefetch_check_results(self):
+        self.insert_check_result(3)
+        expected = AnomalyChecker(POINT, STRATEGY, 1).check_anomaly()
+
+        previous_point = copy.deepcopy(POINT)
+        previous_point["data"]["time"] = 1569246420
+        previous_point["data"]["record_id"] = "55a76cf628e46c04a052f4e19bdb9dbf.1569246420"
+        checkers = [AnomalyChecker(POINT, STRATEGY, 1), AnomalyChecker(previous_point, STRATEGY, 1)]
+        AnomalyChecker.prefetch_check_results(checkers)
+
+        # 预取后，检测时不再逐个查询检测窗口
+        with mock.patch.object(
+            CHECK_RESULT_CACHE_KEY.client, "zrangebyscore", side_effect=AssertionError("zrangebyscore")
+        ):
+            self.assertEqual(checkers[0].check_anomaly(), expected)
+            # 合并读取的检测窗口，需要按各自的窗口切分
+            self.assertListEqual(
+                [score for _, score in checkers[1].prefetched_check_results["1"]],
+                [1569246240, 1569246300, 1569246360, 1569246420],
+            )
+
     def test_check_anomaly_by_level_no_data(self):
         self.insert_check_result(5)
         strategy = copy.deepcopy(STRATEGY)
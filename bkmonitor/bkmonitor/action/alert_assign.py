@@ -18,7 +18,11 @@ from django.utils.translation import gettext as _
 
 from bkmonitor.documents import AlertDocument, AlertLog
 from bkmonitor.utils.common_utils import count_md5
-from bkmonitor.utils.range import load_condition_instance
+from bkmonitor.utils.range import (
+    DIMENSION_FIELD_CLASS_MAP,
+    load_compiled_condition_instance,
+)
+from bkmonitor.utils.range.fields import DimensionField
 from constants.action import ActionPluginType, AssignMode, UserGroupType
 from constants.alert import EVENT_SEVERITY_DICT
 from core.drf_resource import api
@@ -86,21 +90,30 @@ class AssignRuleMatch:
         self.parse_dimension_conditions()
         self.alert = alert
 
-    def parse_dimension_conditions(self):
+    @staticmethod
+    def split_conditions(conditions):
         """
-        根据配置的条件信息获取
-        :return:
+        将规则条件按 or 拆分为多组 and 条件
         """
         or_cond = []
         and_cond = []
-        for condition in self.assign_rule["conditions"]:
+        for condition in conditions:
             if condition.get("condition") == "or" and and_cond:
                 or_cond.append(and_cond)
                 and_cond = []
             and_cond.append(condition)
         if and_cond:
             or_cond.append(and_cond)
-        self.dimension_check = load_condition_instance(or_cond, False)
+        return or_cond
+
+    def parse_dimension_conditions(self):
+        """
+        根据配置的条件信息获取
+        :return:
+        """
+        or_cond = self.split_conditions(self.assign_rule["conditions"])
+        # 同一规则配置只编译一次，在多个告警间复用
+        self.dimension_check = load_compiled_condition_instance(or_cond, False)
 
     def assign_group(self):
         return {"group_id": self.assign_rule["assign_group_id"]}
@@ -251,6 +264,85 @@ class AssignRuleMatch:
         return self.assign_rule.get("user_type", UserGroupType.MAIN)
 
 
+class AssignRuleIndex:
+    """
+    分派规则索引
+    按规则中的等值(eq)条件建立 维度值 -> 规则 的倒排索引，告警匹配前先通过索引缩小候选规则范围，再对候选规则做完整的条件匹配。
+    规则的每个 or 分支都包含可索引的等值条件时才进入索引，否则作为每次都需要匹配的规则
+    """
+
+    def __init__(self, priority_rules: List[list]):
+        """
+        :param priority_rules: 按优先级从高到低排列的规则列表 [[rule, ...], ...]
+        """
+        self.priority_rules = priority_rules
+        self.priority_indexes = [self.build_index(rules) for rules in priority_rules]
+
+    @staticmethod
+    def get_index_condition(and_conditions):
+        """
+        从一组 and 条件中选取一个可索引的等值条件
+        特殊维度(如 ip、拓扑节点)的取值及比较方式与普通维度不同，不参与索引
+        """
+        for condition in and_conditions:
+            field = condition.get("field")
+            value = condition.get("value")
+            if condition.get("method") != "eq" or not field or not value or field in DIMENSION_FIELD_CLASS_MAP:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            if any(isinstance(v, (dict, list, tuple)) for v in values):
+                continue
+            return field, {DimensionField.strip_str(v) for v in values}
+        return None
+
+    @classmethod
+    def build_index(cls, rules):
+        full_match_positions = []
+        value_index = defaultdict(lambda: defaultdict(set))
+        rule_positions = {}
+        for position, rule in enumerate(rules):
+            rule_positions[str(rule.get("id", ""))] = position
+            index_conditions = [
+                cls.get_index_condition(and_conditions)
+                for and_conditions in AssignRuleMatch.split_conditions(rule["conditions"])
+            ]
+            if not index_conditions or None in index_conditions:
+                # 存在无法索引的分支，该规则每次都需要完整匹配
+                full_match_positions.append(position)
+                continue
+            for field, values in index_conditions:
+                for value in values:
+                    value_index[field][value].add(position)
+        return {
+            "full_match": full_match_positions,
+            "values": {field: dict(index) for field, index in value_index.items()},
+            "rule_positions": rule_positions,
+        }
+
+    def get_candidate_rules(self, priority_index: dict, rules: list, dimensions: dict, rule_snaps=None):
+        """
+        获取单个优先级下的候选规则，保持规则原有顺序
+        :param rule_snaps: 告警已适配的规则快照，规则未变化时无需匹配条件即视为适配，需要一并作为候选
+        """
+        positions = set(priority_index["full_match"])
+        for field, index in priority_index["values"].items():
+            if field not in dimensions:
+                continue
+            for value in DimensionField(field, dimensions[field]).to_str_list():
+                positions.update(index.get(value, ()))
+        for rule_id in rule_snaps or {}:
+            if rule_id in priority_index["rule_positions"]:
+                positions.add(priority_index["rule_positions"][rule_id])
+        return [rules[position] for position in sorted(positions)]
+
+    def iter_candidate_rules(self, dimensions: dict, rule_snaps=None):
+        """
+        按优先级从高到低返回各优先级下的候选规则
+        """
+        for rules, priority_index in zip(self.priority_rules, self.priority_indexes):
+            yield self.get_candidate_rules(priority_index, rules, dimensions, rule_snaps)
+
+
 class AlertMatchContext:
     """告警条件匹配上下文，不包含分派规则或分派结果。"""
 
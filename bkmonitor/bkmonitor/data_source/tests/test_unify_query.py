@@ -227,6 +227,40 @@ class TestUnifyQuery:
 
         assert series_stat == {(((), "_result_")): {"count": [0, 1]}}
 
+    def test_process_unify_query_data(self):
+        data = {
+            "series": [
+                {
+                    "columns": ["_time", "_value", "bk_target_ip"],
+                    "types": ["time", "double", "string"],
+                    "group_keys": ["bk_target_ip_table0"],
+                    "group_values": ["127.0.1.10"],
+                    "values": [
+                        [1657848000, 12.5, "127.0.1.11"],
+                        [1657848060.0, 13.1, "127.0.1.12"],
+                        [1657848120, 13.5, "127.0.1.13"],
+                    ],
+                },
+                {
+                    "columns": ["_time", "a"],
+                    "types": ["float", "float"],
+                    "group_keys": [],
+                    "group_values": [],
+                    "values": [[1657848000000, 1]],
+                },
+            ]
+        }
+
+        records = UnifyQuery.process_unify_query_data(
+            {"query_list": [{"reference_name": "a"}]}, data, end_time=1657848120000
+        )
+
+        assert records == [
+            {"bk_target_ip": "127.0.1.11", "_time_": 1657848000000, "_result_": 12.5},
+            {"bk_target_ip": "127.0.1.12", "_time_": 1657848060000, "_result_": 13.1},
+            {"_time_": 1657848000000, "a": 1, "_result_": 1},
+        ]
+
     def test_query_data_with_stat_returns_series_stat_for_datasource_query(self, mocker, mock_query_metrics):
         query = build_unify_query()
         mocker.patch.object(query, "process_data_sources")
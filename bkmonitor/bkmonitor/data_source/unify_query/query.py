@@ -174,34 +174,67 @@ class UnifyQuery:
         """
         records = []
 
+        # 非 instant 查询需要剔除时间戳等于结束时间的数据
+        excluded_time = end_time if end_time and not params.get("instant") else None
+
         rows = data.get("series") or []
         for row in rows:
             dimensions = cls.extract_unify_query_series_dimensions(row)
+            # 列名映射及时间列在每个 series 内只解析一次，避免逐个数据点重复判断
+            columns, time_indexes = cls.resolve_unify_query_series_columns(row)
 
             for value in row["values"]:
-                record = {**dimensions}
-                for column, column_type, v in zip(row["columns"], row["types"], value):
-                    if column_type == "time":
-                        v = arrow.get(v).timestamp * 1000
-
-                    if column == "_time":
-                        column = "_time_"
-                    elif column in ["_result", "_value"]:
-                        column = "_result_"
+                if time_indexes:
+                    value = list(value)
+                    for index in time_indexes:
+                        if index < len(value):
+                            value[index] = cls.convert_unify_query_time(value[index])
 
-                    record[column] = v
+                record = dimensions.copy()
+                record.update(zip(columns, value))
 
                 # 单指标情况下避免缺少_result_字段
                 if "_result_" not in record:
                     record["_result_"] = record[params["query_list"][0]["reference_name"]]
 
                 # 如果是最后一条数据，且时间戳等于结束时间，不返回
-                if not params.get("instant") and end_time and record.get("_time_") == end_time:
+                if excluded_time and record.get("_time_") == excluded_time:
                     continue
 
                 records.append(record)
         return records
 
+    @classmethod
+    def resolve_unify_query_series_columns(cls, row: dict[str, Any]) -> tuple[list[str], list[int]]:
+        """
+        解析 series 的列定义
+
+        返回：
+            - 输出字段名列表：_time 转换为 _time_，_result/_value 转换为 _result_
+            - 需要转换为毫秒时间戳的列下标（类型为 time 的列）
+        """
+        columns = []
+        time_indexes = []
+        for index, (column, column_type) in enumerate(zip(row["columns"], row["types"])):
+            if column_type == "time":
+                time_indexes.append(index)
+
+            if column == "_time":
+                column = "_time_"
+            elif column in ["_result", "_value"]:
+                column = "_result_"
+            columns.append(column)
+        return columns, time_indexes
+
+    @staticmethod
+    def convert_unify_query_time(value: Any) -> int:
+        """
+        time 类型的值转换为毫秒时间戳，整数秒级时间戳直接计算，其他格式交由 arrow 解析
+        """
+        if type(value) is int:
+            return value * 1000
+        return arrow.get(value).timestamp * 1000
+
     @classmethod
     def extract_unify_query_series_dimensions(cls, row: dict[str, Any]) -> dict[str, Any]:
         """
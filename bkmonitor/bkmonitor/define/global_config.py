@@ -180,6 +180,9 @@ ADVANCED_OPTIONS = OrderedDict(
         ("FETCH_TIME_SERIES_METRIC_INTERVAL_SECONDS", slz.IntegerField(label="获取自定义指标的间隔时间", default=7200)),
         ("ENABLE_BKDATA_METRIC_CACHE", slz.BooleanField(label="是否开启数据平台指标缓存", default=True)),
         ("ENABLE_CONSUL_LITE_MODE", slz.BooleanField(label="是否开启Consul Lite模式", default=False)),
+        ("ENABLE_CONSUL_BULK_SYNC", slz.BooleanField(label="数据源Consul配置是否批量同步", default=False)),
+        ("ENABLE_SPACE_ROUTER_DIFF_PUSH", slz.BooleanField(label="空间路由是否只推送有变化的内容", default=False)),
+        ("ENABLE_SPACE_ROUTER_INCREMENTAL_PUSH", slz.BooleanField(label="是否开启空间路由增量推送", default=False)),
         (
             "TRANSLATE_SNMP_TRAP_DIMENSIONS",
             slz.BooleanField(label="是否翻译snmp trap的oid维度", default=settings.TRANSLATE_SNMP_TRAP_DIMENSIONS),
@@ -318,6 +321,7 @@ ADVANCED_OPTIONS = OrderedDict(
         ("ACCESS_LATENCY_THRESHOLD_CONSTANT", slz.IntegerField(label="access数据源延迟上报常量阈值", default=180)),
         ("ACCESS_DETECT_MERGE_STRATEGY_IDS", slz.ListField(label="access合并detect策略列表", default=[])),
         ("ENABLE_DETECT_INLINE_TRIGGER", slz.BooleanField(label="Detect完成后是否同步执行Trigger", default=False)),
+        ("ENABLE_DETECT_BATCH_MODE", slz.BooleanField(label="是否开启批量检测模式", default=False)),
         ("KAFKA_AUTO_COMMIT", slz.BooleanField(label="kafka是否自动提交", default=True)),
         ("MAX_BUILD_EVENT_NUMBER", slz.IntegerField(label="单次告警生成任务处理的event数量", default=0)),
         ("HOST_DYNAMIC_FIELDS", slz.ListField(label="主机动态属性", default=[])),
@@ -438,6 +442,26 @@ ADVANCED_OPTIONS = OrderedDict(
             slz.IntegerField(label="access数据批量处理触发阈值(0为不触发)", default=0),
         ),
         ("ACCESS_DATA_BATCH_PROCESS_SIZE", slz.IntegerField(label="access数据批量处理单次处理量", default=50000)),
+        (
+            "ACCESS_DATA_STREAM_PROCESS_ENABLED",
+            slz.BooleanField(label="access数据批量处理是否在当前进程内流式处理", default=False),
+        ),
+        (
+            "ALARM_QUEUE_CODEC",
+            slz.ChoiceField(
+                label="告警服务间队列写入编码",
+                default="json",
+                choices=(("json", "json"), ("ujson", "ujson"), ("orjson", "orjson")),
+            ),
+        ),
+        (
+            "STRATEGY_CACHE_INCREMENTAL_REFRESH",
+            slz.BooleanField(label="策略缓存全量刷新是否差量写入", default=False),
+        ),
+        (
+            "ALERT_ES_WRITE_COALESCE_ENABLED",
+            slz.BooleanField(label="告警流水ES写入是否合并刷写", default=False),
+        ),
         ("BASE64_ENCODE_TRIGGER_CHARS", slz.ListField(label="需要base64编码的特殊字符", default=[])),
         ("AIDEV_KNOWLEDGE_BASE_IDS", slz.ListField(label="aidev的知识库ID", default=[])),
         ("AIDEV_AGENT_AI_GENERATING_KEYWORD", slz.CharField(label="AIAgent内容生成关键字", default="生成中")),
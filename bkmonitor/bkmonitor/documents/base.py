@@ -8,16 +8,27 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
 import arrow
+from celery.signals import worker_process_shutdown
 from django.conf import settings
 from django.db import models
 from django_elasticsearch_dsl import Document
+from elasticsearch.helpers import BulkIndexError
 from elasticsearch_dsl import Date as BaseDate
 from elasticsearch_dsl import MetaField
 from elasticsearch_dsl import field as dsl_field
 
 from bkmonitor.utils.elasticsearch.ilm import ILM
 
+logger = logging.getLogger("bkmonitor.documents")
+
 
 class BulkActionType:
     CREATE = "create"
@@ -189,11 +200,27 @@ class BaseDocument(Document):
         actions = []
         for doc in documents:
             actions.append(doc.prepare_action(action, skip_empty=skip_empty))
+        return cls.bulk_actions(actions, parallel=parallel, **kwargs)
+
+    @classmethod
+    def bulk_actions(cls, actions, parallel=False, **kwargs):
         params = dict(actions=actions, request_timeout=cls.ES_REQUEST_TIMEOUT, **kwargs)
         if parallel:
             return cls().parallel_bulk(**params)
         return cls().bulk(max_retries=cls.ES_BULK_MAX_RETRIES, **params)
 
+    @classmethod
+    def get_write_coalescer(cls) -> "BulkWriteCoalescer":
+        return get_write_coalescer(cls)
+
+    @classmethod
+    def bulk_create_coalesced(cls, documents, action=BulkActionType.CREATE, skip_empty: bool = True):
+        """
+        通过合并器批量写入，仅适用于流水等只追加的文档
+        """
+        actions = [doc.prepare_action(action, skip_empty=skip_empty) for doc in documents]
+        return cls.get_write_coalescer().write(actions)
+
     @classmethod
     def get_lifecycle_manager(cls):
         return ILM(
@@ -263,3 +290,220 @@ class Flattened(dsl_field.Field):
     """
 
     name = "flattened"
+
+
+class BulkWriteCoalescer:
+    """
+    ES 批量写入合并器
+    跨批次缓存同一索引的写入动作，由后台线程按数量(batch_size)或等待时间(flush_interval)合并刷写。
+    缓存中的动作在调用方的锁之外异步写入，因此只接受流水等只追加的全量写入(create/index)，
+    告警等带状态的文档不能使用，否则延迟刷写的旧数据会覆盖其他进程已写入的新状态。
+    缓存数量达到 max_backlog 时，由写入方同步刷写，避免缓存无限增长。
+    """
+
+    APPEND_ONLY_OP_TYPES = (BulkActionType.CREATE, BulkActionType.INDEX)
+
+    def __init__(self, document_cls, batch_size=None, flush_interval=None, max_backlog=None):
+        self.document_cls = document_cls
+        self.batch_size = batch_size or getattr(settings, "ES_WRITE_COALESCE_BATCH_SIZE", 500)
+        self.flush_interval = flush_interval or getattr(settings, "ES_WRITE_COALESCE_FLUSH_INTERVAL", 1)
+        self.max_backlog = max_backlog or getattr(settings, "ES_WRITE_COALESCE_MAX_BACKLOG", 10000)
+
+        # 有 _id 的动作按 (索引, _id) 去重，以最新的为准；没有 _id 的动作使用自增序号
+        self._actions = OrderedDict()
+        self._sequence = 0
+        self._first_action_time = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+
+    @property
+    def index_name(self):
+        return self.document_cls.Index.name
+
+    @property
+    def backlog(self):
+        return len(self._actions)
+
+    def get_action_key(self, action):
+        if action.get("_id") is None:
+            self._sequence += 1
+            return None, self._sequence
+        return action["_index"], action["_id"]
+
+    def _pop_actions(self, limit=None):
+        if limit is None or limit >= len(self._actions):
+            actions = list(self._actions.values())
+            self._actions.clear()
+        else:
+            actions = [self._actions.popitem(last=False)[1] for _ in range(limit)]
+        if not self._actions:
+            self._first_action_time = None
+        return actions
+
+    def write(self, actions):
+        """
+        写入动作
+        :param actions: prepare_action 生成的动作列表，仅支持 create / index
+        """
+        if not actions:
+            return
+
+        for action in actions:
+            if action["_op_type"] not in self.APPEND_ONLY_OP_TYPES:
+                raise ValueError(f"write coalescer only supports append-only actions, got: {action['_op_type']}")
+
+        with self._condition:
+            stopped = self._stopped
+            if not stopped:
+                self._ensure_worker()
+                if self._first_action_time is None:
+                    self._first_action_time = time.time()
+                for action in actions:
+                    self._actions[self.get_action_key(action)] = action
+                backlog = self.backlog
+                if backlog >= self.batch_size:
+                    self._condition.notify()
+
+        if stopped:
+            # 进程退出中，后台线程已停止，直接写入
+            self.document_cls.bulk_actions(actions)
+            return
+
+        self._report_backlog()
+        if backlog >= self.max_backlog:
+            # 缓存积压，由写入方同步刷写，对上游形成反压
+            self.flush(trigger="backlog")
+
+    def flush(self, trigger="manual", limit=None):
+        """
+        刷写缓存的动作，写入失败的动作记录日志后丢弃
+        :return: 刷写的动作数量
+        """
+        with self._flush_lock:
+            with self._condition:
+                actions = self._pop_actions(limit)
+            self._report_backlog()
+
+            for index in range(0, len(actions), self.batch_size):
+                chunk = actions[index : index + self.batch_size]
+                start_time = time.time()
+                failed_count = 0
+                try:
+                    self.document_cls.bulk_actions(chunk)
+                except BulkIndexError as e:
+                    failed_count = len(e.errors)
+                    logger.error("[es write coalescer] index(%s) flush error: %s", self.index_name, e.errors)
+                except Exception as e:
+                    failed_count = len(chunk)
+                    logger.exception("[es write coalescer] index(%s) flush failed: %s", self.index_name, e)
+
+                cost = time.time() - start_time
+                self._report_flush(trigger, len(chunk) - failed_count, "success", cost)
+                if failed_count:
+                    self._report_flush(trigger, failed_count, "failed")
+                logger.info(
+                    "[es write coalescer] index(%s) trigger(%s): saved(%d), failed(%d), cost: %.3f",
+                    self.index_name,
+                    trigger,
+                    len(chunk) - failed_count,
+                    failed_count,
+                    cost,
+                )
+        return len(actions)
+
+    def stop(self, timeout=None):
+        """
+        停止后台线程并刷写剩余的缓存，之后的写入直接同步写入
+        :return: 刷写的动作数量
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        return self.flush(trigger="exit")
+
+    def _should_flush(self):
+        if not self._actions:
+            return False
+        return self.backlog >= self.batch_size or time.time() - self._first_action_time >= self.flush_interval
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name=f"es-write-coalescer-{self.index_name}", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._should_flush():
+                    timeout = None
+                    if self._first_action_time is not None:
+                        timeout = max(self._first_action_time + self.flush_interval - time.time(), 0.01)
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    # 剩余的缓存由 stop 刷写
+                    return
+                trigger = "size" if self.backlog >= self.batch_size else "age"
+            try:
+                self.flush(trigger=trigger, limit=self.batch_size)
+            except Exception as e:  # pragma: no cover
+                logger.exception("[es write coalescer] index(%s) worker error: %s", self.index_name, e)
+
+    def _report_backlog(self):
+        from core.prometheus import metrics
+
+        metrics.ES_WRITE_COALESCE_BACKLOG.labels(index=self.index_name).set(self.backlog)
+
+    def _report_flush(self, trigger, count, status, cost=None):
+        from core.prometheus import metrics
+
+        if cost is not None:
+            metrics.ES_WRITE_COALESCE_FLUSH_TIME.labels(index=self.index_name, trigger=trigger).observe(cost)
+        metrics.ES_WRITE_COALESCE_FLUSH_COUNT.labels(index=self.index_name, status=status).inc(count)
+
+
+_write_coalescers = {}
+_write_coalescers_lock = threading.Lock()
+
+
+def get_write_coalescer(document_cls) -> BulkWriteCoalescer:
+    """
+    获取文档对应的写入合并器，每个进程每个文档类一个
+    """
+    coalescer = _write_coalescers.get(document_cls)
+    if coalescer is not None:
+        return coalescer
+    with _write_coalescers_lock:
+        if document_cls not in _write_coalescers:
+            _write_coalescers[document_cls] = BulkWriteCoalescer(document_cls)
+        return _write_coalescers[document_cls]
+
+
+def flush_write_coalescers(**kwargs):
+    """
+    停止当前进程所有合并器并刷写缓存
+    """
+    for coalescer in list(_write_coalescers.values()):
+        try:
+            coalescer.stop(timeout=coalescer.flush_interval)
+        except Exception as e:  # pragma: no cover
+            logger.exception("[es write coalescer] index(%s) flush on exit failed: %s", coalescer.index_name, e)
+
+
+def _reset_write_coalescers():
+    # fork 出的子进程不继承父进程的缓存及锁状态，避免重复写入或死锁
+    global _write_coalescers_lock
+    _write_coalescers.clear()
+    _write_coalescers_lock = threading.Lock()
+
+
+# celery prefork 子进程通过 os._exit 退出，不会执行 atexit，需要在 worker_process_shutdown 信号中刷写
+worker_process_shutdown.connect(flush_write_coalescers, weak=False)
+atexit.register(flush_write_coalescers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_write_coalescers)
@@ -214,7 +214,7 @@ def refresh_strategy_cache_on_issue_config_change(sender, instance, **kwargs):
             if cfg
             else None
         )
-        StrategyCacheManager.cache.set(cache_key, json.dumps(strategy_dict), StrategyCacheManager.CACHE_TIMEOUT)
+        StrategyCacheManager.set_strategy_cache(strategy_id, strategy_dict)
     except Exception:
         pass
 
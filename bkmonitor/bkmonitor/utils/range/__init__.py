@@ -8,12 +8,17 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+import copy
+import threading
+from collections import OrderedDict
+
 from constants.common import DutyType
 
 from . import conditions, fields, period
 
 __all__ = [
     "load_condition_instance",
+    "load_compiled_condition_instance",
     "TIME_MATCH_CLASS_MAP",
     "load_field_instance",
     "load_agg_condition_instance",
@@ -24,6 +29,9 @@ __all__ = [
 SUPPORT_SIMPLE_METHODS = ("include", "exclude", "gt", "gte", "lt", "lte", "eq", "neq", "reg", "nreg")
 SUPPORT_COMPOSITE_METHODS = ("or", "and")
 
+# 编译后条件对象的进程内缓存大小
+COMPILED_CONDITION_CACHE_SIZE = 4096
+
 CONDITION_CLASS_MAP = {
     "eq": conditions.EqualCondition,
     "neq": conditions.NotEqualCondition,
@@ -121,4 +129,51 @@ def load_condition_instance(conditions_config, default_value_if_not_exists=True)
             and_cond_obj.add(cond_obj)
 
         or_cond_obj.add(and_cond_obj)
-    return or_cond_obj
+    return or_cond_obj.optimize()
+
+
+class CompiledConditionCache:
+    """
+    编译后条件对象的 LRU 缓存
+    条件对象构建后只读，条件值的标准化结果及正则在首次匹配时缓存在对象上，相同配置的条件可在多次匹配间复用
+    """
+
+    def __init__(self, max_size=COMPILED_CONDITION_CACHE_SIZE):
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conditions_config, default_value_if_not_exists=True):
+        # 配置中的值均为基础类型，repr 可以唯一标识配置内容，开销远小于 json 序列化
+        cache_key = (default_value_if_not_exists, repr(conditions_config))
+        with self._lock:
+            condition = self._cache.get(cache_key)
+            if condition is not None:
+                self._cache.move_to_end(cache_key)
+                return condition
+
+        # 深拷贝配置，避免调用方原地修改配置影响已缓存的条件对象
+        condition = load_condition_instance(copy.deepcopy(conditions_config), default_value_if_not_exists)
+        with self._lock:
+            self._cache[cache_key] = condition
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return condition
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+compiled_condition_cache = CompiledConditionCache()
+
+
+def load_compiled_condition_instance(conditions_config, default_value_if_not_exists=True):
+    """
+    获取编译后的条件对象，相同配置只构建一次
+    适用于同一批规则需要匹配大量数据的场景(如分派规则、订阅规则、策略过滤条件)
+    :param conditions_config:
+            [[{"field":"ip", "method":"eq", "value":"111"}, {}], []]
+    :return: condition object
+    """
+    return compiled_condition_cache.get(conditions_config, default_value_if_not_exists)
@@ -9,16 +9,36 @@ specific language governing permissions and limitations under the License.
 """
 
 import re
-import sre_constants
+from functools import cached_property, lru_cache
+
+# 进程内正则编译缓存大小，re 模块自带缓存仅 512 条，规则较多时会频繁失效
+REGEX_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(pattern):
+    """
+    编译正则表达式，非法的表达式返回 None
+    """
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
 
 
 class Condition:
+    # 条件匹配开销，组合条件按开销从低到高执行，以便尽早短路
+    cost = 1
+
     def is_match(self, data):
         raise NotImplementedError("You should implement this.")
 
 
 class SimpleCondition(Condition):
-    """eq / gt / lt / reg ..."""
+    """eq / gt / lt / reg ...
+
+    条件值在首次匹配时完成标准化并缓存，条件对象构建后可在多次匹配间复用
+    """
 
     def __init__(self, cond_field, default_value_if_not_exists=False):
         self.cond_field = cond_field
@@ -40,6 +60,18 @@ class SimpleCondition(Condition):
             return True, self.cond_field.__class__(self.cond_field.name, data_value)
         return False, None
 
+    @cached_property
+    def cond_str_list(self):
+        return self.cond_field.to_str_list()
+
+    @cached_property
+    def cond_str_set(self):
+        return frozenset(self.cond_str_list)
+
+    @cached_property
+    def cond_float_list(self):
+        return self.cond_field.to_float_list()
+
 
 class CompositeCondition(Condition):
     """AND / OR"""
@@ -50,12 +82,26 @@ class CompositeCondition(Condition):
     def is_match(self, data):
         raise NotImplementedError("You should inherit me and implement this.")
 
+    @property
+    def cost(self):
+        return sum(cond.cost for cond in self.conditions)
+
     def add(self, condition):
         self.conditions.append(condition)
 
     def remove(self, condition):
         self.conditions.remove(condition)
 
+    def optimize(self):
+        """
+        按开销从低到高对子条件排序(稳定排序，同开销保持配置顺序)，子条件均无副作用，排序不影响匹配结果
+        """
+        for cond in self.conditions:
+            if isinstance(cond, CompositeCondition):
+                cond.optimize()
+        self.conditions.sort(key=lambda cond: cond.cost)
+        return self
+
 
 class OrCondition(CompositeCondition):
     def is_match(self, data):
@@ -81,9 +127,7 @@ class AndCondition(CompositeCondition):
 
 class EqualCondition(SimpleCondition):
     def _is_match(self, data_field):
-        data_value = data_field.to_str_list()
-        cond_value = self.cond_field.to_str_list()
-        return bool(set(data_value) & set(cond_value))
+        return not self.cond_str_set.isdisjoint(data_field.to_str_list())
 
 
 class NotEqualCondition(EqualCondition):
@@ -92,13 +136,15 @@ class NotEqualCondition(EqualCondition):
 
 
 class IncludeCondition(SimpleCondition):
+    cost = 2
+
     def _is_match(self, data_field):
         data_value_list = data_field.to_str_list()
         if not data_value_list:
             return False
         # 这里data_value 匹配一个即可
+        cond_value = self.cond_str_list
         for data_value in data_value_list:
-            cond_value = self.cond_field.to_str_list()
             for v in cond_value:
                 if v in data_value:
                     return True
@@ -111,10 +157,13 @@ class ExcludeCondition(IncludeCondition):
 
 
 class GreaterCondition(SimpleCondition):
+    @cached_property
+    def cond_max_value(self):
+        return max(self.cond_float_list)
+
     def _is_match(self, data_field):
         data_value = min(data_field.to_float_list())
-        cond_value = max(self.cond_field.to_float_list())
-        return data_value > cond_value
+        return data_value > self.cond_max_value
 
 
 class LesserOrEqualCondition(GreaterCondition):
@@ -123,10 +172,13 @@ class LesserOrEqualCondition(GreaterCondition):
 
 
 class LesserCondition(SimpleCondition):
+    @cached_property
+    def cond_min_value(self):
+        return min(self.cond_float_list)
+
     def _is_match(self, data_field):
         data_value = max(data_field.to_float_list())
-        cond_value = min(self.cond_field.to_float_list())
-        return data_value < cond_value
+        return data_value < self.cond_min_value
 
 
 class GreaterOrEqualCondition(LesserCondition):
@@ -135,19 +187,29 @@ class GreaterOrEqualCondition(LesserCondition):
 
 
 class RegularCondition(SimpleCondition):
+    cost = 3
+
+    @cached_property
+    def cond_regex_list(self):
+        # 遇到非法表达式时截断，与逐个编译时遇到非法表达式即返回不匹配的行为保持一致
+        regex_list = []
+        for v in self.cond_str_list:
+            reg = compile_regex(v)
+            regex_list.append(reg)
+            if reg is None:
+                break
+        return regex_list
+
     def _is_match(self, data_field):
         data_value = data_field.to_str_list()
         if not data_value:
             return False
         data_value = data_value[0]
-        cond_value = self.cond_field.to_str_list()
-        for v in cond_value:
-            try:
-                reg = re.compile(rf"{v}")
-            except sre_constants.error:
+        for reg in self.cond_regex_list:
+            if reg is None:
                 return False
 
-            if reg.findall(data_value):
+            if reg.search(data_value):
                 return True
         return False
 
@@ -160,5 +222,4 @@ class NotRegularCondition(RegularCondition):
 class IsSuperSetCondition(SimpleCondition):
     def _is_match(self, data_field):
         data_value = data_field.to_str_list()
-        cond_value = self.cond_field.to_str_list()
-        return set(data_value).issuperset(set(cond_value))
+        return self.cond_str_set.issubset(data_value)
@@ -811,6 +811,9 @@ ACCESS_DETECT_MERGE_STRATEGY_IDS = []
 # Detect 完成后是否同步执行 Trigger；Access-Detect 合并路径共用此开关
 ENABLE_DETECT_INLINE_TRIGGER = False
 
+# 是否开启批量检测模式(静态阈值、简易环比/同比算法按 item 批量检测)
+ENABLE_DETECT_BATCH_MODE = False
+
 # kafka是否自动提交配置
 KAFKA_AUTO_COMMIT = True
 
@@ -1545,6 +1548,12 @@ ALARM_BACKEND_CLUSTER_ROUTING_RULES = []
 
 # 是否开启Consul Lite 模式，精简非必要字段
 ENABLE_CONSUL_LITE_MODE = False
+# 数据源 consul 配置全量刷新时是否批量同步：按前缀一次读取，只通过事务写入有变化的配置
+ENABLE_CONSUL_BULK_SYNC = False
+# 空间路由推送前与 redis 中已有内容比较，只写入及发布有变化的 field
+ENABLE_SPACE_ROUTER_DIFF_PUSH = False
+# 是否开启空间路由增量推送：周期性地只刷新变更结果表涉及的空间、data_label 及结果表详情
+ENABLE_SPACE_ROUTER_INCREMENTAL_PUSH = False
 
 # AI小鲸灰度业务名单
 AI_BIZ_LIST = []
@@ -1766,6 +1775,18 @@ SYNC_BKBASE_META_SUPPORTED_STORAGE_TYPES = ["mysql", "tspider", "hdfs"]
 # access数据批量处理
 ACCESS_DATA_BATCH_PROCESS_SIZE = 50000
 ACCESS_DATA_BATCH_PROCESS_THRESHOLD = 0
+# access数据超过批量处理阈值时，是否在当前进程内逐批流式处理（不下发异步批量任务）
+ACCESS_DATA_STREAM_PROCESS_ENABLED = False
+# 告警服务间 redis 队列写入编码(json/ujson/orjson)，读取时兼容所有编码，切换前需保证所有消费端已升级
+ALARM_QUEUE_CODEC = "json"
+# 策略缓存全量刷新时是否按内容差量写入，只重写发生变化的策略及分组
+STRATEGY_CACHE_INCREMENTAL_REFRESH = False
+# 告警流水 ES 写入是否合并：流水只追加写入，由后台线程跨批次合并刷写；告警文档带有状态，始终在锁内同步写入
+ALERT_ES_WRITE_COALESCE_ENABLED = False
+# ES 合并写入的单次刷写数量、最长等待时间(秒)及最大积压数量
+ES_WRITE_COALESCE_BATCH_SIZE = 500
+ES_WRITE_COALESCE_FLUSH_INTERVAL = 1
+ES_WRITE_COALESCE_MAX_BACKLOG = 10000
 
 # metadata请求es超时配置, 单位为秒，默认10秒
 # 格式: {default: 10, 集群域名: 20}
@@ -189,6 +189,8 @@ DEFAULT_CRONTAB = [
     ("apm.task.tasks.bmw_task_cron", "*/15 * * * *", "global"),
     # metadata 更新 bkcc 空间名称任务，因为不要求实时性，每6分钟执行一次
     ("metadata.task.sync_space.refresh_bkcc_space_name", "*/6 * * * *", "global"),
+    # metadata 增量推送变更结果表涉及的空间路由，未开启时任务直接返回
+    ("metadata.task.sync_space.push_changed_space_router", "* * * * *", "global"),
     # metadata 全量刷新 ResourceDefinition/RelationDefinition 到 Redis 兜底任务，每10分钟一次
     ("metadata.task.entity_relation.refresh_entity_definition_to_redis", "*/10 * * * *", "global"),
     # rum k8s 批量配置下发: 每5分钟触发，获取全部数据进行批量调度
@@ -573,6 +575,8 @@ BIZ_WHITE_LIST_FOR_3RD_EVENT = []
 MAX_METRICS_FETCH_STEP = os.environ.get("MAX_METRICS_FETCH_STEP", 500)
 METRICS_KEY_PREFIX = "bkmonitor:metrics_"
 METRIC_DIMENSIONS_KEY_PREFIX = "bkmonitor:metric_dimensions_"
+# 自定义指标刷新时并发处理的分组数量
+TIME_SERIES_METRIC_UPDATE_CONCURRENCY = os.environ.get("TIME_SERIES_METRIC_UPDATE_CONCURRENCY", 4)
 
 # 默认 Kafka 存储集群 ID
 DEFAULT_KAFKA_STORAGE_CLUSTER_ID = None
@@ -357,6 +357,45 @@ ALERT_PROCESS_PUSH_DATA_COUNT = Counter(
     labelnames=("bk_data_id", "topic", "strategy_id", "is_saved"),
 )
 
+ALERT_PROCESS_LOCK_WAIT_TIME = Histogram(
+    name="bkmonitor_alert_process_lock_wait_time",
+    documentation="alert(builder) 模块事件从首次加锁到加锁成功(locked)或延后重新入队(deferred)的等待时间",
+    labelnames=("status",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, INF),
+)
+
+SERVICE_LOCK_ACQUIRE_TIME = Histogram(
+    name="bkmonitor_service_lock_acquire_time",
+    documentation="批量服务锁加锁耗时",
+    labelnames=("lock",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, INF),
+)
+
+SERVICE_LOCK_KEY_COUNT = Counter(
+    name="bkmonitor_service_lock_key_count",
+    documentation="批量服务锁加锁 key 数量",
+    labelnames=("lock", "status"),
+)
+
+ES_WRITE_COALESCE_FLUSH_TIME = Histogram(
+    name="bkmonitor_es_write_coalesce_flush_time",
+    documentation="ES 合并写入单次刷写耗时",
+    labelnames=("index", "trigger"),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, INF),
+)
+
+ES_WRITE_COALESCE_FLUSH_COUNT = Counter(
+    name="bkmonitor_es_write_coalesce_flush_count",
+    documentation="ES 合并写入刷写文档数量",
+    labelnames=("index", "status"),
+)
+
+ES_WRITE_COALESCE_BACKLOG = Gauge(
+    name="bkmonitor_es_write_coalesce_backlog",
+    documentation="ES 合并写入待刷写文档数量",
+    labelnames=("index",),
+)
+
 PROCESS_BIG_LATENCY = Histogram(
     name="bkmonitor_big_process_latency",
     documentation="处理延迟过大",
@@ -656,6 +695,19 @@ CONVERGE_PUSH_ACTION_COUNT = Counter(
     labelnames=("bk_biz_id", "plugin_type", "strategy_id", "signal"),
 )
 
+CONVERGE_SHIELD_MATCH_COUNT = Counter(
+    name="bkmonitor_converge_shield_match_count",
+    documentation="告警屏蔽配置匹配次数",
+    labelnames=("bk_biz_id", "status"),
+)
+
+CONVERGE_SHIELD_CANDIDATE_COUNT = Histogram(
+    name="bkmonitor_converge_shield_candidate_count",
+    documentation="告警屏蔽配置匹配候选数量",
+    labelnames=("bk_biz_id",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, INF),
+)
+
 # assign
 ALERT_ASSIGN_PROCESS_TIME = Histogram(
     name="bkmonitor_alert_assign_process_time",
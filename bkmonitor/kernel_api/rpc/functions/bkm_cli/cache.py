@@ -18,7 +18,6 @@ func_name: bkm_cli.read_cache_key
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -226,11 +225,14 @@ def _safe_decode(value: bytes | str | None) -> str | None:
 
 
 def _try_json(s: str | None) -> Any:
+    # 告警队列的数据可能带有编码版本头，由 codec 去除版本头后解码，没有版本头时按 json 解码
+    from alarm_backends.core.cache import codec as queue_codec
+
     if s is None:
         return None
     try:
-        return json.loads(s)
-    except (json.JSONDecodeError, TypeError):
+        return queue_codec.loads(s)
+    except (ValueError, TypeError):
         return s
 
 
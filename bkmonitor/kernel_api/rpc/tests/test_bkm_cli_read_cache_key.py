@@ -325,6 +325,26 @@ def test_read_cache_key_string(mocker):
     assert result["value"] == {"ts": 1776376740}
 
 
+def test_read_cache_key_string_with_codec_header(mocker):
+    fake = FakeRedisClient()
+    # 告警队列开启紧凑编码后，数据带有编码版本头
+    fake._data["test.checkpoint.group_key_abc"] = b'\x1eu1:{"ts":1776376740}'
+
+    mocker.patch(
+        "kernel_api.rpc.functions.bkm_cli.cache._get_key_obj",
+        return_value=_make_key_obj(fake, "string", "test.checkpoint.{strategy_group_key}"),
+    )
+
+    result = read_cache_key(
+        {
+            "key_name": "STRATEGY_CHECKPOINT_KEY",
+            "params": {"strategy_group_key": "group_key_abc"},
+        }
+    )
+
+    assert result["value"] == {"ts": 1776376740}
+
+
 def test_read_cache_key_resolved_key_in_output(mocker):
     fake = FakeRedisClient()
     mocker.patch(
@@ -344,8 +344,12 @@ class TimeSeriesGroup(CustomGroupBase):
         metric_dict: dict,
         need_create_metrics: set,
         need_update_metrics: set,
+        exist_fields: dict | None = None,
     ):
-        """批量创建或更新字段"""
+        """批量创建或更新字段
+
+        :param exist_fields: 预先加载的结果表已有字段 {field_name: ResultTableField}，为空时从 db 查询
+        """
         logger.info("bulk create or update rt metrics")
         create_records = []
         for metric in need_create_metrics:
@@ -369,16 +373,23 @@ class TimeSeriesGroup(CustomGroupBase):
 
         # 开始批量更新
         update_records = []
-        qs_objs = filter_model_by_in_page(
-            ResultTableField,
-            "field_name__in",
-            need_update_metrics,
-            other_filter={
-                "table_id": table_id,
-                "tag": ResultTableField.FIELD_TAG_METRIC,
-                "bk_tenant_id": self.bk_tenant_id,
-            },
-        )
+        if exist_fields is not None:
+            qs_objs = [
+                exist_fields[field_name]
+                for field_name in need_update_metrics
+                if field_name in exist_fields and exist_fields[field_name].tag == ResultTableField.FIELD_TAG_METRIC
+            ]
+        else:
+            qs_objs = filter_model_by_in_page(
+                ResultTableField,
+                "field_name__in",
+                need_update_metrics,
+                other_filter={
+                    "table_id": table_id,
+                    "tag": ResultTableField.FIELD_TAG_METRIC,
+                    "bk_tenant_id": self.bk_tenant_id,
+                },
+            )
         for obj in qs_objs:
             expect_metric_status = metric_dict.get(obj.field_name, False)
             if obj.is_disabled != expect_metric_status:
@@ -394,8 +405,12 @@ class TimeSeriesGroup(CustomGroupBase):
         need_create_tags: set,
         need_update_tags: set,
         update_description: bool,
+        exist_fields: dict | None = None,
     ):
-        """批量创建或更新 tag"""
+        """批量创建或更新 tag
+
+        :param exist_fields: 预先加载的结果表已有字段 {field_name: ResultTableField}，为空时从 db 查询
+        """
         logger.info("bulk create or update rt tag")
         create_records = []
         for tag in need_create_tags:
@@ -420,20 +435,24 @@ class TimeSeriesGroup(CustomGroupBase):
 
         # 开始批量更新
         update_records = []
-        qs_objs = filter_model_by_in_page(
-            ResultTableField,
-            "field_name__in",
-            need_update_tags,
-            other_filter={
-                "table_id": table_id,
-                "tag__in": [
-                    ResultTableField.FIELD_TAG_DIMENSION,
-                    ResultTableField.FIELD_TAG_TIMESTAMP,
-                    ResultTableField.FIELD_TAG_GROUP,
-                ],
-                "bk_tenant_id": self.bk_tenant_id,
-            },
-        )
+        tag_types = [
+            ResultTableField.FIELD_TAG_DIMENSION,
+            ResultTableField.FIELD_TAG_TIMESTAMP,
+            ResultTableField.FIELD_TAG_GROUP,
+        ]
+        if exist_fields is not None:
+            qs_objs = [
+                exist_fields[field_name]
+                for field_name in need_update_tags
+                if field_name in exist_fields and exist_fields[field_name].tag in tag_types
+            ]
+        else:
+            qs_objs = filter_model_by_in_page(
+                ResultTableField,
+                "field_name__in",
+                need_update_tags,
+                other_filter={"table_id": table_id, "tag__in": tag_types, "bk_tenant_id": self.bk_tenant_id},
+            )
         for obj in qs_objs:
             expect_tag_description = tag_dict.get(obj.field_name, "")
             if obj.description != expect_tag_description and update_description:
@@ -503,18 +522,21 @@ class TimeSeriesGroup(CustomGroupBase):
         metric_tag_info = self._refine_metric_tags(metric_info)
         # 通过结果表过滤到到指标和维度
         # NOTE: 因为 `ResultTableField` 字段是打平的，因此，需要排除已经存在的，以已经存在的为准
-        exist_fields = set(
-            ResultTableField.objects.filter(table_id=table_id, bk_tenant_id=self.bk_tenant_id).values_list(
-                "field_name", flat=True
-            )
-        )
+        # 一次性加载已有字段作为比对索引，更新时不再分页回查
+        exist_field_objs = {
+            obj.field_name: obj
+            for obj in ResultTableField.objects.filter(table_id=table_id, bk_tenant_id=self.bk_tenant_id)
+        }
+        exist_fields = set(exist_field_objs)
         # 过滤需要创建或更新的指标
         metric_dict = metric_tag_info["metric_dict"]
         metric_set = set(metric_dict.keys())
         need_create_metrics = metric_set - exist_fields
         # 获取已经存在的指标，然后进行批量更新
         need_update_metrics = metric_set - need_create_metrics
-        self._bulk_create_or_update_metrics(table_id, metric_dict, need_create_metrics, need_update_metrics)
+        self._bulk_create_or_update_metrics(
+            table_id, metric_dict, need_create_metrics, need_update_metrics, exist_fields=exist_field_objs
+        )
         # 过滤需要创建或更新的维度
         tag_dict = metric_tag_info["tag_dict"]
         tag_set = set(tag_dict.keys())
@@ -527,6 +549,7 @@ class TimeSeriesGroup(CustomGroupBase):
             need_create_tags,
             need_update_tags,
             metric_tag_info["is_update_description"],
+            exist_fields=exist_field_objs,
         )
         logger.info("bulk refresh rt fields successfully")
 
@@ -662,67 +685,111 @@ class TimeSeriesGroup(CustomGroupBase):
         ):
             return self.get_metric_from_bkdata()
 
-        # 获取redis中数据
+        metrics_info = []
+        for page_metrics_info in self.iter_metrics_from_redis(expired_time):
+            metrics_info.extend(page_metrics_info)
+        return metrics_info
+
+    def iter_metrics_from_redis(self, expired_time: int | None = settings.TIME_SERIES_METRIC_EXPIRED_SECONDS):
+        """按页从 redis 中获取指标及维度，逐页返回解析后的指标信息
+
+        当前页的维度查询和下一页的指标查询通过同一个 pipeline 发送，减少网络往返
+        """
         client = RedisClient.from_envs(prefix="BK_MONITOR_TRANSFER")
         custom_metrics_key = f"{settings.METRICS_KEY_PREFIX}{self.bk_data_id}"
         metric_dimensions_key = f"{settings.METRIC_DIMENSIONS_KEY_PREFIX}{self.bk_data_id}"
 
         now_time = tz_now()
-        fetch_step = settings.MAX_METRICS_FETCH_STEP
+        fetch_step = int(settings.MAX_METRICS_FETCH_STEP)
         valid_begin_ts = (now_time - datetime.timedelta(seconds=expired_time)).timestamp()
         metrics_filter_params = {"name": custom_metrics_key, "min": valid_begin_ts, "max": now_time.timestamp()}
 
-        metrics_info = []
-        # 分批拉取 redis 数据，防止大批量数据拖垮
-        for i in range(math.ceil(client.zcount(**metrics_filter_params) / fetch_step)):
+        page_count = math.ceil(client.zcount(**metrics_filter_params) / fetch_step)
+        if not page_count:
+            return
+
+        # 0. 首先获取第一页有效期内的 metrics
+        try:
+            metrics_with_scores: list[tuple[bytes, float]] | None = client.zrangebyscore(
+                **metrics_filter_params, start=0, num=fetch_step, withscores=True
+            )
+        except Exception:
+            logger.exception("failed to get metrics from storage, filter params: %s", metrics_filter_params)
+            # metrics 可能存在大批量内容，可容忍某一步出错
+            metrics_with_scores = None
+
+        for i in range(page_count):
+            has_next_page = i + 1 < page_count
+            dimensions_list: list[bytes] | None = None
+            next_metrics_with_scores: list[tuple[bytes, float]] | None = None
             try:
-                # 0. 首先获取有效期内的所有 metrics
-                metrics_with_scores: list[tuple[bytes, float]] = client.zrangebyscore(
-                    **metrics_filter_params, start=fetch_step * i, num=fetch_step, withscores=True
-                )
+                # 1. 获取当前这批 metrics 的 dimensions 信息，同时获取下一批 metrics
+                with client.pipeline(transaction=False) as pipe:
+                    if metrics_with_scores:
+                        pipe.hmget(metric_dimensions_key, [x[0] for x in metrics_with_scores])
+                    if has_next_page:
+                        pipe.zrangebyscore(
+                            **metrics_filter_params, start=fetch_step * (i + 1), num=fetch_step, withscores=True
+                        )
+                    results = pipe.execute(raise_on_error=False)
             except Exception:
-                logger.exception("failed to get metrics from storage, filter params: %s", metrics_filter_params)
-                # metrics 可能存在大批量内容，可容忍某一步出错
+                logger.exception("failed to get metrics and dimensions from storage, page: %s", i)
+                results = []
+
+            if metrics_with_scores:
+                dimensions_list = results.pop(0) if results else None
+                if isinstance(dimensions_list, Exception):
+                    logger.error("failed to get dimensions from metrics, error: %s", dimensions_list)
+                    dimensions_list = None
+            if has_next_page:
+                next_metrics_with_scores = results.pop(0) if results else None
+                if isinstance(next_metrics_with_scores, Exception):
+                    logger.error(
+                        "failed to get metrics from storage, filter params: %s, error: %s",
+                        metrics_filter_params,
+                        next_metrics_with_scores,
+                    )
+                    next_metrics_with_scores = None
+
+            # 2. 解析当前这批 metrics 和对应 dimensions(tags)
+            if metrics_with_scores and dimensions_list:
+                yield self._parse_redis_metrics(metrics_with_scores, dimensions_list)
+
+            metrics_with_scores = next_metrics_with_scores
+
+    def _parse_redis_metrics(self, metrics_with_scores: list[tuple[bytes, float]], dimensions_list: list[bytes]):
+        """解析 redis 中一批指标及其维度"""
+        metrics_info = []
+        for j, metric_with_score in enumerate(metrics_with_scores):
+            # 理论上 metrics 和 dimensions 列表一一对应
+            dimensions_info = dimensions_list[j]
+            if not dimensions_info:
                 continue
 
-            # 1. 获取当前这批 metrics 的 dimensions 信息
             try:
-                dimensions_list: list[bytes] = client.hmget(metric_dimensions_key, [x[0] for x in metrics_with_scores])
+                dimensions = json.loads(dimensions_info)["dimensions"]
             except Exception:
-                logger.exception("failed to get dimensions from metrics")
+                logger.exception("failed to parse dimension from dimensions info: %s", dimensions_info)
                 continue
 
-            # 2. 尝试更新 metrics 和对应 dimensions(tags)
-            for j, metric_with_score in enumerate(metrics_with_scores):
-                # 理论上 metrics 和 dimensions 列表一一对应
-                dimensions_info = dimensions_list[j]
-                if not dimensions_info:
-                    continue
+            # 因为获取到的为bytes类型，避免后续更新`table id`时，组装格式错误，转换为字符串
+            field_name = metric_with_score[0]
+            if isinstance(field_name, bytes):
+                field_name = field_name.decode("utf-8")
 
-                try:
-                    dimensions = json.loads(dimensions_info)["dimensions"]
-                except Exception:
-                    logger.exception("failed to parse dimension from dimensions info: %s", dimensions_info)
-                    continue
-
-                # 因为获取到的为bytes类型，避免后续更新`table id`时，组装格式错误，转换为字符串
-                field_name = metric_with_score[0]
-                if isinstance(field_name, bytes):
-                    field_name = field_name.decode("utf-8")
-
-                # 过滤非法的指标名
-                if not self.FIELD_NAME_REGEX.match(field_name):
-                    logger.warning("invalid metric name: %s", field_name)
-                    continue
+            # 过滤非法的指标名
+            if not self.FIELD_NAME_REGEX.match(field_name):
+                logger.warning("invalid metric name: %s", field_name)
+                continue
 
-                metrics_info.append(
-                    {
-                        "field_name": field_name,
-                        "field_scope": TimeSeriesMetric.DEFAULT_DATA_SCOPE_NAME,
-                        "tag_value_list": dimensions,
-                        "last_modify_time": metric_with_score[1],
-                    }
-                )
+            metrics_info.append(
+                {
+                    "field_name": field_name,
+                    "field_scope": TimeSeriesMetric.DEFAULT_DATA_SCOPE_NAME,
+                    "tag_value_list": dimensions,
+                    "last_modify_time": metric_with_score[1],
+                }
+            )
         return metrics_info
 
     def update_time_series_metrics(self, expired_time: int | None = None) -> bool:
@@ -2053,17 +2120,24 @@ class TimeSeriesMetric(models.Model):
         need_update_metrics: list | set,
         group_id: int,
         is_auto_discovery: bool,
+        exist_metrics: dict | None = None,
     ) -> bool:
-        """批量更新指标，针对记录仅更新最后更新时间和 tag 字段"""
+        """批量更新指标，针对记录仅更新最后更新时间和 tag 字段
+
+        :param exist_metrics: 预先加载的已有指标 {(field_name, field_scope): TimeSeriesMetric}，为空时从 db 查询
+        """
         records = []
         white_list_disabled_metric = set()
         need_push_router = False
 
-        # 构建查询条件：需要同时匹配 field_name 和 field_scope
-        field_name_list = [field_name for field_name, _ in need_update_metrics]
-        qs_objs = filter_model_by_in_page(
-            TimeSeriesMetric, "field_name__in", field_name_list, other_filter={"group_id": group_id}
-        )
+        if exist_metrics is not None:
+            qs_objs = [exist_metrics[key] for key in need_update_metrics if key in exist_metrics]
+        else:
+            # 构建查询条件：需要同时匹配 field_name 和 field_scope
+            field_name_list = [field_name for field_name, _ in need_update_metrics]
+            qs_objs = filter_model_by_in_page(
+                TimeSeriesMetric, "field_name__in", field_name_list, other_filter={"group_id": group_id}
+            )
 
         # 将组合转换为集合，方便快速查找
         combinations_set = set(need_update_metrics)
@@ -2200,10 +2274,9 @@ class TimeSeriesMetric(models.Model):
         }
 
         group_id = group.time_series_group_id
-        old_metric_to_ids = {
-            (m[1], m[2]): m[0]
-            for m in cls.objects.filter(group_id=group_id).values_list("field_id", "field_name", "field_scope")
-        }
+        # 一次性加载已有指标作为比对索引，避免更新时再分页回查
+        exist_metrics = {(m.field_name, m.field_scope): m for m in cls.objects.filter(group_id=group_id)}
+        old_metric_to_ids = {key: m.field_id for key, m in exist_metrics.items()}
         old_records = set(old_metric_to_ids.keys())
         new_records = set(_metrics_dict.keys())
 
@@ -2225,7 +2298,7 @@ class TimeSeriesMetric(models.Model):
         # 批量更新
         if need_update_metrics:
             need_push_router |= cls._bulk_update_metrics(
-                _metrics_dict, need_update_metrics, group_id, is_auto_discovery
+                _metrics_dict, need_update_metrics, group_id, is_auto_discovery, exist_metrics=exist_metrics
             )
 
         # 处理不在返回列表中的已存在指标，设置为非活跃
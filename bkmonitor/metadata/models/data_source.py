@@ -14,6 +14,7 @@ import logging
 import time
 import traceback
 import uuid
+from collections import defaultdict
 from typing import Any
 
 import kafka
@@ -38,7 +39,10 @@ from metadata.models.space.constants import (
     SpaceTypes,
 )
 from metadata.utils import consul_tools, hash_util
-from metadata.utils.basic import get_space_uid_and_bk_biz_id_by_bk_data_id
+from metadata.utils.basic import (
+    batch_get_space_uid_and_bk_biz_id_by_bk_data_id,
+    get_space_uid_and_bk_biz_id_by_bk_data_id,
+)
 
 from .common import Label, OptionBase
 from .constants import (
@@ -201,23 +205,31 @@ class DataSource(models.Model):
 
     def get_transfer_storage_conf(self, table_id: str) -> list:
         """获取transfer向后端写入的存储的配置"""
-        conf_list = []
+        storages = []
         for real_storage in self.TRANSFER_STORAGE_LIST:
             try:
-                rt_st = real_storage.objects.get(table_id=table_id)
-                consul_config = rt_st.consul_config
-                # # NOTE: 现阶段 transfer 识别不了 `victoria_metrics`，针对 `victoria_metrics` 类型的存储，跳过写入 consul
-                if not consul_config:
-                    continue
-                if (consul_config.get("cluster_type") in IGNORED_STORAGE_CLUSTER_TYPES) or (
-                    consul_config.get("cluster_type") == ClusterInfo.TYPE_INFLUXDB
-                    and table_id in settings.SKIP_INFLUXDB_TABLE_ID_LIST
-                ):
-                    continue
-                conf_list.append(consul_config)
+                storages.append(real_storage.objects.get(table_id=table_id))
             except real_storage.DoesNotExist:
                 continue
 
+        return self.filter_transfer_storage_conf(table_id, storages)
+
+    @staticmethod
+    def filter_transfer_storage_conf(table_id: str, storages: list) -> list:
+        """过滤出transfer需要写入的存储配置"""
+        conf_list = []
+        for rt_st in storages:
+            consul_config = rt_st.consul_config
+            # # NOTE: 现阶段 transfer 识别不了 `victoria_metrics`，针对 `victoria_metrics` 类型的存储，跳过写入 consul
+            if not consul_config:
+                continue
+            if (consul_config.get("cluster_type") in IGNORED_STORAGE_CLUSTER_TYPES) or (
+                consul_config.get("cluster_type") == ClusterInfo.TYPE_INFLUXDB
+                and table_id in settings.SKIP_INFLUXDB_TABLE_ID_LIST
+            ):
+                continue
+            conf_list.append(consul_config)
+
         return conf_list
 
     def get_spaces_by_data_id(self, bk_tenant_id: str, bk_data_id: int) -> dict[str, Any]:
@@ -240,34 +252,8 @@ class DataSource(models.Model):
 
     def to_json(self, is_consul_config=False, with_rt_info=True):
         """返回当前data_id的配置字符串"""
-
-        mq_config = {
-            "storage_config": {"topic": self.mq_config.topic, "partition": self.mq_config.partition},
-            "batch_size": self.mq_config.batch_size,
-            "flush_interval": self.mq_config.flush_interval,
-            "consume_rate": self.mq_config.consume_rate,
-        }
-        # 添加集群信息
-        mq_config.update(self.mq_cluster.consul_config)
-        mq_config["cluster_config"].pop("last_modify_time")
         bk_biz_id, space_uid = get_space_uid_and_bk_biz_id_by_bk_data_id(self.bk_tenant_id, self.bk_data_id)
-        result_config = {
-            "bk_data_id": self.bk_data_id,
-            "data_id": self.bk_data_id,
-            "bk_tenant_id": self.bk_tenant_id,
-            "mq_config": mq_config,
-            "etl_config": self.etl_config,
-            "option": DataSourceOption.get_option(self.bk_data_id),
-            "type_label": self.type_label,
-            "source_label": self.source_label,
-            "token": self.token,
-            "transfer_cluster_id": self.transfer_cluster_id,
-            "data_name": self.data_name,
-            "is_platform_data_id": self.is_platform_data_id,
-            "space_type_id": self.space_type_id,
-            "space_uid": space_uid,
-            "bk_biz_id": bk_biz_id,
-        }
+        result_config = self.compose_json(bk_biz_id, space_uid, DataSourceOption.get_option(self.bk_data_id))
 
         if with_rt_info:
             # 获取ResultTable的配置,1001等数据存在 1--N 结果表映射关系
@@ -300,21 +286,200 @@ class DataSource(models.Model):
             # 判断需要未删除，而且在启用状态的结果表
             for rt, rt_info in real_table_ids.items():
                 result_table_info_list.append(
-                    {
-                        "bk_biz_id": rt_info["bk_biz_id"],
-                        "bk_tenant_id": rt_info["bk_tenant_id"],
-                        "result_table": rt,
-                        "shipper_list": self.get_transfer_storage_conf(rt),
-                        # 如果是自定义上报的情况，不需要将字段信息写入到consul上
-                        "field_list": table_field_dict.get(rt, []) if not self.is_custom_timeseries_report else [],
-                        "schema_type": rt_info["schema_type"],
-                        "option": table_id_option_dict.get(rt, {}),
-                    }
+                    self.compose_result_table_json(
+                        rt_info,
+                        shipper_list=self.get_transfer_storage_conf(rt),
+                        field_list=table_field_dict.get(rt, []),
+                        option=table_id_option_dict.get(rt, {}),
+                    )
                 )
             result_config["result_table_list"] = result_table_info_list
 
         return result_config
 
+    def compose_json(self, bk_biz_id: int, space_uid: str, option: dict) -> dict:
+        """组装数据源自身的配置，空间及选项信息由调用方查询后传入"""
+        mq_config = {
+            "storage_config": {"topic": self.mq_config.topic, "partition": self.mq_config.partition},
+            "batch_size": self.mq_config.batch_size,
+            "flush_interval": self.mq_config.flush_interval,
+            "consume_rate": self.mq_config.consume_rate,
+        }
+        # 添加集群信息
+        mq_config.update(self.mq_cluster.consul_config)
+        mq_config["cluster_config"].pop("last_modify_time")
+        return {
+            "bk_data_id": self.bk_data_id,
+            "data_id": self.bk_data_id,
+            "bk_tenant_id": self.bk_tenant_id,
+            "mq_config": mq_config,
+            "etl_config": self.etl_config,
+            "option": option,
+            "type_label": self.type_label,
+            "source_label": self.source_label,
+            "token": self.token,
+            "transfer_cluster_id": self.transfer_cluster_id,
+            "data_name": self.data_name,
+            "is_platform_data_id": self.is_platform_data_id,
+            "space_type_id": self.space_type_id,
+            "space_uid": space_uid,
+            "bk_biz_id": bk_biz_id,
+        }
+
+    def compose_result_table_json(self, rt_info: dict, shipper_list: list, field_list: list, option: dict) -> dict:
+        """组装单个结果表的配置"""
+        return {
+            "bk_biz_id": rt_info["bk_biz_id"],
+            "bk_tenant_id": rt_info["bk_tenant_id"],
+            "result_table": rt_info["table_id"],
+            "shipper_list": shipper_list,
+            # 如果是自定义上报的情况，不需要将字段信息写入到consul上
+            "field_list": field_list if not self.is_custom_timeseries_report else [],
+            "schema_type": rt_info["schema_type"],
+            "option": option,
+        }
+
+    @classmethod
+    def bulk_to_json(cls, data_sources: list["DataSource"], is_consul_config=False) -> dict[int, dict]:
+        """
+        批量返回data_id的配置，内容与 to_json 一致
+        关联的消息队列、集群、结果表、字段、选项及存储信息均按批查询，查询次数与数据源数量无关
+        :param data_sources: 数据源列表
+        :param is_consul_config: 是否为consul配置
+        :return: {bk_data_id: config}，渲染失败的数据源不在结果中
+        """
+        from metadata.models.influxdb_cluster import InfluxDBProxyStorage
+
+        if not data_sources:
+            return {}
+
+        data_id_list = [ds.bk_data_id for ds in data_sources]
+
+        # 1. 数据源级别的关联信息
+        space_infos = batch_get_space_uid_and_bk_biz_id_by_bk_data_id(
+            {ds.bk_data_id: ds.bk_tenant_id for ds in data_sources}
+        )
+
+        ds_options = defaultdict(dict)
+        for option in DataSourceOption.objects.filter(bk_data_id__in=data_id_list):
+            ds_options[option.bk_data_id].update(option.to_json())
+
+        mq_configs = defaultdict(list)
+        for mq_config in KafkaTopicInfo.objects.filter(bk_data_id__in=data_id_list):
+            mq_configs[mq_config.bk_data_id].append(mq_config)
+
+        # 2. 结果表信息，按全局顺序保持与单个查询一致的遍历顺序
+        ds_table_ids = defaultdict(set)
+        for ds_rt in DataSourceResultTable.objects.filter(bk_data_id__in=data_id_list).values(
+            "bk_data_id", "bk_tenant_id", "table_id"
+        ):
+            ds_table_ids[(ds_rt["bk_data_id"], ds_rt["bk_tenant_id"])].add(ds_rt["table_id"])
+
+        table_positions = {}
+        real_table_infos = {}
+        for rt in ResultTable.objects.filter(
+            table_id__in={table_id for table_ids in ds_table_ids.values() for table_id in table_ids},
+            is_deleted=False,
+            is_enable=True,
+        ).values("table_id", "bk_biz_id", "schema_type", "bk_tenant_id"):
+            table_positions.setdefault(rt["table_id"], len(table_positions))
+            real_table_infos[rt["table_id"]] = rt
+
+        ds_real_table_ids = {}
+        tenant_table_ids = defaultdict(set)
+        for ds in data_sources:
+            real_table_id_list = sorted(
+                ds_table_ids[(ds.bk_data_id, ds.bk_tenant_id)] & real_table_infos.keys(), key=table_positions.get
+            )
+            ds_real_table_ids[ds.bk_data_id] = real_table_id_list
+            tenant_table_ids[ds.bk_tenant_id].update(real_table_id_list)
+
+        # 选项及字段按租户批量获取
+        table_options = {}
+        table_fields = {}
+        for bk_tenant_id, table_ids in tenant_table_ids.items():
+            table_options[bk_tenant_id] = ResultTableOption.batch_result_table_option(
+                list(table_ids), bk_tenant_id=bk_tenant_id
+            )
+            table_fields[bk_tenant_id] = ResultTableField.batch_get_fields(
+                list(table_ids), is_consul_config, bk_tenant_id=bk_tenant_id
+            )
+
+        # 3. 存储信息及其依赖的集群
+        table_storages = {}
+        all_table_ids = set(real_table_infos)
+        for real_storage in cls.TRANSFER_STORAGE_LIST:
+            storages = defaultdict(list)
+            for storage in real_storage.objects.filter(table_id__in=all_table_ids):
+                storages[storage.table_id].append(storage)
+            table_storages[real_storage] = storages
+
+        influxdb_storages = [storage for storages in table_storages[InfluxDBStorage].values() for storage in storages]
+        proxy_storages = InfluxDBProxyStorage.objects.in_bulk(
+            {storage.influxdb_proxy_storage_id for storage in influxdb_storages}
+        )
+        for storage in influxdb_storages:
+            if storage.influxdb_proxy_storage_id in proxy_storages:
+                storage._influxdb_proxy_storage = proxy_storages[storage.influxdb_proxy_storage_id]
+
+        # 存储集群与 storage_cluster 属性的解析方式保持一致，InfluxDB 存储需通过 proxy 存储获取集群
+        storage_cluster_ids = []
+        for real_storage, storages in table_storages.items():
+            for items in storages.values():
+                for storage in items:
+                    if real_storage is not InfluxDBStorage:
+                        storage_cluster_ids.append((storage, storage.storage_cluster_id))
+                    elif storage.influxdb_proxy_storage_id in proxy_storages:
+                        proxy_storage = proxy_storages[storage.influxdb_proxy_storage_id]
+                        storage_cluster_ids.append((storage, proxy_storage.proxy_cluster_id))
+
+        cluster_ids = {ds.mq_cluster_id for ds in data_sources} | {cluster_id for _, cluster_id in storage_cluster_ids}
+        clusters = {
+            (cluster.bk_tenant_id, cluster.cluster_id): cluster
+            for cluster in ClusterInfo.objects.filter(cluster_id__in=cluster_ids)
+        }
+        for storage, cluster_id in storage_cluster_ids:
+            cluster = clusters.get((storage.bk_tenant_id, cluster_id))
+            if cluster is not None:
+                storage._cluster = cluster
+
+        # 4. 组装配置，预取不到或存在歧义的数据，交由原有属性查询，保持异常行为一致
+        result = {}
+        for ds in data_sources:
+            try:
+                ds._mq_cluster = clusters.get((ds.bk_tenant_id, ds.mq_cluster_id))
+                if len(mq_configs[ds.bk_data_id]) == 1:
+                    ds._mq_config = mq_configs[ds.bk_data_id][0]
+
+                bk_biz_id, space_uid = space_infos[ds.bk_data_id]
+                result_config = ds.compose_json(bk_biz_id, space_uid, ds_options[ds.bk_data_id])
+
+                result_table_info_list = []
+                for rt in ds_real_table_ids[ds.bk_data_id]:
+                    storages = []
+                    is_ambiguous = False
+                    for real_storage in cls.TRANSFER_STORAGE_LIST:
+                        storage_list = table_storages[real_storage].get(rt, [])
+                        is_ambiguous = is_ambiguous or len(storage_list) > 1
+                        storages.extend(storage_list)
+
+                    result_table_info_list.append(
+                        ds.compose_result_table_json(
+                            real_table_infos[rt],
+                            shipper_list=ds.get_transfer_storage_conf(rt)
+                            if is_ambiguous
+                            else cls.filter_transfer_storage_conf(rt, storages),
+                            field_list=table_fields[ds.bk_tenant_id].get(rt, []),
+                            option=table_options[ds.bk_tenant_id].get(rt, {}),
+                        )
+                    )
+                result_config["result_table_list"] = result_table_info_list
+                result[ds.bk_data_id] = result_config
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("data_id->[%s] failed to compose config", ds.bk_data_id)
+
+        return result
+
     @property
     def gse_route_config(self):
         """
@@ -1145,32 +1310,47 @@ class DataSource(models.Model):
             new_transfer_cluster_id,
         )
 
-    def refresh_consul_config(self):
-        """
-        更新consul配置，告知ETL等其他依赖模块配置有所更新
-        :return: True | raise Exception
-        """
+    def need_refresh_consul_config(self) -> bool:
+        """判断是否需要刷新consul配置"""
         if not self.can_refresh_consul_and_gse():
             logger.info(
                 "data->[%s] is not enable or has been moved to new data link, nothing will refresh to outer systems.",
                 self.bk_data_id,
             )
-            return True
+            return False
 
         # transfer不处理data_id 1002--1006的数据，忽略推送到consul
         if self.bk_data_id in IGNORED_CONSUL_SYNC_DATA_IDS:
             logger.info(f"data_id->[{self.bk_data_id}] update config to consul skip.")
-            return
+            return False
+
+        return True
+
+    def get_consul_config(self):
+        """
+        获取需要刷新到consul的配置
+        :return: (consul配置路径, 配置内容)，不需要刷新时返回 None
+        """
+        if not self.need_refresh_consul_config():
+            return None
+
+        return self.consul_config_path, self.to_json(is_consul_config=True)
+
+    def refresh_consul_config(self):
+        """
+        更新consul配置，告知ETL等其他依赖模块配置有所更新
+        :return: True | raise Exception
+        """
+        consul_config = self.get_consul_config()
+        if consul_config is None:
+            return True
 
         hash_consul = consul_tools.HashConsul()
 
         # 2. 刷新当前data_id的配置
-        hash_consul.put(
-            key=self.consul_config_path,
-            value=self.to_json(is_consul_config=True),
-            bk_data_id=self.bk_data_id,
-        )
-        logger.info(f"data_id->[{self.bk_data_id}] has update config to ->[{self.consul_config_path}] success")
+        consul_config_path, value = consul_config
+        hash_consul.put(key=consul_config_path, value=value, bk_data_id=self.bk_data_id)
+        logger.info(f"data_id->[{self.bk_data_id}] has update config to ->[{consul_config_path}] success")
 
     def create_mq(self):
         """
@@ -1298,12 +1478,13 @@ class DataSource(models.Model):
 
             return True
 
-    def refresh_outer_config(self):
+    def refresh_outer_config(self, refresh_consul=True):
         """
         刷新外部的依赖配置:
         1. GSE 需要写入的MQ创建及准备
         2. GSE的zk配置
         3. Consul的配置
+        :param refresh_consul: 是否刷新consul配置，批量同步consul时由调用方统一刷新
         :return: True | raise Exception
         """
 
@@ -1319,8 +1500,9 @@ class DataSource(models.Model):
         logger.debug(f"data_id->[{self.bk_data_id}] refresh gse config to zk success")
 
         # 刷新consul配置
-        self.refresh_consul_config()
-        logger.debug(f"data_id->[{self.bk_data_id}] refresh consul config success.")
+        if refresh_consul:
+            self.refresh_consul_config()
+            logger.debug(f"data_id->[{self.bk_data_id}] refresh consul config success.")
 
         logger.debug(f"refresh data_id->[{self.bk_data_id}] all outer config success")
         return True
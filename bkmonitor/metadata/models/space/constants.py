@@ -89,6 +89,8 @@ RESULT_TABLE_DETAIL_KEY = os.environ.get("RESULT_TABLE_DETAIL_KEY", f"{SPACE_RED
 RESULT_TABLE_DETAIL_CHANNEL = os.environ.get(
     "RESULT_TABLE_DETAIL_CHANNEL", f"{SPACE_REDIS_PREFIX_KEY}:result_table_detail:channel"
 )
+# 增量推送路由的时间水位，按租户记录上次推送的开始时间
+SPACE_ROUTER_PUSH_WATERMARK_KEY = f"{SPACE_REDIS_PREFIX_KEY}:router_push_watermark"
 
 
 class EtlConfigs(Enum):
@@ -56,7 +56,7 @@ from metadata.models.space.utils import (
     reformat_table_id,
 )
 from metadata.utils.db import filter_model_by_in_page, filter_query_set_by_in_page
-from metadata.utils.redis_tools import RedisTools
+from metadata.utils.redis_tools import RedisTools, summarize_for_log
 
 logger = logging.getLogger("metadata")
 
@@ -106,7 +106,15 @@ class SpaceTableIDRedis:
             space_redis_key = f"{space_type}__{space_id}"
 
         # 推送数据
-        if values_to_redis:
+        if settings.ENABLE_SPACE_ROUTER_DIFF_PUSH:
+            # 只有内容变化时才写入及通知使用方
+            self._push_changed_fields(
+                SPACE_TO_RESULT_TABLE_KEY,
+                SPACE_TO_RESULT_TABLE_CHANNEL,
+                {space_redis_key: json.dumps(values_to_redis)} if values_to_redis else {},
+                is_publish,
+            )
+        elif values_to_redis:
             RedisTools.hmset_to_redis(SPACE_TO_RESULT_TABLE_KEY, {space_redis_key: json.dumps(values_to_redis)})
 
         logger.info(
@@ -116,7 +124,7 @@ class SpaceTableIDRedis:
         )
 
         # 通知使用方
-        if is_publish:
+        if is_publish and not settings.ENABLE_SPACE_ROUTER_DIFF_PUSH:
             RedisTools.publish(SPACE_TO_RESULT_TABLE_CHANNEL, [space_redis_key])
         logger.info("push space table_id data successfully, space_type: %s, space_id: %s", space_type, space_id)
 
@@ -131,8 +139,8 @@ class SpaceTableIDRedis:
         logger.info(
             "start to push data_label table_id data, data_label_list: %s, table_id_list: %s, is_publish: %s,"
             "bk_tenant_id: %s",
-            json.dumps(data_label_list),
-            json.dumps(table_id_list),
+            summarize_for_log(data_label_list or []),
+            summarize_for_log(table_id_list or []),
             is_publish,
             bk_tenant_id,
         )
@@ -178,7 +186,11 @@ class SpaceTableIDRedis:
                 for data_label, table_ids in rt_dl_map.items()
             }
 
-        if redis_values:
+        if settings.ENABLE_SPACE_ROUTER_DIFF_PUSH:
+            self._push_changed_fields(
+                DATA_LABEL_TO_RESULT_TABLE_KEY, DATA_LABEL_TO_RESULT_TABLE_CHANNEL, redis_values, is_publish
+            )
+        elif redis_values:
             RedisTools.hmset_to_redis(DATA_LABEL_TO_RESULT_TABLE_KEY, redis_values)
             if is_publish:
                 RedisTools.publish(DATA_LABEL_TO_RESULT_TABLE_CHANNEL, list(rt_dl_map.keys()))
@@ -243,7 +255,7 @@ class SpaceTableIDRedis:
                 logger.info(
                     "push_bkbase_table_id_detail: table_id_list->[%s], got table_id_detail->[%s]",
                     table_id_list,
-                    json.dumps(_table_id_detail),
+                    summarize_for_log(_table_id_detail),
                 )
                 updated_table_id_detail: dict[str, dict] = {}
                 for key, value in _table_id_detail.items():
@@ -284,7 +296,7 @@ class SpaceTableIDRedis:
                         "push_bkbase_table_id_detail: table_id_list->[%s] got detail->[%s],try to push into channel->["
                         "%s]",
                         table_id_list,
-                        json.dumps(_table_id_detail),
+                        summarize_for_log(_table_id_detail),
                         RESULT_TABLE_DETAIL_CHANNEL,
                     )
                     RedisTools.publish(RESULT_TABLE_DETAIL_CHANNEL, list(_table_id_detail.keys()))
@@ -421,6 +433,111 @@ class SpaceTableIDRedis:
                 log_result_table_count,
             )
 
+    def push_changed_routers(
+        self, bk_tenant_id: str, since: datetime.datetime, is_publish: bool = True
+    ) -> dict[str, int]:
+        """推送指定时间之后变更的结果表所涉及的路由。
+
+        以 ``ResultTable.last_modify_time`` 识别变更的结果表，只刷新：
+
+        * 变更结果表的详情路由；
+        * 变更结果表当前 data_label 的路由；
+        * 变更结果表可见的空间路由，即数据源关联的空间、结果表所属业务的空间及其关联空间。
+
+        平台级数据源及全局结果表对租户下全部空间可见，此时回退为刷新租户下全部支持的空间。
+        结果表被移除的 data_label 无法从当前记录中得知，仍依赖原有的变更入口刷新。
+
+        :param bk_tenant_id: 租户 ID。
+        :param since: 变更时间的起点，包含该时间点。
+        :param is_publish: 写入 Redis 后是否发布变更。
+        :return: 刷新的结果表、data_label 及空间数量。
+        """
+
+        changed_tables = list(
+            models.ResultTable.objects.filter(bk_tenant_id=bk_tenant_id, last_modify_time__gte=since).values(
+                "table_id", "data_label", "bk_biz_id"
+            )
+        )
+        result = {"table_id": len(changed_tables), "data_label": 0, "space": 0}
+        if not changed_tables:
+            return result
+
+        table_id_list = sorted({rt["table_id"] for rt in changed_tables})
+        data_label_list = sorted({dl for rt in changed_tables for dl in (rt["data_label"] or "").split(",") if dl})
+        spaces = self._get_changed_table_spaces(bk_tenant_id, changed_tables)
+        result.update(data_label=len(data_label_list), space=len(spaces))
+
+        logger.info(
+            "push_changed_routers: tenant->[%s], since->[%s], changed->[%s]", bk_tenant_id, since, json.dumps(result)
+        )
+
+        for space_type, space_id in sorted(spaces):
+            try:
+                self.push_space_table_ids(space_type=space_type, space_id=space_id, is_publish=is_publish)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    "push_changed_routers: failed to push space router, space_type->[%s], space_id->[%s]",
+                    space_type,
+                    space_id,
+                )
+        if data_label_list:
+            self.push_data_label_table_ids(
+                data_label_list=data_label_list, is_publish=is_publish, bk_tenant_id=bk_tenant_id
+            )
+        self.push_table_id_detail(bk_tenant_id=bk_tenant_id, table_id_list=table_id_list, is_publish=is_publish)
+        return result
+
+    def _get_changed_table_spaces(self, bk_tenant_id: str, changed_tables: list[dict]) -> set[tuple[str, str]]:
+        """获取变更结果表可见的空间"""
+        table_ids = [rt["table_id"] for rt in changed_tables]
+        data_ids = set(
+            models.DataSourceResultTable.objects.filter(bk_tenant_id=bk_tenant_id, table_id__in=table_ids).values_list(
+                "bk_data_id", flat=True
+            )
+        )
+        biz_ids = {rt["bk_biz_id"] for rt in changed_tables}
+
+        # 平台级数据源及全局结果表对全部空间可见，无法缩小范围
+        if (
+            0 in biz_ids
+            or set(table_ids) & set(ALL_SPACE_TYPE_TABLE_ID_LIST)
+            or data_ids & set(get_platform_data_ids(bk_tenant_id=bk_tenant_id))
+        ):
+            return set(
+                models.Space.objects.filter(
+                    bk_tenant_id=bk_tenant_id, space_type_id__in=self.SUPPORT_SPACE_TYPES
+                ).values_list("space_type_id", "space_id")
+            )
+
+        # 数据源关联的空间
+        spaces = set(
+            models.SpaceDataSource.objects.filter(bk_tenant_id=bk_tenant_id, bk_data_id__in=data_ids).values_list(
+                "space_type_id", "space_id"
+            )
+        )
+        # 结果表所属业务的空间，负数业务 ID 对应空间的自增 ID
+        spaces.update((SpaceTypes.BKCC.value, str(biz_id)) for biz_id in biz_ids if biz_id > 0)
+        negative_space_ids = [abs(biz_id) for biz_id in biz_ids if biz_id < 0]
+        if negative_space_ids:
+            spaces.update(
+                models.Space.objects.filter(id__in=negative_space_ids).values_list("space_type_id", "space_id")
+            )
+
+        # 关联空间：业务关联的 bkci/bksaas 空间，以及 bkci/bksaas 空间关联的业务
+        bkcc_space_ids = [space_id for space_type, space_id in spaces if space_type == SpaceTypes.BKCC.value]
+        other_spaces = [space for space in spaces if space[0] != SpaceTypes.BKCC.value]
+        related_query = Q(resource_id__in=bkcc_space_ids)
+        for space_type, space_id in other_spaces:
+            related_query |= Q(space_type_id=space_type, space_id=space_id)
+        for space_type, space_id, resource_id in models.SpaceResource.objects.filter(
+            related_query, bk_tenant_id=bk_tenant_id, resource_type=SpaceTypes.BKCC.value
+        ).values_list("space_type_id", "space_id", "resource_id"):
+            spaces.add((space_type, space_id))
+            if resource_id:
+                spaces.add((SpaceTypes.BKCC.value, str(resource_id)))
+
+        return {space for space in spaces if space[0] in self.SUPPORT_SPACE_TYPES}
+
     def _compose_metric_table_id_detail(
         self,
         *,
@@ -896,11 +1013,61 @@ class SpaceTableIDRedis:
 
         if not redis_values:
             return
+        if settings.ENABLE_SPACE_ROUTER_DIFF_PUSH:
+            SpaceTableIDRedis._push_changed_fields(
+                RESULT_TABLE_DETAIL_KEY, RESULT_TABLE_DETAIL_CHANNEL, redis_values, is_publish
+            )
+            return
         # publish 必须复用实际写入的 field，避免非法 table_id 被过滤后仍通知消费端刷新。
         RedisTools.hmset_to_redis(RESULT_TABLE_DETAIL_KEY, redis_values)
         if is_publish:
             RedisTools.publish(RESULT_TABLE_DETAIL_CHANNEL, list(redis_values))
 
+    @classmethod
+    def _push_changed_fields(cls, key: str, channel: str, redis_values: dict[str, str], is_publish: bool) -> list[str]:
+        """与 Redis 中已有内容比较，只写入并发布内容有变化的 field。
+
+        内容按 JSON 解析后比较，避免字典键顺序不同造成的无效推送；已有内容不存在或无法
+        解析时视为有变化。
+
+        :param key: Redis hash key。
+        :param channel: 发布变更 field 的频道。
+        :param redis_values: 本次组装的 {field: json 字符串}。
+        :param is_publish: 是否发布实际写入的 field。
+        :return: 实际写入的 field 列表。
+        """
+
+        changed_values: dict[str, str] = {}
+        fields = list(redis_values)
+        for field, old_value in zip(fields, RedisTools.hmget(key, fields)):
+            new_value = redis_values[field]
+            if old_value is not None and cls._is_same_router_value(old_value, new_value):
+                continue
+            changed_values[field] = new_value
+
+        logger.info(
+            "push changed fields: key->[%s], total->[%s], changed->[%s]", key, len(redis_values), len(changed_values)
+        )
+        if not changed_values:
+            return []
+
+        RedisTools.hmset_to_redis(key, changed_values)
+        if is_publish:
+            RedisTools.publish(channel, list(changed_values))
+        return list(changed_values)
+
+    @staticmethod
+    def _is_same_router_value(old_value: bytes | str, new_value: str) -> bool:
+        """比较 Redis 中的路由内容与新组装的内容是否一致"""
+        if isinstance(old_value, bytes):
+            old_value = old_value.decode("utf-8")
+        if old_value == new_value:
+            return True
+        try:
+            return json.loads(old_value) == json.loads(new_value)
+        except (TypeError, ValueError):
+            return False
+
     def _compose_record_rule_table_id_detail(self, bk_tenant_id: str) -> dict[str, dict]:
         """组装预计算结果表的详情"""
         from metadata.models.record_rule.rules import RecordRule
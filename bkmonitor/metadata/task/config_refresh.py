@@ -12,6 +12,7 @@ import json
 import logging
 import time
 import traceback
+from collections import defaultdict
 
 from confluent_kafka import TopicCollection
 from confluent_kafka.admin import AdminClient
@@ -23,6 +24,7 @@ from alarm_backends.core.lock.service_lock import share_lock
 from core.prometheus import metrics
 from metadata import models
 from metadata.config import (
+    CONSUL_DATA_ID_PATH_FORMAT,
     KAFKA_SASL_MECHANISM,
     KAFKA_SASL_PROTOCOL,
     PERIODIC_TASK_DEFAULT_TTL,
@@ -206,6 +208,9 @@ def refresh_datasource():
     ds_with_rt = {data_id for rt, data_id in ds_rt_map.items() if rt in enabled_rts}
     # 补充无rt表的data_ids
     ds_with_rt.update(NEED_REFRESH_DATA_IDS)
+    # 批量同步时，consul配置先收集起来，按前缀统一比较及写入
+    bulk_sync_consul = settings.ENABLE_CONSUL_BULK_SYNC
+    consul_datasources = []
     for datasource in models.DataSource.objects.filter(is_enable=True, bk_data_id__in=ds_with_rt).order_by(
         "-last_modify_time"
     ):
@@ -213,13 +218,43 @@ def refresh_datasource():
             # 更新前，需要从DB读取一次最新的数据，避免脏数据读写
             datasource.clean_cache()
             # 2. 更新ETL及datasource的配置
-            datasource.refresh_outer_config()
+            datasource.refresh_outer_config(refresh_consul=not bulk_sync_consul)
+            if bulk_sync_consul and datasource.need_refresh_consul_config():
+                consul_datasources.append(datasource)
             logger.debug(f"data_id->[{datasource.bk_data_id}] refresh all outer success")
         except Exception:
             logger.error(
                 f"data_id->[{datasource.bk_data_id}] failed to refresh outer config for->[{traceback.format_exc()}]"
             )
 
+    if not consul_datasources:
+        return
+
+    # 配置按批渲染，查询次数与数据源数量无关
+    consul_configs = defaultdict(dict)
+    ds_configs = models.DataSource.bulk_to_json(consul_datasources, is_consul_config=True)
+    for datasource in consul_datasources:
+        if datasource.bk_data_id not in ds_configs:
+            continue
+        consul_prefix = CONSUL_DATA_ID_PATH_FORMAT.format(
+            transfer_cluster_id=datasource.transfer_cluster_id, data_id=""
+        )
+        consul_configs[consul_prefix][datasource.consul_config_path] = ds_configs[datasource.bk_data_id]
+
+    hash_consul = consul_tools.HashConsul()
+    for consul_prefix, values in consul_configs.items():
+        try:
+            result = hash_consul.bulk_put(prefix=consul_prefix, values=values)
+            logger.info(
+                "refresh_datasource: bulk sync consul prefix->[%s] unchanged(%d), updated(%d), failed(%d)",
+                consul_prefix,
+                result["unchanged"],
+                result["updated"],
+                result["failed"],
+            )
+        except Exception:
+            logger.error(f"failed to bulk sync consul prefix->[{consul_prefix}] for->[{traceback.format_exc()}]")
+
 
 @share_lock(identify="metadata_refreshKafkaStorage")
 def refresh_kafka_storage():
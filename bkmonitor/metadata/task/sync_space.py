@@ -11,11 +11,13 @@ specific language governing permissions and limitations under the License.
 import json
 import logging
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 
 from django.conf import settings
 from django.db.models import Q
 from django.db.transaction import atomic
+from django.utils import timezone
 
 from alarm_backends.core.lock.service_lock import share_lock
 from api.cmdb.define import Business
@@ -27,6 +29,7 @@ from metadata.models.constants import BULK_CREATE_BATCH_SIZE, BULK_UPDATE_BATCH_
 from metadata.models.space import Space, SpaceDataSource, SpaceResource
 from metadata.models.space.constants import (
     SKIP_DATA_ID_LIST_FOR_BKCC,
+    SPACE_ROUTER_PUSH_WATERMARK_KEY,
     SYSTEM_USERNAME,
     BCSClusterTypes,
     SpaceStatus,
@@ -56,6 +59,9 @@ from metadata.utils.redis_tools import RedisTools
 
 logger = logging.getLogger("metadata")
 
+# 增量推送空间路由时，变更时间向前重叠的范围
+SPACE_ROUTER_PUSH_OVERLAP = timedelta(minutes=1)
+
 
 def _disable_related_bkci_spaces(bkcc_space_ids: list[str]):
     """禁用关联的 BKCI 空间有效性"""
@@ -281,6 +287,36 @@ def refresh_bkcc_space_name():
     logger.info("refresh bkcc space name task completed, updated %d spaces", updated_count)
 
 
+@share_lock(identify="metadata__push_changed_space_router")
+def push_changed_space_router():
+    """增量推送空间路由
+
+    按租户记录上次推送的开始时间，只刷新此后变更的结果表涉及的空间、data_label 及结果表详情；
+    首次执行只记录时间水位，存量路由仍由原有的变更入口负责
+    """
+    if not settings.ENABLE_SPACE_ROUTER_INCREMENTAL_PUSH:
+        return
+
+    from metadata.models.space.space_table_id_redis import SpaceTableIDRedis
+
+    space_client = SpaceTableIDRedis()
+    for tenant in api.bk_login.list_tenant():
+        bk_tenant_id = tenant["id"]
+        watermark_key = f"{SPACE_ROUTER_PUSH_WATERMARK_KEY}:{bk_tenant_id}"
+        start_time = timezone.now()
+        watermark = RedisTools.get(watermark_key)
+        if watermark:
+            # 向前多取一段时间，兼容推送期间提交的事务，重复推送的内容不变时不会再次发布
+            since = datetime.fromtimestamp(float(watermark), tz=dt_timezone.utc) - SPACE_ROUTER_PUSH_OVERLAP
+            try:
+                result = space_client.push_changed_routers(bk_tenant_id=bk_tenant_id, since=since)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("push changed space router failed, bk_tenant_id: %s", bk_tenant_id)
+                continue
+            logger.info("push changed space router successfully, bk_tenant_id: %s, result: %s", bk_tenant_id, result)
+        RedisTools.set(watermark_key, str(start_time.timestamp()))
+
+
 @share_lock(identify="metadata__sync_data_source")
 def sync_bkcc_space_data_source():
     """同步bkcc数据源和空间的关系及数据源的所属类型"""
@@ -16,7 +16,7 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from django.conf import settings
-from django.db import transaction
+from django.db import close_old_connections, transaction
 from django.db.models import Q
 from django.utils.translation import gettext as _
 from tenacity import RetryError, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
@@ -239,30 +239,24 @@ def delete_restore_indices(restore_id):
 
 def update_time_series_metrics(time_series_metrics):
     table_ids_by_tenant: dict[str, set[str]] = {}
-    for time_series_group in time_series_metrics:
-        try:
-            is_updated = time_series_group.update_time_series_metrics()
-            logger.info(
-                "bk_data_id->[%s] metric add from redis success, is_updated: %s",
-                time_series_group.bk_data_id,
-                is_updated,
-            )
-            # 记录是否有更新，如果有更新则推送到redis
-            if is_updated:
-                bk_tenant_id = time_series_group.bk_tenant_id
-                table_ids_by_tenant.setdefault(bk_tenant_id, set()).add(time_series_group.table_id)
-        except Exception as e:
-            logger.error(
-                "data_id->[%s], table_id->[%s] try to update ts metrics from redis failed, error->[%s], "
-                "traceback_detail->[%s]",
-                # noqa
-                time_series_group.bk_data_id,
-                time_series_group.table_id,
-                e,
-                traceback.format_exc(),
-            )
-        else:
-            logger.info("time_series_group->[%s] metric update from redis success.", time_series_group.bk_data_id)
+    time_series_metrics = list(time_series_metrics)
+    max_workers = max(min(int(settings.TIME_SERIES_METRIC_UPDATE_CONCURRENCY), len(time_series_metrics)), 1)
+    # 各分组的指标拉取及比对相互独立，并发处理，避免大分组拖慢整体任务
+    if max_workers == 1:
+        results = [_update_time_series_group_metrics(group) for group in time_series_metrics]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_update_time_series_group_metrics, group, in_thread=True)
+                for group in time_series_metrics
+            ]
+            results = [future.result() for future in futures]
+
+    for time_series_group, is_updated in zip(time_series_metrics, results):
+        # 记录是否有更新，如果有更新则推送到redis
+        if is_updated:
+            bk_tenant_id = time_series_group.bk_tenant_id
+            table_ids_by_tenant.setdefault(bk_tenant_id, set()).add(time_series_group.table_id)
 
     # 仅当指标有变动的结果表存在时，才进行路由配置更新
     if table_ids_by_tenant:
@@ -283,6 +277,39 @@ def update_time_series_metrics(time_series_metrics):
             )
 
 
+def _update_time_series_group_metrics(time_series_group, in_thread: bool = False) -> bool:
+    """刷新单个分组的指标，返回是否有更新
+
+    :param in_thread: 是否在线程池中执行，线程中执行时在任务边界清理数据库连接
+    """
+    if in_thread:
+        close_old_connections()
+    try:
+        is_updated = time_series_group.update_time_series_metrics()
+        logger.info(
+            "bk_data_id->[%s] metric add from redis success, is_updated: %s",
+            time_series_group.bk_data_id,
+            is_updated,
+        )
+    except Exception as e:
+        logger.error(
+            "data_id->[%s], table_id->[%s] try to update ts metrics from redis failed, error->[%s], "
+            "traceback_detail->[%s]",
+            # noqa
+            time_series_group.bk_data_id,
+            time_series_group.table_id,
+            e,
+            traceback.format_exc(),
+        )
+        return False
+    else:
+        logger.info("time_series_group->[%s] metric update from redis success.", time_series_group.bk_data_id)
+        return is_updated
+    finally:
+        if in_thread:
+            close_old_connections()
+
+
 # todo: es 索引管理，迁移至BMW
 @app.task(ignore_result=True, queue="celery_long_task_cron")
 def manage_es_storage(storage_record_ids: list[int], cluster_id: int | None = None) -> None:
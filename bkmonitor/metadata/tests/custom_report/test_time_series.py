@@ -9,7 +9,10 @@ specific language governing permissions and limitations under the License.
 """
 
 import datetime
+import json
+import time
 
+import fakeredis
 import pytest
 
 from metadata import models
@@ -252,3 +255,33 @@ def test_bulk_refresh_rt_fields_with_tag_list(create_and_delete_records):
         "service": "Service",
         "instance": "Instance",
     }
+
+
+def test_iter_metrics_from_redis(create_and_delete_records, mocker, settings):
+    client = fakeredis.FakeRedis()
+    mocker.patch("metadata.models.custom_report.time_series.RedisClient.from_envs", return_value=client)
+    settings.MAX_METRICS_FETCH_STEP = 2
+
+    now_ts = int(time.time())
+    metrics_key = f"{settings.METRICS_KEY_PREFIX}1"
+    dimensions_key = f"{settings.METRIC_DIMENSIONS_KEY_PREFIX}1"
+    field_names = ["disk_usage", "disk_usage1", "disk_usage2", "no_dimension", "1invalid"]
+    client.zadd(metrics_key, {name: now_ts - idx for idx, name in enumerate(field_names)})
+    client.hset(
+        dimensions_key,
+        mapping={
+            name: json.dumps({"dimensions": {"disk_name": {"last_update_time": now_ts, "values": []}}})
+            for name in field_names
+            if name != "no_dimension"
+        },
+    )
+
+    group = models.TimeSeriesGroup.objects.get(time_series_group_id=DEFAULT_GROUP_ID)
+    pages = list(group.iter_metrics_from_redis(expired_time=3600))
+
+    # 5 个指标分 3 页拉取，缺失维度及非法名称的指标被过滤
+    assert len(pages) == 3
+    metrics_info = [metric for page in pages for metric in page]
+    assert {metric["field_name"] for metric in metrics_info} == {"disk_usage", "disk_usage1", "disk_usage2"}
+    expected_tags = {"disk_name": {"last_update_time": now_ts, "values": []}}
+    assert all(metric["tag_value_list"] == expected_tags for metric in metrics_info)
@@ -0,0 +1,147 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+
+from metadata import models
+from metadata.models.space.constants import (
+    RESULT_TABLE_DETAIL_CHANNEL,
+    RESULT_TABLE_DETAIL_KEY,
+)
+from metadata.models.space.space_table_id_redis import SpaceTableIDRedis
+from metadata.utils.redis_tools import RedisTools
+
+pytestmark = pytest.mark.django_db(databases="__all__")
+
+BK_TENANT_ID = "system"
+CHANGED_DATA_ID = 1900500
+CHANGED_TABLE_ID = "test_incremental.base"
+
+
+def test_push_changed_fields_only_writes_changed():
+    redis_values = {
+        "a.__default__": json.dumps({"db": "a", "measurement": "m"}),
+        "b.__default__": json.dumps({"db": "b"}),
+        "c.__default__": json.dumps({"db": "c"}),
+    }
+    # a 仅键顺序不同，b 内容变化，c 不存在
+    old_values = [json.dumps({"measurement": "m", "db": "a"}).encode(), json.dumps({"db": "old"}).encode(), None]
+    with (
+        patch.object(RedisTools, "hmget", return_value=old_values),
+        patch.object(RedisTools, "hmset_to_redis") as mock_hmset,
+        patch.object(RedisTools, "publish") as mock_publish,
+    ):
+        changed = SpaceTableIDRedis._push_changed_fields(
+            RESULT_TABLE_DETAIL_KEY, RESULT_TABLE_DETAIL_CHANNEL, redis_values, is_publish=True
+        )
+
+    assert changed == ["b.__default__", "c.__default__"]
+    mock_hmset.assert_called_once_with(
+        RESULT_TABLE_DETAIL_KEY, {field: redis_values[field] for field in ["b.__default__", "c.__default__"]}
+    )
+    mock_publish.assert_called_once_with(RESULT_TABLE_DETAIL_CHANNEL, ["b.__default__", "c.__default__"])
+
+
+def test_push_changed_fields_nothing_changed():
+    redis_values = {"a.__default__": json.dumps({"db": "a"})}
+    with (
+        patch.object(RedisTools, "hmget", return_value=[redis_values["a.__default__"].encode()]),
+        patch.object(RedisTools, "hmset_to_redis") as mock_hmset,
+        patch.object(RedisTools, "publish") as mock_publish,
+    ):
+        assert (
+            SpaceTableIDRedis._push_changed_fields(
+                RESULT_TABLE_DETAIL_KEY, RESULT_TABLE_DETAIL_CHANNEL, redis_values, is_publish=True
+            )
+            == []
+        )
+
+    mock_hmset.assert_not_called()
+    mock_publish.assert_not_called()
+
+
+@pytest.fixture
+def changed_table_records():
+    models.ResultTable.objects.create(
+        table_id=CHANGED_TABLE_ID,
+        table_name_zh=CHANGED_TABLE_ID,
+        is_custom_table=True,
+        default_storage=models.ClusterInfo.TYPE_INFLUXDB,
+        bk_biz_id=2,
+        data_label="incremental_label",
+        bk_tenant_id=BK_TENANT_ID,
+    )
+    models.DataSourceResultTable.objects.create(
+        bk_data_id=CHANGED_DATA_ID, table_id=CHANGED_TABLE_ID, bk_tenant_id=BK_TENANT_ID
+    )
+    models.SpaceDataSource.objects.create(
+        space_type_id="bkcc", space_id="3", bk_data_id=CHANGED_DATA_ID, bk_tenant_id=BK_TENANT_ID
+    )
+    models.SpaceResource.objects.create(
+        space_type_id="bkci",
+        space_id="incremental_project",
+        resource_type="bkcc",
+        resource_id="2",
+        bk_tenant_id=BK_TENANT_ID,
+    )
+
+
+def test_push_changed_routers(changed_table_records):
+    client = SpaceTableIDRedis()
+    with (
+        patch.object(SpaceTableIDRedis, "push_space_table_ids") as mock_push_space,
+        patch.object(SpaceTableIDRedis, "push_data_label_table_ids") as mock_push_data_label,
+        patch.object(SpaceTableIDRedis, "push_table_id_detail") as mock_push_detail,
+    ):
+        result = client.push_changed_routers(BK_TENANT_ID, since=timezone.now() - timedelta(minutes=1))
+
+    assert result == {"table_id": 1, "data_label": 1, "space": 3}
+    # 数据源关联的空间、所属业务的空间，以及业务关联的 bkci 空间
+    assert sorted(call.kwargs["space_id"] for call in mock_push_space.call_args_list) == [
+        "2",
+        "3",
+        "incremental_project",
+    ]
+    mock_push_data_label.assert_called_once_with(
+        data_label_list=["incremental_label"], is_publish=True, bk_tenant_id=BK_TENANT_ID
+    )
+    mock_push_detail.assert_called_once_with(
+        bk_tenant_id=BK_TENANT_ID, table_id_list=[CHANGED_TABLE_ID], is_publish=True
+    )
+
+
+def test_push_changed_routers_without_change(changed_table_records):
+    with patch.object(SpaceTableIDRedis, "push_table_id_detail") as mock_push_detail:
+        result = SpaceTableIDRedis().push_changed_routers(BK_TENANT_ID, since=timezone.now() + timedelta(minutes=1))
+
+    assert result == {"table_id": 0, "data_label": 0, "space": 0}
+    mock_push_detail.assert_not_called()
+
+
+def test_push_space_table_ids_with_diff_push(mocker):
+    mocker.patch.object(settings, "ENABLE_SPACE_ROUTER_DIFF_PUSH", True)
+    mocker.patch.object(settings, "ENABLE_MULTI_TENANT_MODE", False)
+    mocker.patch("metadata.models.space.space_table_id_redis.models.Space.objects.get")
+    mocker.patch.object(SpaceTableIDRedis, "_compose_bkcc_space_table_ids", return_value={"a.b": {"filters": []}})
+    mock_push = mocker.patch.object(SpaceTableIDRedis, "_push_changed_fields")
+    mock_publish = mocker.patch.object(RedisTools, "publish")
+
+    SpaceTableIDRedis().push_space_table_ids(space_type="bkcc", space_id="2", is_publish=True)
+
+    mock_push.assert_called_once()
+    assert mock_push.call_args.args[2] == {"bkcc__2": json.dumps({"a.b": {"filters": []}})}
+    # 由差异推送决定是否发布
+    mock_publish.assert_not_called()
@@ -115,3 +115,143 @@ def test_create_v4_data_source_applies_from_gse_then_registers_to_bkbase(
     assert apply_config["spec"]["eventType"] == expected_event_type
     assert data_source.bk_data_id == bk_data_id
     assert data_source.created_from == DataIdCreatedFromSystem.BKDATA.value
+
+
+BULK_DATA_ID_START = 1900100
+BULK_KAFKA_CLUSTER_ID = 990124
+BULK_ES_CLUSTER_ID = 990125
+BULK_INFLUXDB_CLUSTER_ID = 990126
+BULK_INFLUXDB_PROXY_CLUSTER_ID = 990127
+# 批量渲染的查询预算，与数据源数量无关
+BULK_TO_JSON_QUERY_BUDGET = 15
+
+
+@pytest.fixture
+def bulk_data_source_records():
+    """创建批量渲染配置所需的数据源、结果表、字段及存储。"""
+    for cluster_id, cluster_type in [
+        (BULK_KAFKA_CLUSTER_ID, models.ClusterInfo.TYPE_KAFKA),
+        (BULK_ES_CLUSTER_ID, models.ClusterInfo.TYPE_ES),
+    ]:
+        models.ClusterInfo.objects.update_or_create(
+            cluster_id=cluster_id,
+            defaults={
+                "bk_tenant_id": DEFAULT_TENANT_ID,
+                "cluster_name": f"test_bulk_{cluster_type}_cluster",
+                "cluster_type": cluster_type,
+                "domain_name": f"test-bulk-{cluster_type}.service",
+                "port": 9092,
+                "is_default_cluster": False,
+            },
+        )
+
+    data_sources = []
+    for index in range(5):
+        bk_data_id = BULK_DATA_ID_START + index
+        table_id = f"test_bulk_{index}.base"
+        data_sources.append(
+            models.DataSource.objects.create(
+                bk_data_id=bk_data_id,
+                data_name=f"test_bulk_data_source_{index}",
+                mq_cluster_id=BULK_KAFKA_CLUSTER_ID,
+                mq_config_id=1,
+                etl_config="bk_standard_v2_event",
+                is_custom_source=True,
+                created_from=DataIdCreatedFromSystem.BKGSE.value,
+            )
+        )
+        models.KafkaTopicInfo.objects.create(bk_data_id=bk_data_id, topic=f"test_bulk_{index}", partition=1)
+        models.DataSourceOption.objects.create(
+            bk_data_id=bk_data_id, name="timestamp_precision", value_type="string", value="ms", creator="system"
+        )
+        models.SpaceDataSource.objects.create(space_type_id="bkcc", space_id=str(index + 1), bk_data_id=bk_data_id)
+        models.DataSourceResultTable.objects.create(bk_data_id=bk_data_id, table_id=table_id, creator="system")
+        models.ResultTable.objects.create(
+            table_id=table_id,
+            table_name_zh=table_id,
+            is_custom_table=True,
+            default_storage=models.ClusterInfo.TYPE_ES,
+            bk_biz_id=index + 1,
+        )
+        models.ResultTableOption.objects.create(
+            table_id=table_id, name="es_unique_field_list", value_type="list", value='["event"]', creator="system"
+        )
+        for field_name in ["event", "time"]:
+            models.ResultTableField.objects.create(
+                table_id=table_id,
+                field_name=field_name,
+                field_type="string",
+                tag="dimension",
+                alias_name=f"{field_name}_alias" if field_name == "event" else "",
+                is_config_by_user=True,
+            )
+        models.ESStorage.objects.create(
+            table_id=table_id, storage_cluster_id=BULK_ES_CLUSTER_ID, index_settings="{}", mapping_settings="{}"
+        )
+    return data_sources
+
+
+def test_bulk_to_json_equals_to_json(bulk_data_source_records):
+    """批量渲染的配置需要与逐个渲染完全一致。"""
+    expected = {ds.bk_data_id: ds.to_json(is_consul_config=True) for ds in bulk_data_source_records}
+
+    data_sources = list(models.DataSource.objects.filter(bk_data_id__in=list(expected)))
+    assert models.DataSource.bulk_to_json(data_sources, is_consul_config=True) == expected
+    assert expected[BULK_DATA_ID_START]["bk_biz_id"] == 1
+    assert expected[BULK_DATA_ID_START]["result_table_list"][0]["shipper_list"]
+
+
+def test_bulk_to_json_query_budget(bulk_data_source_records, django_assert_max_num_queries):
+    """批量渲染的查询次数与数据源数量无关。"""
+    data_id_list = [ds.bk_data_id for ds in bulk_data_source_records]
+
+    for count in [1, len(data_id_list)]:
+        data_sources = list(models.DataSource.objects.filter(bk_data_id__in=data_id_list[:count]))
+        with django_assert_max_num_queries(BULK_TO_JSON_QUERY_BUDGET):
+            configs = models.DataSource.bulk_to_json(data_sources, is_consul_config=True)
+        assert len(configs) == count
+
+
+def test_bulk_to_json_influxdb_cluster_from_proxy(bulk_data_source_records):
+    """InfluxDB 存储的集群需通过 proxy 存储解析，与逐个渲染一致。"""
+    for cluster_id in [BULK_INFLUXDB_CLUSTER_ID, BULK_INFLUXDB_PROXY_CLUSTER_ID]:
+        models.ClusterInfo.objects.update_or_create(
+            cluster_id=cluster_id,
+            defaults={
+                "bk_tenant_id": DEFAULT_TENANT_ID,
+                "cluster_name": f"test_bulk_influxdb_{cluster_id}",
+                "cluster_type": models.ClusterInfo.TYPE_INFLUXDB,
+                "domain_name": f"test-bulk-influxdb-{cluster_id}.service",
+                "port": 8086,
+                "is_default_cluster": False,
+            },
+        )
+    proxy_storage = models.InfluxDBProxyStorage.objects.create(
+        proxy_cluster_id=BULK_INFLUXDB_PROXY_CLUSTER_ID,
+        service_name="test_bulk_influxdb_proxy",
+        instance_cluster_name="test_bulk_instance",
+        creator="system",
+        updater="system",
+    )
+    # 存储记录上的集群与 proxy 存储指向的集群不一致
+    models.InfluxDBStorage.objects.create(
+        table_id="test_bulk_0.base",
+        storage_cluster_id=BULK_INFLUXDB_CLUSTER_ID,
+        real_table_name="base",
+        database="test_bulk_0",
+        source_duration_time="30d",
+        influxdb_proxy_storage_id=proxy_storage.id,
+    )
+
+    data_source = models.DataSource.objects.get(bk_data_id=BULK_DATA_ID_START)
+    expected = data_source.to_json(is_consul_config=True)
+    data_source = models.DataSource.objects.get(bk_data_id=BULK_DATA_ID_START)
+    assert models.DataSource.bulk_to_json([data_source], is_consul_config=True) == {BULK_DATA_ID_START: expected}
+
+    shipper_list = expected["result_table_list"][0]["shipper_list"]
+    influxdb_configs = [
+        shipper for shipper in shipper_list if shipper["cluster_type"] == models.ClusterInfo.TYPE_INFLUXDB
+    ]
+    assert [shipper["cluster_config"]["domain_name"] for shipper in influxdb_configs] == [
+        f"test-bulk-influxdb-{BULK_INFLUXDB_PROXY_CLUSTER_ID}.service"
+    ]
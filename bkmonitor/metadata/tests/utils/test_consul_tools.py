@@ -0,0 +1,113 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import base64
+import json
+
+from consul.base import ConsulException
+
+from metadata.utils import consul_tools
+
+PREFIX = "bk_monitorv3/unittest/data_id/"
+
+
+class FakeKV:
+    def __init__(self, data):
+        self.data = data
+        self.put_keys = []
+
+    def get(self, key, recurse=False):
+        items = [{"Key": k, "Value": v} for k, v in self.data.items() if k.startswith(key)]
+        return 1, items or None
+
+    def put(self, key, value):
+        self.put_keys.append(key)
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakeTxn:
+    def __init__(self, kv, fail=False):
+        self.kv = kv
+        self.fail = fail
+        self.batches = []
+
+    def put(self, payload):
+        self.batches.append(payload)
+        if self.fail:
+            raise ConsulException("txn failed")
+        for operation in payload:
+            kv = operation["KV"]
+            if kv["Verb"] == "set":
+                self.kv.data[kv["Key"]] = base64.b64decode(kv["Value"]).decode("utf-8")
+            else:
+                self.kv.data.pop(kv["Key"], None)
+
+
+class FakeConsul:
+    def __init__(self, data, fail=False):
+        self.kv = FakeKV(data)
+        self.txn = FakeTxn(self.kv, fail)
+
+
+def patch_consul(mocker, data, fail=False):
+    client = FakeConsul(data, fail)
+    mocker.patch("bkmonitor.utils.consul.BKConsul", return_value=client)
+    return client
+
+
+def test_bulk_put_only_changed(mocker):
+    client = patch_consul(
+        mocker,
+        {
+            f"{PREFIX}1": json.dumps({"a": 1}),
+            f"{PREFIX}2": json.dumps({"a": 2}),
+            f"{PREFIX}3": json.dumps({"a": 3}),
+        },
+    )
+    values = {f"{PREFIX}1": {"a": 1}, f"{PREFIX}2": {"a": 20}, f"{PREFIX}4": {"a": 4}}
+    result = consul_tools.HashConsul().bulk_put(PREFIX, values, delete_filter=lambda key: key.endswith("3"))
+
+    assert result == {"unchanged": 1, "updated": 2, "deleted": 1, "failed": 0}
+    # 前缀只读取一次，变更通过一个事务写入
+    assert len(client.txn.batches) == 1
+    assert {k: json.loads(v) for k, v in client.kv.data.items()} == values
+
+    # 再次同步时无需写入
+    result = consul_tools.HashConsul().bulk_put(PREFIX, values)
+    assert result == {"unchanged": 3, "updated": 0, "deleted": 0, "failed": 0}
+    assert len(client.txn.batches) == 1
+
+
+def test_bulk_put_split_batches(mocker):
+    client = patch_consul(mocker, {})
+    count = consul_tools.CONSUL_TXN_MAX_OPERATIONS * 2 + 1
+    values = {f"{PREFIX}{i}": {"a": i} for i in range(count)}
+    result = consul_tools.HashConsul().bulk_put(PREFIX, values)
+
+    assert result["updated"] == count
+    assert [len(batch) for batch in client.txn.batches] == [
+        consul_tools.CONSUL_TXN_MAX_OPERATIONS,
+        consul_tools.CONSUL_TXN_MAX_OPERATIONS,
+        1,
+    ]
+
+
+def test_bulk_put_txn_failed(mocker):
+    client = patch_consul(mocker, {}, fail=True)
+    values = {f"{PREFIX}{i}": {"a": i} for i in range(3)}
+    result = consul_tools.HashConsul().bulk_put(PREFIX, values)
+
+    # 事务失败后逐个写入
+    assert result == {"unchanged": 0, "updated": 3, "deleted": 0, "failed": 0}
+    assert sorted(client.kv.put_keys) == sorted(values)
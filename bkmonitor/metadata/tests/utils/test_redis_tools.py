@@ -0,0 +1,79 @@
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云 - 监控平台 (BlueKing - Monitor) available.
+Copyright (C) 2017-2025 Tencent. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from unittest.mock import MagicMock, PropertyMock
+
+import fakeredis
+import pytest
+
+from metadata.utils import redis_tools
+from metadata.utils.redis_tools import RedisBatchWriter, RedisTools, summarize_for_log
+
+KEY = "bkmonitorv3:spaces:unittest"
+CHANNEL = "bkmonitorv3:spaces:unittest:channel"
+
+
+@pytest.fixture
+def fake_client(mocker):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    mocker.patch.object(RedisTools, "client", new_callable=PropertyMock, return_value=client)
+    mocker.patch.object(redis_tools, "REDIS_BATCH_SIZE", 2)
+    return client
+
+
+def test_hmset_hmget_hdel_in_batches(fake_client, mocker):
+    pipeline_class = type(fake_client.pipeline())
+    hset_spy = mocker.spy(pipeline_class, "hset")
+    hmget_spy = mocker.spy(pipeline_class, "hmget")
+    hdel_spy = mocker.spy(pipeline_class, "hdel")
+
+    values = {f"field_{i}": str(i) for i in range(5)}
+    assert RedisTools.hmset_to_redis(KEY, values)
+    assert fake_client.hgetall(KEY) == {k.encode(): v.encode() for k, v in values.items()}
+    assert hset_spy.call_count == 3
+
+    fields = [*values, "not_exist"]
+    assert RedisTools.hmget(KEY, fields) == [v.encode() for v in values.values()] + [None]
+    assert hmget_spy.call_count == 3
+
+    assert RedisTools.hdel(KEY, list(values)[:3]) == 3
+    assert sorted(fake_client.hkeys(KEY)) == [b"field_3", b"field_4"]
+    assert hdel_spy.call_count == 2
+
+
+def test_batch_writer_pipeline():
+    client = MagicMock()
+    pipe = client.pipeline.return_value.__enter__.return_value
+
+    with RedisBatchWriter(client, batch_size=2) as writer:
+        writer.hset(KEY, {"a": "1", "b": "2", "c": "3"})
+        writer.publish(CHANNEL, ["a", "b"])
+        writer.publish(CHANNEL, ["b", "c"])
+
+    client.pipeline.assert_called_once_with(transaction=False)
+    assert [call.kwargs["mapping"] for call in pipe.hset.call_args_list] == [{"a": "1", "b": "2"}, {"c": "3"}]
+    # 重复的消息只发布一次，写入先于发布
+    assert [call.args for call in pipe.publish.call_args_list] == [(CHANNEL, "a"), (CHANNEL, "b"), (CHANNEL, "c")]
+    assert pipe.execute.call_count == 3
+
+
+def test_batch_writer_skip_on_error():
+    client = MagicMock()
+    with pytest.raises(ValueError):
+        with RedisBatchWriter(client) as writer:
+            writer.hset(KEY, {"a": "1"})
+            raise ValueError("compose failed")
+
+    client.pipeline.assert_not_called()
+
+
+def test_summarize_for_log():
+    assert summarize_for_log(["a", "b"], max_items=2) == "['a', 'b']"
+    assert summarize_for_log({f"k{i}": i for i in range(5)}, max_items=2) == "['k0', 'k1']..."
@@ -97,6 +97,73 @@ def get_space_uid_and_bk_biz_id_by_bk_data_id(bk_tenant_id: str, bk_data_id: int
         return 0, ""
 
 
+def batch_get_space_uid_and_bk_biz_id_by_bk_data_id(data_id_tenants: dict[int, str]) -> dict[int, tuple[int, str]]:
+    """
+    批量根据data_id，查询对应的space_uid和bk_biz_id，结果与 get_space_uid_and_bk_biz_id_by_bk_data_id 一致
+    @param data_id_tenants: {bk_data_id: bk_tenant_id}
+    @return: {bk_data_id: (bk_biz_id, space_uid)}
+    """
+    from metadata.models.space import SpaceDataSource, SpaceResource
+    from metadata.models.space.constants import SpaceTypes
+
+    # 与 first() 保持一致，取主键最小的关联记录
+    related_space_infos = {}
+    for record in (
+        SpaceDataSource.objects.filter(bk_data_id__in=list(data_id_tenants))
+        .order_by("pk")
+        .values("bk_data_id", "space_type_id", "space_id")
+    ):
+        related_space_infos.setdefault(record["bk_data_id"], record)
+
+    # 非bkcc空间，需要查询关联的业务资源
+    space_resources = {}
+    non_bkcc_infos = [info for info in related_space_infos.values() if info["space_type_id"] != SpaceTypes.BKCC.value]
+    if non_bkcc_infos:
+        for resource in SpaceResource.objects.filter(
+            bk_tenant_id__in=set(data_id_tenants.values()),
+            space_type_id__in={info["space_type_id"] for info in non_bkcc_infos},
+            space_id__in={info["space_id"] for info in non_bkcc_infos},
+            resource_type=SpaceTypes.BKCC.value,
+        ).values("bk_tenant_id", "space_type_id", "space_id", "resource_id"):
+            space_resources.setdefault(
+                (resource["bk_tenant_id"], resource["space_type_id"], resource["space_id"]), []
+            ).append(resource["resource_id"])
+
+    def get_biz_id(bk_tenant_id: str, space_uid: str) -> int:
+        try:
+            space_type, space_id = space_uid.split("__")
+            if space_type == SpaceTypes.BKCC.value:
+                return int(space_id)
+            resource_ids = space_resources.get((bk_tenant_id, space_type, space_id), [])
+            # 与 get 的语义一致，不存在或存在多条时均视为查询失败
+            if len(resource_ids) != 1:
+                return 0
+            return int(resource_ids[0])
+        except Exception:  # pylint: disable=broad-except
+            return 0
+
+    result = {}
+    for bk_data_id, bk_tenant_id in data_id_tenants.items():
+        related_space_info = related_space_infos.get(bk_data_id)
+        if not related_space_info:
+            logger.warning(
+                "batch_get_space_uid_and_bk_biz_id_by_bk_data_id: no related_space_info found for bk_data_id->[%s]",
+                bk_data_id,
+            )
+            result[bk_data_id] = (0, "")
+            continue
+
+        space_uid = related_space_info["space_type_id"] + "__" + related_space_info["space_id"]
+        bk_biz_id = get_biz_id(bk_tenant_id, space_uid)
+        if bk_biz_id < 0:
+            # 绑定了错误元信息的情况较少，直接使用单个查询处理
+            result[bk_data_id] = get_space_uid_and_bk_biz_id_by_bk_data_id(bk_tenant_id, bk_data_id)
+            continue
+        result[bk_data_id] = (bk_biz_id, space_uid)
+
+    return result
+
+
 def get_hour_off_set_by_table_id(table_id: str, max_hours: int = 16):
     """
     根据table_id，计算对应的时间偏移量，用以在索引轮转周期任务时将其分散到不同的时间段中进行创建
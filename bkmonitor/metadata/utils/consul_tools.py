@@ -10,10 +10,11 @@ specific language governing permissions and limitations under the License.
 """
 
 
+import base64
 import json
 import logging
 import time
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from consul.base import ConsulException
 
@@ -23,6 +24,10 @@ from metadata.utils import hash_util
 
 CONSUL_INFLUXDB_VERSION_PATH = "%s/influxdb_info/version/" % config.CONSUL_PATH
 
+# consul 单个事务的最大操作数及请求体大小限制(默认 64 个操作、512KB)，批量写入时按此切分
+CONSUL_TXN_MAX_OPERATIONS = 64
+CONSUL_TXN_MAX_PAYLOAD_SIZE = 256 * 1024
+
 logger = logging.getLogger("metadata")
 
 
@@ -131,3 +136,117 @@ class HashConsul(object):
         except ConsulException as e:
             logger.error("put consul key error, data_id: %s, error: %s", bk_data_id, e)
             raise
+
+    @staticmethod
+    def get_value_hash(value) -> Optional[str]:
+        """
+        计算consul上原始内容的哈希值，内容不存在或无法解析时返回None
+        """
+        if value is None:
+            return None
+        try:
+            return hash_util.object_md5(json.loads(value))
+        except (TypeError, ValueError):
+            return None
+
+    def bulk_put(
+        self,
+        prefix: str,
+        values: Dict[str, object],
+        delete_filter: Optional[Callable[[str], bool]] = None,
+        is_force_update: bool = False,
+    ) -> Dict[str, int]:
+        """
+        批量同步指定前缀下的KV
+        前缀下的内容只读取一次，与期望内容逐个比较哈希值，只将有差异的部分通过事务分批写入
+        :param prefix: consul前缀，values中的key都应当在该前缀下
+        :param values: 期望的内容 {key: value}，value期待传入的是字典或者数组
+        :param delete_filter: 前缀下不在values中的key，delete_filter(key)为True时删除，不传则不删除
+        :param is_force_update: 是否需要强行更新
+        :return: {"unchanged": 0, "updated": 0, "deleted": 0, "failed": 0}
+        """
+        consul_client = consul.BKConsul(host=self.host, port=self.port, scheme=self.scheme, verify=self.verify)
+
+        # 1. 一次读取前缀下的全部内容，建立 key -> 哈希值 的索引
+        items = consul_client.kv.get(prefix, recurse=True)[1] or []
+        remote_hashes = {item["Key"]: self.get_value_hash(item.get("Value")) for item in items}
+
+        # 2. 计算需要写入及删除的key
+        result = {"unchanged": 0, "updated": 0, "deleted": 0, "failed": 0}
+        operations = []
+        for key, value in values.items():
+            if not (self.default_force or is_force_update) and key in remote_hashes:
+                if remote_hashes[key] is not None and remote_hashes[key] == hash_util.object_md5(value):
+                    result["unchanged"] += 1
+                    continue
+            operations.append(("set", key, json.dumps(value)))
+
+        if delete_filter is not None:
+            for key in remote_hashes:
+                if key not in values and delete_filter(key):
+                    operations.append(("delete", key, None))
+
+        # 3. 按事务限制分批写入
+        for batch in self.split_txn_batches(operations):
+            try:
+                consul_client.txn.put(
+                    [
+                        {"KV": {"Verb": verb, "Key": key, "Value": base64.b64encode(value.encode("utf-8")).decode()}}
+                        if verb == "set"
+                        else {"KV": {"Verb": verb, "Key": key}}
+                        for verb, key, value in batch
+                    ]
+                )
+                for verb, _, _ in batch:
+                    result["updated" if verb == "set" else "deleted"] += 1
+            except ConsulException as e:
+                # 事务是原子的，失败后逐个重试，避免单个key的问题影响整批
+                logger.warning("consul txn of prefix->[%s] failed, will retry one by one, error: %s", prefix, e)
+                self._apply_one_by_one(consul_client, batch, result)
+
+        logger.info(
+            "bulk put consul prefix->[%s] finished: unchanged(%d), updated(%d), deleted(%d), failed(%d)",
+            prefix,
+            result["unchanged"],
+            result["updated"],
+            result["deleted"],
+            result["failed"],
+        )
+        return result
+
+    @staticmethod
+    def split_txn_batches(operations):
+        """
+        按事务的操作数及请求体大小限制切分批次
+        """
+        batch = []
+        batch_size = 0
+        for operation in operations:
+            operation_size = len(operation[1]) + len(operation[2] or "") * 4 // 3
+            if batch and (
+                len(batch) >= CONSUL_TXN_MAX_OPERATIONS or batch_size + operation_size > CONSUL_TXN_MAX_PAYLOAD_SIZE
+            ):
+                yield batch
+                batch = []
+                batch_size = 0
+            batch.append(operation)
+            batch_size += operation_size
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _apply_one_by_one(consul_client, operations, result):
+        for verb, key, value in operations:
+            try:
+                if verb == "set":
+                    if not consul_client.kv.put(key=key, value=value):
+                        logger.error("put consul key->[%s] failed", key)
+                        result["failed"] += 1
+                        continue
+                    result["updated"] += 1
+                else:
+                    consul_client.kv.delete(key)
+                    result["deleted"] += 1
+            except ConsulException as e:
+                logger.error("%s consul key->[%s] error: %s", verb, key, e)
+                result["failed"] += 1
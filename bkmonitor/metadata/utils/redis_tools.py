@@ -8,9 +8,11 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import itertools
 import json
 import logging
 import os
+from collections.abc import Iterable
 
 import redis
 from django.conf import settings
@@ -19,17 +21,93 @@ from utils.redis_client import RedisClient
 
 logger = logging.getLogger("metadata")
 
+# 单条命令携带的 field/消息数量上限，大批量写入时按此切分后通过 pipeline 发送
+REDIS_BATCH_SIZE = 500
+# 单次 pipeline 发送的写入命令数量上限，限制单次请求的大小
+REDIS_PIPELINE_COMMANDS = 20
+# 日志中最多记录的 field/消息数量，避免大批量写入时打印超长日志
+REDIS_LOG_MAX_ITEMS = 20
+
+
+def summarize_for_log(items: Iterable, max_items: int = REDIS_LOG_MAX_ITEMS) -> str:
+    """返回长度受限的内容摘要，用于日志记录；字典只记录 key"""
+    items = list(itertools.islice(items, max_items + 1))
+    if len(items) > max_items:
+        return f"{items[:max_items]}..."
+    return str(items)
+
+
+class RedisBatchWriter:
+    """
+    redis 批量写入
+    命令先缓存在本地，执行时按批通过 pipeline 发送，减少网络往返；
+    发布的消息在写入命令之后发送，同一频道内的重复消息只发送一次
+    """
+
+    def __init__(self, client, batch_size: int | None = None):
+        self.client = client
+        # 未指定时在调用时读取模块配置
+        self.batch_size = batch_size or REDIS_BATCH_SIZE
+        self.commands = []
+        self.messages: dict[str, dict[str, None]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def hset(self, key: str, field_value: dict[str, str]):
+        items = list(field_value.items())
+        for start in range(0, len(items), self.batch_size):
+            self.commands.append(("hset", (key,), {"mapping": dict(items[start : start + self.batch_size])}))
+
+    def hdel(self, key: str, fields: list):
+        for start in range(0, len(fields), self.batch_size):
+            self.commands.append(("hdel", (key, *fields[start : start + self.batch_size]), {}))
+
+    def publish(self, channel: str, msg_list: list[str]):
+        self.messages.setdefault(channel, {}).update(dict.fromkeys(msg_list))
+
+    def execute(self) -> list:
+        """
+        发送缓存的命令及消息
+        :return: 写入命令的执行结果
+        """
+        commands, self.commands = self.commands, []
+        messages, self.messages = self.messages, {}
+
+        results = []
+        with self.client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(commands), REDIS_PIPELINE_COMMANDS):
+                for method, args, kwargs in commands[start : start + REDIS_PIPELINE_COMMANDS]:
+                    getattr(pipe, method)(*args, **kwargs)
+                results.extend(pipe.execute())
+
+            for channel, msg_dict in messages.items():
+                msg_list = list(msg_dict)
+                for start in range(0, len(msg_list), self.batch_size):
+                    for msg in msg_list[start : start + self.batch_size]:
+                        pipe.publish(channel, msg)
+                    pipe.execute()
+        return results
+
 
 class RedisTools:
     metadata_redis_client = None
 
     @property
     def client(self) -> RedisClient:
-        client = self.metadata_redis_client
         # 创建client失败时，重试一下
-        if client is None:
-            client = setup_client()
-        return client
+        if self.metadata_redis_client is None:
+            setup_client()
+        return RedisTools.metadata_redis_client
+
+    @classmethod
+    def batch_writer(cls, batch_size: int | None = None) -> RedisBatchWriter:
+        """获取批量写入器，在 with 语句结束时统一发送"""
+        return RedisBatchWriter(cls().client, batch_size=batch_size)
 
     @classmethod
     def push_and_publish_spaces(cls, key: str, channel: str, space: list):
@@ -46,13 +124,23 @@ class RedisTools:
 
     @classmethod
     def publish(cls, channel: str, msg_list: list[str]):
-        """当数据变动时，发布数据"""
-        logger.info("publish: channel->[%s],publish msg_list->[%s]", channel, msg_list)
+        """当数据变动时，发布数据，消息去重后按批通过 pipeline 发送"""
+        logger.info(
+            "publish: channel->[%s], msg_count->[%s], publish msg_list->[%s]",
+            channel,
+            len(msg_list),
+            summarize_for_log(msg_list),
+        )
         try:
-            for msg in msg_list:
-                cls().client.publish(channel, msg)
+            with cls.batch_writer() as writer:
+                writer.publish(channel, msg_list)
         except Exception as e:  # pylint: disable=broad-except
-            logging.error("publish: publish msg into channel->[%s] for ->[%s], error->[%s]", channel, msg_list, e)
+            logging.error(
+                "publish: publish msg into channel->[%s] for ->[%s], error->[%s]",
+                channel,
+                summarize_for_log(msg_list),
+                e,
+            )
             raise Exception(f"publish msg error, {e}")
         return
 
@@ -63,9 +151,18 @@ class RedisTools:
 
     @classmethod
     def hmset_to_redis(cls, key: str, field_value: dict[str, str]) -> bool:
-        """推送表数据到 redis"""
-        logger.info("hmset_to_redis: key->[%s], field_value->[%s]", key, field_value)
-        return cls().client.hmset(key, field_value)
+        """推送表数据到 redis，field 较多时按批通过 pipeline 写入"""
+        logger.info(
+            "hmset_to_redis: key->[%s], field_count->[%s], fields->[%s]",
+            key,
+            len(field_value),
+            summarize_for_log(field_value),
+        )
+        if not field_value:
+            return True
+        with cls.batch_writer() as writer:
+            writer.hset(key, field_value)
+        return True
 
     @classmethod
     def sadd(cls, key: str, value: list) -> int | None:
@@ -82,10 +179,12 @@ class RedisTools:
 
     @classmethod
     def hdel(cls, key: str, fields: list):
-        """删除指定的 field"""
+        """删除指定的 field，field 较多时按批通过 pipeline 删除"""
         if not fields:
             return
-        return cls().client.hdel(key, *fields)
+        writer = cls.batch_writer()
+        writer.hdel(key, list(fields))
+        return sum(writer.execute())
 
     @classmethod
     def hget(cls, key: str, field: str) -> bytes | None:
@@ -95,7 +194,18 @@ class RedisTools:
     def hmget(cls, key: str, fields: list) -> list:
         if not fields:
             return []
-        return cls().client.hmget(key, *fields)
+        fields = list(fields)
+        if len(fields) <= REDIS_BATCH_SIZE:
+            return cls().client.hmget(key, *fields)
+
+        # field 较多时按批读取
+        values = []
+        with cls().client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(fields), REDIS_BATCH_SIZE):
+                pipe.hmget(key, *fields[start : start + REDIS_BATCH_SIZE])
+            for batch_values in pipe.execute():
+                values.extend(batch_values)
+        return values
 
     @classmethod
     def hgetall(cls, key: str) -> dict:
@@ -119,6 +229,10 @@ class RedisTools:
             return []
         return json.loads(data.decode("utf-8"))
 
+    @classmethod
+    def get(cls, key: str) -> bytes | None:
+        return cls().client.get(key)
+
     @classmethod
     def set(cls, key: str, value: str) -> bool:
         return cls().client.set(key, value)